@@ -2,8 +2,10 @@ from fastapi import APIRouter
 
 from app.api.routes import (
     admin_boards,
+    admin_database,
     admin_menus,
     admin_roles,
+    admin_uploads,
     admin_users,
     attachments,
     auth,
@@ -13,6 +15,8 @@ from app.api.routes import (
     likes,
     menus,
     posts,
+    reactions,
+    uploads,
 )
 
 api_router = APIRouter()
@@ -22,9 +26,13 @@ api_router.include_router(menus.router)
 api_router.include_router(posts.router)
 api_router.include_router(comments.router)
 api_router.include_router(likes.router)
+api_router.include_router(reactions.router)
 api_router.include_router(attachments.router)
+api_router.include_router(uploads.router)
 api_router.include_router(dashboard.router)
 api_router.include_router(admin_boards.router)
 api_router.include_router(admin_menus.router)
 api_router.include_router(admin_users.router)
 api_router.include_router(admin_roles.router)
+api_router.include_router(admin_uploads.router)
+api_router.include_router(admin_database.router)
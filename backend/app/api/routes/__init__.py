@@ -2,6 +2,7 @@ from app.api.routes import (
     admin_boards,
     admin_menus,
     admin_roles,
+    admin_uploads,
     admin_users,
     attachments,
     auth,
@@ -11,12 +12,15 @@ from app.api.routes import (
     likes,
     menus,
     posts,
+    reactions,
+    uploads,
 )
 
 __all__ = [
     "admin_boards",
     "admin_menus",
     "admin_roles",
+    "admin_uploads",
     "admin_users",
     "attachments",
     "auth",
@@ -26,4 +30,6 @@ __all__ = [
     "likes",
     "menus",
     "posts",
+    "reactions",
+    "uploads",
 ]
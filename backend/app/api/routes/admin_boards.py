@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlmodel import Session, select
 
 from app.core.deps import CurrentUser, require_roles
-from app.db.session import get_session
+from app.db.session import get_admin_read_session, get_session
 from app.models.board import Board
 from app.models.enums import BoardType
 from app.schemas.board import BoardCreate, BoardOut, BoardUpdate
@@ -33,7 +33,7 @@ def _normalize_board_type(value: str | None) -> str:
 @router.get("", response_model=list[BoardOut])
 def list_admin_boards(
     include_inactive: bool = Query(default=True),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_admin_read_session),
     _: CurrentUser = Depends(require_roles("ADMIN")),
 ) -> list[BoardOut]:
     statement = select(Board).order_by(Board.sort_order.asc(), Board.id.asc())
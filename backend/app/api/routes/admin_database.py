@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends
+
+from app.core.deps import CurrentUser, require_roles
+from app.db.query_deadline import ROUTE_CLASSES, query_budget_ms, query_deadline_stats
+from app.schemas.database import QueryDeadlineClass, QueryDeadlineReport
+
+router = APIRouter(prefix="/admin/database", tags=["admin-database"])
+
+
+@router.get("/query-deadlines", response_model=QueryDeadlineReport)
+def query_deadline_report(_: CurrentUser = Depends(require_roles("ADMIN"))) -> QueryDeadlineReport:
+    # Counters are per process and reset on restart.
+    cancelled = query_deadline_stats.snapshot()
+    return QueryDeadlineReport(
+        items=[
+            QueryDeadlineClass(
+                route_class=route_class,
+                budget_ms=query_budget_ms(route_class),
+                cancelled=cancelled.get(route_class, 0),
+            )
+            for route_class in ROUTE_CLASSES
+        ],
+        total_cancelled=sum(cancelled.values()),
+    )
@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
 
 from app.core.deps import CurrentUser, require_roles
-from app.db.session import get_session
+from app.db.session import get_admin_read_session, get_session
 from app.models.menu import Menu
 from app.schemas.menu import MenuCreate, MenuOut, MenuReorderItem, MenuUpdate
 
@@ -16,7 +16,7 @@ CATEGORY_PATH = "__category__"
 
 @router.get("", response_model=list[MenuOut])
 def list_admin_menus(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_admin_read_session),
     _: CurrentUser = Depends(require_roles("ADMIN")),
 ) -> list[MenuOut]:
     menus = session.exec(select(Menu).order_by(Menu.sort_order.asc(), Menu.id.asc())).all()
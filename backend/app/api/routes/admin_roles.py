@@ -6,7 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session, select
 
 from app.core.deps import CurrentUser, require_roles
-from app.db.session import get_session
+from app.db.session import get_admin_read_session, get_session
 from app.models.board import Board
 from app.models.menu import Menu
 from app.models.menu_permission import MenuPermission
@@ -122,7 +122,7 @@ def _sync_boards_from_menu_permissions(session: Session, roles: list[Role]) -> N
 
 @router.get("/matrix", response_model=RoleMatrixResponse)
 def get_role_matrix(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_admin_read_session),
     _: CurrentUser = Depends(require_roles("ADMIN")),
 ) -> RoleMatrixResponse:
     roles = session.exec(select(Role).order_by(Role.id.asc())).all()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session, func, select
+
+from app.core.deps import CurrentUser, require_roles
+from app.db.session import get_admin_read_session, get_session
+from app.models.board import Board
+from app.models.upload_usage import UploadUsage
+from app.models.user import User
+from app.schemas.upload_usage import UploadUsageItem, UploadUsageReconcileOut, UploadUsageReport
+from app.services.upload_quota import USAGE_SCOPE_USER, USAGE_SCOPES, quota_bytes, reconcile_usage
+
+router = APIRouter(prefix="/admin/uploads", tags=["admin-uploads"])
+
+
+def _scope_names(session: Session, scope: str, scope_ids: list[int]) -> dict[int, str]:
+    if not scope_ids:
+        return {}
+    if scope == USAGE_SCOPE_USER:
+        return dict(session.exec(select(User.id, User.username).where(User.id.in_(scope_ids))).all())
+    return dict(session.exec(select(Board.id, Board.name).where(Board.id.in_(scope_ids))).all())
+
+
+@router.get("/usage", response_model=UploadUsageReport)
+def upload_usage_report(
+    scope: str = Query(default=USAGE_SCOPE_USER),
+    limit: int = Query(default=50, ge=1, le=500),
+    session: Session = Depends(get_admin_read_session),
+    _: CurrentUser = Depends(require_roles("ADMIN")),
+) -> UploadUsageReport:
+    if scope not in USAGE_SCOPES:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid scope")
+
+    # Reads the maintained counters only; no SUM over attachments.
+    rows = session.exec(
+        select(UploadUsage)
+        .where(UploadUsage.scope == scope)
+        .order_by(UploadUsage.bytes_used.desc(), UploadUsage.scope_id.asc())
+        .limit(limit)
+    ).all()
+    total_bytes, total_files = session.exec(
+        select(func.coalesce(func.sum(UploadUsage.bytes_used), 0), func.coalesce(func.sum(UploadUsage.file_count), 0))
+        .where(UploadUsage.scope == scope)
+    ).one()
+    names = _scope_names(session, scope, [row.scope_id for row in rows])
+    limit_bytes = quota_bytes(scope)
+
+    return UploadUsageReport(
+        scope=scope,
+        items=[
+            UploadUsageItem(
+                scope=row.scope,
+                scope_id=row.scope_id,
+                name=names.get(row.scope_id, "Unknown"),
+                bytes_used=row.bytes_used,
+                file_count=row.file_count,
+                quota_bytes=limit_bytes,
+                usage_ratio=round(row.bytes_used / limit_bytes, 4) if limit_bytes else None,
+                updated_at=row.updated_at,
+            )
+            for row in rows
+        ],
+        total_bytes=total_bytes,
+        total_files=total_files,
+    )
+
+
+@router.post("/usage/reconcile", response_model=UploadUsageReconcileOut)
+def reconcile_upload_usage(
+    session: Session = Depends(get_session),
+    _: CurrentUser = Depends(require_roles("ADMIN")),
+) -> UploadUsageReconcileOut:
+    report = reconcile_usage(session)
+    return UploadUsageReconcileOut(rows=report.rows, corrected=report.corrected)
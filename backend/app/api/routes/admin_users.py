@@ -5,7 +5,7 @@ from sqlalchemy import or_
 from sqlmodel import Session, func, select
 
 from app.core.deps import CurrentUser, require_roles
-from app.db.session import get_session
+from app.db.session import get_admin_read_session, get_session
 from app.models.role import Role
 from app.models.user import User
 from app.schemas.user import UserListResponse, UserLockUpdate, UserOut, UserRoleUpdate
@@ -18,7 +18,7 @@ def list_users(
     search: str | None = None,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=100),
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_admin_read_session),
     _: CurrentUser = Depends(require_roles("ADMIN")),
 ) -> UserListResponse:
     conditions = []
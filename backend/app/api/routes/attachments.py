@@ -1,19 +1,30 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from pathlib import Path
-from uuid import uuid4
+from urllib.parse import quote
 
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
-from fastapi.responses import FileResponse
-from sqlmodel import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import FileResponse, RedirectResponse, StreamingResponse
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
 
+from app.core.body_limit import BodyLimit
 from app.core.config import settings
 from app.core.deps import CurrentUser, ensure_board_permission, get_current_user
-from app.db.session import get_session
+from app.db.session import get_read_session
 from app.models.attachment import Attachment
 from app.models.post import Post
-from app.schemas.attachment import AttachmentOut
+from app.schemas.attachment import AttachmentBatchItem, AttachmentBatchOut, AttachmentOut
+from app.services.blob_store import FileTooLargeError, StoredBlob, abandon_blob, acquire_blob, write_upload
+from app.services.group_commit import group_commit
+from app.services.image_derivatives import DERIVATIVE_VARIANTS, derivative_pool, is_image
+from app.services.storage import storage_for
+from app.services.upload_quota import QuotaExceededError, charge_upload, ensure_quota_available
+from app.services.text_extraction import is_extractable, text_extraction_pool
+from app.services.zip_stream import ZipEntry, stream_zip
 
 router = APIRouter(tags=["attachments"])
 
@@ -34,51 +45,84 @@ ALLOWED_EXTENSIONS = {
     "zip",
 }
 MAX_FILE_SIZE = 20 * 1024 * 1024
+BATCH_UPLOAD_MAX_FILES = 10
+BATCH_UPLOAD_WORKERS = 4
+# Room for multipart boundaries and part headers on top of the file bytes.
+MULTIPART_OVERHEAD = 64 * 1024
+UPLOAD_BODY_LIMITS = [
+    BodyLimit(
+        "POST",
+        re.compile(rf"{re.escape(settings.api_prefix)}/posts/\d+/attachments"),
+        MAX_FILE_SIZE + MULTIPART_OVERHEAD,
+        "File too large (max 20MB)",
+    ),
+    BodyLimit(
+        "POST",
+        re.compile(rf"{re.escape(settings.api_prefix)}/posts/\d+/attachments/batch"),
+        BATCH_UPLOAD_MAX_FILES * (MAX_FILE_SIZE + MULTIPART_OVERHEAD),
+        f"Upload too large (max {BATCH_UPLOAD_MAX_FILES} files of 20MB)",
+    ),
+]
+DOWNLOAD_CACHE_CONTROL = "private, max-age=31536000, immutable"
+DOWNLOAD_MODE_DIRECT = "direct"
+DOWNLOAD_MODE_X_ACCEL = "x-accel"
+DOWNLOAD_MODE_X_SENDFILE = "x-sendfile"
 
 
-@router.post("/posts/{post_id}/attachments", response_model=AttachmentOut, status_code=status.HTTP_201_CREATED)
-async def upload_attachment(
-    post_id: int,
-    file: UploadFile = File(...),
-    session: Session = Depends(get_session),
-    current_user: CurrentUser = Depends(get_current_user),
-) -> AttachmentOut:
+def ensure_allowed_extension(filename: str) -> str:
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File extension not allowed")
+    return extension
+
+
+def load_writable_post(session: Session, post_id: int, current_user: CurrentUser) -> Post:
     post = session.get(Post, post_id)
     if not post or post.is_deleted:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
     ensure_board_permission(session, post.board_id, current_user, action="write")
+    return post
 
-    original_name = file.filename or "unnamed"
-    extension = original_name.rsplit(".", 1)[-1].lower() if "." in original_name else ""
-    if extension not in ALLOWED_EXTENSIONS:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File extension not allowed")
 
-    content = await file.read()
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File too large (max 20MB)")
+def schedule_post_processing(background_tasks: BackgroundTasks, attachment: Attachment) -> None:
+    # Derivatives and text extraction work on local files only; objects in S3 are served as uploaded.
+    path = storage_for(attachment.path).local_path(attachment.path)
+    if path is None:
+        return
+    if is_image(attachment.original_name):
+        background_tasks.add_task(derivative_pool.schedule, path)
+    elif is_extractable(attachment.original_name) and attachment.content_hash:
+        background_tasks.add_task(
+            text_extraction_pool.schedule, attachment.content_hash, path, attachment.original_name
+        )
 
-    now = datetime.now(timezone.utc)
-    folder = settings.upload_path / str(now.year) / f"{now.month:02d}"
-    folder.mkdir(parents=True, exist_ok=True)
 
-    stored_name = f"{uuid4().hex}.{extension}"
-    file_path = folder / stored_name
-    file_path.write_bytes(content)
+def quota_exceeded(exc: QuotaExceededError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc))
 
-    attachment = Attachment(
-        post_id=post.id,
-        uploader_id=current_user.id,
-        original_name=original_name,
-        stored_name=stored_name,
-        mime_type=file.content_type or "application/octet-stream",
-        size_bytes=len(content),
-        path=str(file_path),
-    )
-    session.add(attachment)
-    session.commit()
-    session.refresh(attachment)
 
+def save_attachment(session: Session, attachment: Attachment, board_id: int, blob: StoredBlob) -> Attachment:
+    # The blob is already in storage and the checks ran on a read session; the writer is only taken here,
+    # for the quota charge, the blob reference and the row. A blob nothing ended up referencing is removed.
+    def insert_attachment(write_session: Session) -> Attachment:
+        charge_upload(write_session, attachment.uploader_id, board_id, blob.size_bytes)
+        acquire_blob(write_session, blob.content_hash, blob.size_bytes, blob.path)
+        write_session.add(attachment)
+        write_session.flush()
+        return attachment
+
+    try:
+        return group_commit.run(insert_attachment)
+    except QuotaExceededError as exc:
+        abandon_blob(session, blob)
+        raise quota_exceeded(exc) from exc
+    except Exception:
+        abandon_blob(session, blob)
+        raise
+
+
+def attachment_to_out(attachment: Attachment) -> AttachmentOut:
     return AttachmentOut(
         id=attachment.id,
         post_id=attachment.post_id,
@@ -89,12 +133,170 @@ async def upload_attachment(
     )
 
 
-@router.get("/attachments/{attachment_id}/download")
-def download_attachment(
-    attachment_id: int,
-    session: Session = Depends(get_session),
+# Sync handler on purpose: FastAPI runs it in the worker threadpool, so hashing, the blob write
+# and SQLite work never block the event loop.
+@router.post("/posts/{post_id}/attachments", response_model=AttachmentOut, status_code=status.HTTP_201_CREATED)
+def upload_attachment(
+    post_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user),
-):
+) -> AttachmentOut:
+    post = load_writable_post(session, post_id, current_user)
+    original_name = file.filename or "unnamed"
+    ensure_allowed_extension(original_name)
+
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File too large (max 20MB)")
+
+    try:
+        if file.size is not None:
+            ensure_quota_available(session, current_user.id, post.board_id, file.size)
+        blob = write_upload(file.file, MAX_FILE_SIZE)
+    except FileTooLargeError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File too large (max 20MB)") from exc
+    except QuotaExceededError as exc:
+        raise quota_exceeded(exc) from exc
+
+    attachment = Attachment(
+        post_id=post.id,
+        uploader_id=current_user.id,
+        original_name=original_name,
+        stored_name=blob.content_hash,
+        mime_type=file.content_type or "application/octet-stream",
+        size_bytes=blob.size_bytes,
+        content_hash=blob.content_hash,
+        path=str(blob.path),
+    )
+    attachment = save_attachment(session, attachment, post.board_id, blob)
+    schedule_post_processing(background_tasks, attachment)
+    return attachment_to_out(attachment)
+
+
+def _write_batch_file(file: UploadFile) -> StoredBlob:
+    ensure_allowed_extension(file.filename or "unnamed")
+    if file.size is not None and file.size > MAX_FILE_SIZE:
+        raise FileTooLargeError("File too large (max 20MB)")
+    return write_upload(file.file, MAX_FILE_SIZE)
+
+
+def _batch_error(exc: Exception) -> str:
+    if isinstance(exc, HTTPException):
+        return str(exc.detail)
+    if isinstance(exc, FileTooLargeError):
+        return "File too large (max 20MB)"
+    return "Upload failed"
+
+
+@router.post(
+    "/posts/{post_id}/attachments/batch", response_model=AttachmentBatchOut, status_code=status.HTTP_201_CREATED
+)
+def upload_attachments_batch(
+    post_id: int,
+    background_tasks: BackgroundTasks,
+    files: list[UploadFile] = File(...),
+    all_or_nothing: bool = Query(default=False),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> AttachmentBatchOut:
+    post = load_writable_post(session, post_id, current_user)
+    if len(files) > BATCH_UPLOAD_MAX_FILES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Too many files (max {BATCH_UPLOAD_MAX_FILES})"
+        )
+
+    # Hashing and blob writes run in parallel threads before any writer is taken; only the row inserts
+    # below go through the write connection.
+    with ThreadPoolExecutor(max_workers=min(BATCH_UPLOAD_WORKERS, len(files))) as executor:
+        futures = [executor.submit(_write_batch_file, file) for file in files]
+    results: list[StoredBlob | Exception] = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as exc:
+            results.append(exc)
+    written = [result for result in results if isinstance(result, StoredBlob)]
+
+    failures = [(file, result) for file, result in zip(files, results) if isinstance(result, Exception)]
+    if all_or_nothing and failures:
+        for blob in written:
+            abandon_blob(session, blob)
+        file, exc = failures[0]
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"{file.filename or 'unnamed'}: {_batch_error(exc)}"
+        )
+
+    pending: list[tuple[str, Attachment | Exception]] = []
+    for file, result in zip(files, results):
+        original_name = file.filename or "unnamed"
+        if isinstance(result, Exception):
+            pending.append((original_name, result))
+            continue
+        pending.append(
+            (
+                original_name,
+                Attachment(
+                    post_id=post.id,
+                    uploader_id=current_user.id,
+                    original_name=original_name,
+                    stored_name=result.content_hash,
+                    mime_type=file.content_type or "application/octet-stream",
+                    size_bytes=result.size_bytes,
+                    content_hash=result.content_hash,
+                    path=str(result.path),
+                ),
+            )
+        )
+
+    def insert_batch(write_session: Session) -> tuple[list[AttachmentBatchItem], list[Attachment]]:
+        items: list[AttachmentBatchItem] = []
+        created: list[Attachment] = []
+        for original_name, attachment in pending:
+            if isinstance(attachment, Exception):
+                error = _batch_error(attachment)
+                items.append(AttachmentBatchItem(original_name=original_name, ok=False, error=error))
+                continue
+            # A savepoint per file keeps one failed insert from undoing the rest of the batch.
+            try:
+                with write_session.begin_nested():
+                    charge_upload(write_session, current_user.id, post.board_id, attachment.size_bytes)
+                    acquire_blob(write_session, attachment.content_hash, attachment.size_bytes, attachment.path)
+                    write_session.add(attachment)
+            except (QuotaExceededError, SQLAlchemyError) as exc:
+                if all_or_nothing:
+                    # Raising undoes the whole batch's savepoint.
+                    if isinstance(exc, QuotaExceededError):
+                        raise quota_exceeded(exc) from exc
+                    raise HTTPException(
+                        status_code=status.HTTP_400_BAD_REQUEST, detail=f"{original_name}: Upload failed"
+                    ) from None
+                error = str(exc) if isinstance(exc, QuotaExceededError) else "Upload failed"
+                items.append(AttachmentBatchItem(original_name=original_name, ok=False, error=error))
+                continue
+            item = AttachmentBatchItem(original_name=original_name, ok=True, attachment=attachment_to_out(attachment))
+            items.append(item)
+            created.append(attachment)
+        return items, created
+
+    try:
+        items, created = group_commit.run(insert_batch)
+    except Exception:
+        for blob in written:
+            abandon_blob(session, blob)
+        raise
+
+    stored = {attachment.content_hash for attachment in created}
+    for blob in written:
+        if blob.content_hash not in stored:
+            abandon_blob(session, blob)
+    for attachment in created:
+        schedule_post_processing(background_tasks, attachment)
+
+    return AttachmentBatchOut(items=items, succeeded=len(created), failed=len(items) - len(created))
+
+
+def _load_downloadable(session: Session, attachment_id: int, current_user: CurrentUser) -> Attachment:
     attachment = session.get(Attachment, attachment_id)
     if not attachment:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Attachment not found")
@@ -104,9 +306,165 @@ def download_attachment(
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
 
     ensure_board_permission(session, post.board_id, current_user, action="read")
+    return attachment
+
+
+def _etag(attachment: Attachment, variant: str | None = None) -> str | None:
+    if not attachment.content_hash:
+        return None
+    return f'"{attachment.content_hash}-{variant}"' if variant else f'"{attachment.content_hash}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [item.strip() for item in if_none_match.split(",")]
+    return "*" in candidates or etag in {item.removeprefix("W/") for item in candidates}
+
+
+def _cache_headers(attachment: Attachment, variant: str | None = None) -> dict[str, str]:
+    etag = _etag(attachment, variant)
+    if not etag:
+        return {}
+    # Stored content is addressed by its hash and never rewritten, so clients may keep it indefinitely.
+    return {"ETag": etag, "Cache-Control": DOWNLOAD_CACHE_CONTROL}
+
+
+def _content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+def _offloaded_response(
+    file_path: Path, filename: str, media_type: str, headers: dict[str, str]
+) -> Response | None:
+    mode = settings.download_mode.lower()
+    if mode == DOWNLOAD_MODE_DIRECT:
+        return None
+
+    offload_headers = {**headers, "Content-Disposition": _content_disposition(filename)}
+    if mode == DOWNLOAD_MODE_X_SENDFILE:
+        offload_headers["X-Sendfile"] = str(file_path)
+    elif mode == DOWNLOAD_MODE_X_ACCEL:
+        if not file_path.is_relative_to(settings.upload_path):
+            return None
+        relative = file_path.relative_to(settings.upload_path).as_posix()
+        offload_headers["X-Accel-Redirect"] = f"{settings.download_accel_prefix.rstrip('/')}/{quote(relative)}"
+    else:
+        return None
+    # The front proxy streams the bytes (including Range requests); the app only authorizes.
+    return Response(headers=offload_headers, media_type=media_type)
+
+
+@router.head("/attachments/{attachment_id}/download")
+def head_attachment(
+    attachment_id: int,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> Response:
+    attachment = _load_downloadable(session, attachment_id, current_user)
+    if not attachment.content_hash and not storage_for(attachment.path).exists(attachment.path):
+        # Only legacy rows without a stored hash need the disk check; blob rows imply the file.
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+
+    headers = {
+        **_cache_headers(attachment),
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(attachment.size_bytes),
+        "Content-Disposition": _content_disposition(attachment.original_name),
+    }
+    return Response(headers=headers, media_type=attachment.mime_type)
+
+
+def _variant_file(attachment: Attachment, variant: str) -> Path | None:
+    if variant not in DERIVATIVE_VARIANTS:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unknown variant")
+    local_path = storage_for(attachment.path).local_path(attachment.path)
+    if local_path is None or not is_image(attachment.original_name):
+        return None
+    return derivative_pool.get(local_path, variant)
+
+
+@router.get("/attachments/{attachment_id}/download")
+def download_attachment(
+    attachment_id: int,
+    variant: str | None = Query(default=None),
+    if_none_match: str | None = Header(default=None),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+):
+    attachment = _load_downloadable(session, attachment_id, current_user)
+
+    storage = storage_for(attachment.path)
+    file_path = storage.local_path(attachment.path)
+    filename = attachment.original_name
+    media_type = attachment.mime_type
+    if variant:
+        # Non-images and failed renders fall back to the original file.
+        variant_path = _variant_file(attachment, variant)
+        if variant_path is None:
+            variant = None
+        else:
+            file_path = variant_path
+            filename = f"{filename.rsplit('.', 1)[0]}.webp"
+            media_type = "image/webp"
+
+    headers = _cache_headers(attachment, variant)
+    etag = _etag(attachment, variant)
+    if etag and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    if file_path is None:
+        # Object storage: the client fetches the bytes straight from the bucket with a short-lived URL.
+        presigned = storage.presigned_url(attachment.path, filename, media_type)
+        if presigned is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
+        return RedirectResponse(presigned, status_code=status.HTTP_307_TEMPORARY_REDIRECT)
+
+    offloaded = _offloaded_response(file_path, filename, media_type, headers)
+    if offloaded is not None:
+        return offloaded
 
-    file_path = Path(attachment.path)
     if not file_path.exists():
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="File not found")
 
-    return FileResponse(path=file_path, filename=attachment.original_name, media_type=attachment.mime_type)
+    # FileResponse answers Range/If-Range itself (206 Partial Content) and keeps our strong ETag.
+    return FileResponse(path=file_path, filename=filename, media_type=media_type, headers=headers)
+
+
+@router.get("/posts/{post_id}/attachments.zip")
+def download_post_attachments_zip(
+    post_id: int,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> StreamingResponse:
+    post = session.get(Post, post_id)
+    if not post or (post.is_deleted and current_user.role_code != "ADMIN"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+    ensure_board_permission(session, post.board_id, current_user, action="read")
+
+    attachments = session.exec(
+        select(Attachment).where(Attachment.post_id == post_id).order_by(Attachment.id.asc())
+    ).all()
+    entries = [
+        ZipEntry(
+            name=item.original_name,
+            open_source=partial(storage_for(item.path).open, item.path),
+            size_bytes=item.size_bytes,
+            modified_at=item.created_at,
+        )
+        for item in attachments
+        if storage_for(item.path).exists(item.path)
+    ]
+    if not entries:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No attachments")
+
+    # Built on the fly while streaming: memory stays at one chunk and nothing is written to disk.
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type="application/zip",
+        headers={"Content-Disposition": _content_disposition(f"post-{post_id}-attachments.zip")},
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import update
 from sqlmodel import Session, select
 
 from app.core.deps import CurrentUser, get_current_user
@@ -15,36 +16,49 @@ from app.core.security import (
     hash_token,
     verify_password,
 )
-from app.db.session import get_session
+from app.db.session import get_read_session, get_session
 from app.models.enums import RoleCode
 from app.models.auth import RefreshToken
 from app.models.role import Role
 from app.models.user import User
 from app.schemas.auth import LoginRequest, LogoutRequest, RefreshRequest, RegisterRequest, TokenPair, UserMe
+from app.services.group_commit import group_commit
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
-def _build_token_pair(session: Session, user: User, role: Role) -> TokenPair:
-    access_token = create_access_token(user.id, role.code)
-    refresh_token = create_refresh_token(user.id, role.code)
+def _new_token_pair(user_id: int, role_code: str) -> tuple[TokenPair, RefreshToken]:
+    access_token = create_access_token(user_id, role_code)
+    refresh_token = create_refresh_token(user_id, role_code)
     payload = decode_token(refresh_token, expected_type="refresh")
     expires_at = datetime.utcfromtimestamp(payload["exp"])
 
-    session.add(
-        RefreshToken(
-            user_id=user.id,
-            token_hash=hash_token(refresh_token),
-            expires_at=expires_at,
-        )
+    stored = RefreshToken(
+        user_id=user_id,
+        token_hash=hash_token(refresh_token),
+        expires_at=expires_at,
     )
-    session.commit()
+    return TokenPair(access_token=access_token, refresh_token=refresh_token), stored
+
+
+def _revoke_refresh_token(session: Session, token_id: int) -> bool:
+    revoked = session.exec(
+        update(RefreshToken)
+        .where(RefreshToken.id == token_id)
+        .where(RefreshToken.revoked_at == None)
+        .values(revoked_at=datetime.utcnow())
+    )
+    return revoked.rowcount == 1
+
 
-    return TokenPair(access_token=access_token, refresh_token=refresh_token)
+def _issue_token_pair(user: User, role: Role) -> TokenPair:
+    pair, stored = _new_token_pair(user.id, role.code)
+    group_commit.run(lambda session: session.add(stored))
+    return pair
 
 
 @router.post("/login", response_model=TokenPair)
-def login(payload: LoginRequest, session: Session = Depends(get_session)) -> TokenPair:
+def login(payload: LoginRequest, session: Session = Depends(get_read_session)) -> TokenPair:
     statement = select(User).where(User.username == payload.username)
     user = session.exec(statement).first()
     if not user or not verify_password(payload.password, user.password_hash):
@@ -60,7 +74,7 @@ def login(payload: LoginRequest, session: Session = Depends(get_session)) -> Tok
     if not role:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Role missing")
 
-    return _build_token_pair(session, user, role)
+    return _issue_token_pair(user, role)
 
 
 @router.post("/register", response_model=TokenPair, status_code=status.HTTP_201_CREATED)
@@ -88,11 +102,14 @@ def register(payload: RegisterRequest, session: Session = Depends(get_session))
     session.add(user)
     session.flush()
 
-    return _build_token_pair(session, user, user_role)
+    pair, stored = _new_token_pair(user.id, user_role.code)
+    session.add(stored)
+    session.commit()
+    return pair
 
 
 @router.get("/me", response_model=UserMe)
-def me(current_user: CurrentUser = Depends(get_current_user), session: Session = Depends(get_session)) -> UserMe:
+def me(current_user: CurrentUser = Depends(get_current_user), session: Session = Depends(get_read_session)) -> UserMe:
     db_user = session.get(User, current_user.id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -108,7 +125,7 @@ def me(current_user: CurrentUser = Depends(get_current_user), session: Session =
 
 
 @router.post("/refresh", response_model=TokenPair)
-def refresh_tokens(payload: RefreshRequest, session: Session = Depends(get_session)) -> TokenPair:
+def refresh_tokens(payload: RefreshRequest, session: Session = Depends(get_read_session)) -> TokenPair:
     try:
         token_payload = decode_token(payload.refresh_token, expected_type="refresh")
     except TokenError as exc:
@@ -132,15 +149,20 @@ def refresh_tokens(payload: RefreshRequest, session: Session = Depends(get_sessi
     if not role:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Role unavailable")
 
-    stored.revoked_at = datetime.utcnow()
-    session.add(stored)
-    session.commit()
+    pair, replacement = _new_token_pair(user.id, role.code)
+
+    def rotate(write_session: Session) -> None:
+        # The conditional revoke makes a replayed refresh token lose the race instead of minting a second pair.
+        if not _revoke_refresh_token(write_session, stored.id):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Refresh token invalid")
+        write_session.add(replacement)
 
-    return _build_token_pair(session, user, role)
+    group_commit.run(rotate)
+    return pair
 
 
 @router.post("/logout")
-def logout(payload: LogoutRequest, session: Session = Depends(get_session)) -> dict[str, str]:
+def logout(payload: LogoutRequest, session: Session = Depends(get_read_session)) -> dict[str, str]:
     try:
         decode_token(payload.refresh_token, expected_type="refresh")
     except TokenError as exc:
@@ -149,8 +171,6 @@ def logout(payload: LogoutRequest, session: Session = Depends(get_session)) -> d
     token_hash = hash_token(payload.refresh_token)
     stored = session.exec(select(RefreshToken).where(RefreshToken.token_hash == token_hash)).first()
     if stored and stored.revoked_at is None:
-        stored.revoked_at = datetime.utcnow()
-        session.add(stored)
-        session.commit()
+        group_commit.run(lambda write_session: _revoke_refresh_token(write_session, stored.id))
 
     return {"message": "Logged out"}
@@ -1,18 +1,44 @@
 from __future__ import annotations
 
+import base64
+import binascii
 from datetime import datetime, timezone
-
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-
-from app.core.deps import CurrentUser, ensure_board_permission, get_current_user, has_admin_privilege
-from app.db.session import get_session
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import and_, insert, literal, or_, update
+from sqlmodel import Session, func, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.deps import (
+    CurrentUser,
+    ensure_board_permission,
+    get_current_user,
+    get_current_user_async,
+    has_admin_privilege,
+)
+from app.db.session import get_async_read_session, get_read_session, get_session
 from app.models.comment import Comment
+from app.models.comment_closure import CommentClosure
 from app.models.post import Post
 from app.models.user import User
-from app.schemas.comment import CommentCreate, CommentOut, CommentUpdate
+from app.schemas.comment import (
+    CommentCreate,
+    CommentOut,
+    CommentPage,
+    CommentThreadOut,
+    CommentThreadPage,
+    CommentUpdate,
+)
+from app.services.group_commit import group_commit
 
 router = APIRouter(tags=["comments"])
+COMMENT_PAGE_DEFAULT_LIMIT = 50
+COMMENT_PAGE_MAX_LIMIT = 200
+REPLY_PREVIEW_DEFAULT = 3
+REPLY_PREVIEW_MAX = 20
+CommentOrder = Literal["asc", "desc"]
+MAX_COMMENT_DEPTH = 5
 
 
 def _comment_out(comment: Comment, author_name: str) -> CommentOut:
@@ -21,6 +47,8 @@ def _comment_out(comment: Comment, author_name: str) -> CommentOut:
         post_id=comment.post_id,
         author_id=comment.author_id,
         author_name=author_name,
+        parent_id=comment.parent_id,
+        depth=comment.depth,
         content=comment.content,
         is_deleted=comment.is_deleted,
         created_at=comment.created_at,
@@ -28,12 +56,30 @@ def _comment_out(comment: Comment, author_name: str) -> CommentOut:
     )
 
 
-@router.get("/posts/{post_id}/comments", response_model=list[CommentOut])
-def list_comments(
-    post_id: int,
-    session: Session = Depends(get_session),
-    current_user: CurrentUser = Depends(get_current_user),
-) -> list[CommentOut]:
+def _encode_cursor(comment: Comment) -> str:
+    raw = f"{comment.created_at.isoformat()}|{comment.id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+        created_at, comment_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except (binascii.Error, UnicodeError, ValueError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def _author_names(session: Session, comments: list[Comment]) -> dict[int, str]:
+    user_ids = list({comment.author_id for comment in comments})
+    if not user_ids:
+        return {}
+    rows = session.exec(select(User.id, User.username).where(User.id.in_(user_ids))).all()
+    return {int(user_id): username for user_id, username in rows}
+
+
+def _load_readable_post(session: Session, post_id: int, current_user: CurrentUser) -> Post:
     post = session.get(Post, post_id)
     if not post:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
@@ -41,25 +87,285 @@ def list_comments(
     ensure_board_permission(session, post.board_id, current_user, action="read")
     if post.is_deleted and current_user.role_code != "ADMIN":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    return post
+
+
+def _seek_comments(
+    session: Session,
+    post: Post,
+    current_user: CurrentUser,
+    order: CommentOrder,
+    cursor: str | None,
+    limit: int,
+    latest: int | None = None,
+    roots_only: bool = False,
+) -> tuple[list[Comment], str | None, bool]:
+    # "Latest N" is a newest-first page shown in reading order; its cursor keeps walking older comments.
+    descending = latest is not None or order == "desc"
+    if latest is not None:
+        limit = latest
+        cursor = None
+
+    statement = select(Comment).where(Comment.post_id == post.id)
+    if roots_only:
+        statement = statement.where(Comment.parent_id == None)
+    if current_user.role_code != "ADMIN":
+        statement = statement.where(Comment.is_deleted == False)
+
+    if cursor:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        if descending:
+            statement = statement.where(
+                or_(
+                    Comment.created_at < cursor_created_at,
+                    and_(Comment.created_at == cursor_created_at, Comment.id < cursor_id),
+                )
+            )
+        else:
+            statement = statement.where(
+                or_(
+                    Comment.created_at > cursor_created_at,
+                    and_(Comment.created_at == cursor_created_at, Comment.id > cursor_id),
+                )
+            )
+
+    if descending:
+        statement = statement.order_by(Comment.created_at.desc(), Comment.id.desc())
+    else:
+        statement = statement.order_by(Comment.created_at.asc(), Comment.id.asc())
+
+    rows = session.exec(statement.limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    comments = list(rows[:limit])
+    next_cursor = _encode_cursor(comments[-1]) if has_more and comments else None
+    if latest is not None:
+        comments.reverse()
+    return comments, next_cursor, has_more
+
+
+def _comment_total(post: Post, current_user: CurrentUser) -> int:
+    # comment_count only tracks visible comments; admins also page through deleted ones.
+    if current_user.role_code != "ADMIN":
+        return post.comment_count
+    return post.comment_count + post.deleted_comment_count
+
+
+def fetch_comment_page(
+    session: Session,
+    post: Post,
+    current_user: CurrentUser,
+    order: CommentOrder = "asc",
+    cursor: str | None = None,
+    limit: int = COMMENT_PAGE_DEFAULT_LIMIT,
+    latest: int | None = None,
+) -> CommentPage:
+    comments, next_cursor, has_more = _seek_comments(
+        session, post, current_user, order=order, cursor=cursor, limit=limit, latest=latest
+    )
+    user_map = _author_names(session, comments)
+    return CommentPage(
+        items=[_comment_out(comment, user_map.get(comment.author_id, "Unknown")) for comment in comments],
+        total=_comment_total(post, current_user),
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+def _reply_counts(session: Session, comment_ids: list[int], include_deleted: bool) -> dict[int, int]:
+    if not comment_ids:
+        return {}
+
+    statement = (
+        select(CommentClosure.ancestor_id, func.count())
+        .select_from(CommentClosure)
+        .join(Comment, Comment.id == CommentClosure.descendant_id)
+        .where(CommentClosure.ancestor_id.in_(comment_ids))
+        .where(CommentClosure.depth > 0)
+    )
+    if not include_deleted:
+        statement = statement.where(Comment.is_deleted == False)
+    rows = session.exec(statement.group_by(CommentClosure.ancestor_id)).all()
+    return {int(comment_id): int(count) for comment_id, count in rows}
+
+
+def _reply_previews(
+    session: Session, root_ids: list[int], preview: int, include_deleted: bool
+) -> dict[int, list[Comment]]:
+    if not root_ids or preview <= 0:
+        return {}
+
+    conditions = [CommentClosure.ancestor_id.in_(root_ids), CommentClosure.depth > 0]
+    if not include_deleted:
+        conditions.append(Comment.is_deleted == False)
+
+    ranked = (
+        select(
+            Comment.id.label("comment_id"),
+            CommentClosure.ancestor_id.label("root_id"),
+            func.row_number()
+            .over(
+                partition_by=CommentClosure.ancestor_id,
+                order_by=(Comment.created_at.asc(), Comment.id.asc()),
+            )
+            .label("position"),
+        )
+        .join(CommentClosure, CommentClosure.descendant_id == Comment.id)
+        .where(*conditions)
+        .subquery()
+    )
+    rows = session.exec(
+        select(Comment, ranked.c.root_id)
+        .join(ranked, ranked.c.comment_id == Comment.id)
+        .where(ranked.c.position <= preview)
+        .order_by(ranked.c.root_id, ranked.c.position)
+    ).all()
+
+    previews: dict[int, list[Comment]] = {}
+    for comment, root_id in rows:
+        previews.setdefault(int(root_id), []).append(comment)
+    return previews
+
+
+def fetch_thread_page(
+    session: Session,
+    post: Post,
+    current_user: CurrentUser,
+    order: CommentOrder = "asc",
+    cursor: str | None = None,
+    limit: int = COMMENT_PAGE_DEFAULT_LIMIT,
+    preview: int = REPLY_PREVIEW_DEFAULT,
+) -> CommentThreadPage:
+    include_deleted = current_user.role_code == "ADMIN"
+    roots, next_cursor, has_more = _seek_comments(
+        session, post, current_user, order=order, cursor=cursor, limit=limit, roots_only=True
+    )
+    root_ids = [root.id for root in roots]
+    reply_counts = _reply_counts(session, root_ids, include_deleted)
+    previews = _reply_previews(session, root_ids, preview, include_deleted)
+
+    user_map = _author_names(session, roots + [reply for replies in previews.values() for reply in replies])
+    items = [
+        CommentThreadOut(
+            **_comment_out(root, user_map.get(root.author_id, "Unknown")).model_dump(),
+            reply_count=reply_counts.get(root.id, 0),
+            replies=[_comment_out(reply, user_map.get(reply.author_id, "Unknown")) for reply in previews.get(root.id, [])],
+        )
+        for root in roots
+    ]
+    return CommentThreadPage(
+        items=items,
+        total=_comment_total(post, current_user),
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
+def _insert_closure_rows(session: Session, comment: Comment) -> None:
+    session.add(CommentClosure(ancestor_id=comment.id, descendant_id=comment.id, depth=0))
+    if comment.parent_id is None:
+        return
+
+    ancestors = select(
+        CommentClosure.ancestor_id,
+        literal(comment.id),
+        CommentClosure.depth + 1,
+    ).where(CommentClosure.descendant_id == comment.parent_id)
+    session.exec(
+        insert(CommentClosure).from_select(["ancestor_id", "descendant_id", "depth"], ancestors)
+    )
+
+
+def _adjust_comment_count(session: Session, post_id: int, delta: int, deleted_delta: int = 0) -> None:
+    session.exec(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(
+            comment_count=Post.comment_count + delta,
+            deleted_comment_count=Post.deleted_comment_count + deleted_delta,
+        )
+    )
+
+
+@router.get("/posts/{post_id}/comments", response_model=list[CommentOut])
+async def list_comments(
+    post_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: CurrentUser = Depends(get_current_user_async),
+) -> list[CommentOut]:
+    await session.run_sync(_load_readable_post, post_id, current_user)
 
     statement = select(Comment).where(Comment.post_id == post_id)
     if current_user.role_code != "ADMIN":
         statement = statement.where(Comment.is_deleted == False)
     statement = statement.order_by(Comment.created_at.asc())
 
-    comments = session.exec(statement).all()
-    user_ids = [comment.author_id for comment in comments]
-    users = session.exec(select(User).where(User.id.in_(user_ids))).all() if user_ids else []
-    user_map = {user.id: user.username for user in users}
+    comments = (await session.exec(statement)).all()
+    user_map = await session.run_sync(_author_names, comments)
 
     return [_comment_out(comment, user_map.get(comment.author_id, "Unknown")) for comment in comments]
 
 
+@router.get("/posts/{post_id}/comments/page", response_model=CommentPage)
+def list_comments_page(
+    post_id: int,
+    order: CommentOrder = Query(default="asc"),
+    cursor: str | None = None,
+    limit: int = Query(default=COMMENT_PAGE_DEFAULT_LIMIT, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    latest: int | None = Query(default=None, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CommentPage:
+    post = _load_readable_post(session, post_id, current_user)
+    return fetch_comment_page(session, post, current_user, order=order, cursor=cursor, limit=limit, latest=latest)
+
+
+@router.get("/posts/{post_id}/comments/threads", response_model=CommentThreadPage)
+def list_comment_threads(
+    post_id: int,
+    order: CommentOrder = Query(default="asc"),
+    cursor: str | None = None,
+    limit: int = Query(default=COMMENT_PAGE_DEFAULT_LIMIT, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    preview: int = Query(default=REPLY_PREVIEW_DEFAULT, ge=0, le=REPLY_PREVIEW_MAX),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> CommentThreadPage:
+    post = _load_readable_post(session, post_id, current_user)
+    return fetch_thread_page(session, post, current_user, order=order, cursor=cursor, limit=limit, preview=preview)
+
+
+@router.get("/comments/{comment_id}/replies", response_model=list[CommentOut])
+def list_replies(
+    comment_id: int,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> list[CommentOut]:
+    comment = session.get(Comment, comment_id)
+    if not comment or (comment.is_deleted and current_user.role_code != "ADMIN"):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Comment not found")
+
+    _load_readable_post(session, comment.post_id, current_user)
+
+    statement = (
+        select(Comment)
+        .join(CommentClosure, CommentClosure.descendant_id == Comment.id)
+        .where(CommentClosure.ancestor_id == comment_id)
+        .where(CommentClosure.depth > 0)
+    )
+    if current_user.role_code != "ADMIN":
+        statement = statement.where(Comment.is_deleted == False)
+    statement = statement.order_by(Comment.created_at.asc(), Comment.id.asc())
+
+    replies = session.exec(statement).all()
+    user_map = _author_names(session, replies)
+
+    return [_comment_out(reply, user_map.get(reply.author_id, "Unknown")) for reply in replies]
+
+
 @router.post("/posts/{post_id}/comments", response_model=CommentOut, status_code=status.HTTP_201_CREATED)
 def create_comment(
     post_id: int,
     payload: CommentCreate,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user),
 ) -> CommentOut:
     post = session.get(Post, post_id)
@@ -68,12 +374,30 @@ def create_comment(
 
     ensure_board_permission(session, post.board_id, current_user, action="write")
 
-    comment = Comment(post_id=post_id, author_id=current_user.id, content=payload.content)
-    session.add(comment)
-    session.commit()
-    session.refresh(comment)
+    parent: Comment | None = None
+    if payload.parent_id is not None:
+        parent = session.get(Comment, payload.parent_id)
+        if not parent or parent.post_id != post_id or parent.is_deleted:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent comment not found")
+        if parent.depth + 1 > MAX_COMMENT_DEPTH:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Reply depth limit exceeded")
+
+    comment = Comment(
+        post_id=post_id,
+        author_id=current_user.id,
+        parent_id=parent.id if parent else None,
+        depth=parent.depth + 1 if parent else 0,
+        content=payload.content,
+    )
 
-    return _comment_out(comment, current_user.username)
+    def insert_comment(write_session: Session) -> Comment:
+        write_session.add(comment)
+        write_session.flush()
+        _insert_closure_rows(write_session, comment)
+        _adjust_comment_count(write_session, post_id, 1)
+        return comment
+
+    return _comment_out(group_commit.run(insert_comment), current_user.username)
 
 
 def _can_edit(comment: Comment, current_user: CurrentUser) -> bool:
@@ -129,10 +453,16 @@ def delete_comment(
     if not _can_edit(comment, current_user):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Cannot delete this comment")
 
-    comment.is_deleted = True
-    comment.deleted_at = datetime.now(timezone.utc)
-    comment.updated_at = datetime.now(timezone.utc)
-    session.add(comment)
+    # Only the delete that flips is_deleted decrements, so concurrent deletes cannot count twice.
+    now = datetime.now(timezone.utc)
+    deleted = session.exec(
+        update(Comment)
+        .where(Comment.id == comment.id)
+        .where(Comment.is_deleted == False)
+        .values(is_deleted=True, deleted_at=now, updated_at=now)
+    )
+    if deleted.rowcount == 1:
+        _adjust_comment_count(session, post.id, -1, deleted_delta=1)
     session.commit()
 
     return {"message": "Comment deleted"}
@@ -4,7 +4,7 @@ from fastapi import APIRouter, Depends
 from sqlmodel import Session, func, select
 
 from app.core.deps import CurrentUser, can_access_board_by_menu, get_current_user
-from app.db.session import get_session
+from app.db.session import get_read_session
 from app.models.board import Board
 from app.models.post import Post
 
@@ -13,7 +13,7 @@ router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
 def dashboard_summary(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user),
 ) -> dict[str, int]:
     board_conditions = [Board.is_active == True]
@@ -1,15 +1,29 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, func, select
-
-from app.core.deps import CurrentUser, ensure_board_permission, get_current_user
-from app.db.session import get_session
+from collections.abc import Callable
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from app.core.deps import (
+    CurrentUser,
+    ensure_board_permission,
+    get_current_user,
+    parse_id_list,
+    readable_board_ids,
+)
+from app.db.session import get_read_session
 from app.models.like import PostLike
 from app.models.post import Post
-from app.schemas.like import LikeStatusOut
+from app.schemas.like import LikeBatchStatusOut, LikeStatusItem, LikeStatusOut
+from app.services.group_commit import group_commit
+from app.services.like_cache import liked_set_cache
 
 router = APIRouter(prefix="/posts", tags=["likes"])
+LIKE_STATUS_BATCH_MAX = 100
 
 
 def _load_post_for_like(session: Session, post_id: int, current_user: CurrentUser) -> Post:
@@ -21,53 +35,148 @@ def _load_post_for_like(session: Session, post_id: int, current_user: CurrentUse
     return post
 
 
-def _count_likes(session: Session, post_id: int) -> int:
-    return int(
-        session.exec(
-            select(func.count()).select_from(PostLike).where(PostLike.post_id == post_id)
-        ).one()
+def _adjust_like_count(session: Session, post_id: int, delta: int) -> None:
+    session.exec(
+        update(Post)
+        .where(Post.id == post_id)
+        .values(like_count=Post.like_count + delta)
+    )
+
+
+def _current_like_count(session: Session, post_id: int) -> int:
+    return int(session.exec(select(Post.like_count).where(Post.id == post_id)).one())
+
+
+def add_like(session: Session, post_id: int, user_id: int) -> bool:
+    result = session.exec(
+        insert(PostLike.__table__)
+        .values(post_id=post_id, user_id=user_id, created_at=datetime.now(timezone.utc))
+        .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+    )
+    if result.rowcount != 1:
+        return False
+    _adjust_like_count(session, post_id, 1)
+    return True
+
+
+def remove_like(session: Session, post_id: int, user_id: int) -> bool:
+    result = session.exec(
+        delete(PostLike)
+        .where(PostLike.post_id == post_id)
+        .where(PostLike.user_id == user_id)
+    )
+    if result.rowcount != 1:
+        return False
+    _adjust_like_count(session, post_id, -1)
+    return True
+
+
+@router.get("/likes/status", response_model=LikeBatchStatusOut)
+def get_like_status_batch(
+    ids: str = Query(..., description="Comma-separated post ids"),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> LikeBatchStatusOut:
+    post_ids = parse_id_list(ids, LIKE_STATUS_BATCH_MAX)
+    if not post_ids:
+        return LikeBatchStatusOut(items=[])
+
+    rows = session.exec(
+        select(Post.id, Post.board_id, Post.like_count)
+        .where(Post.id.in_(post_ids))
+        .where(Post.is_deleted == False)
+    ).all()
+    readable = readable_board_ids(session, {int(board_id) for _, board_id, _ in rows}, current_user)
+    visible = {int(post_id): int(like_count) for post_id, board_id, like_count in rows if board_id in readable}
+    liked = liked_set_cache.liked_among(session, current_user.id, list(visible))
+
+    return LikeBatchStatusOut(
+        items=[
+            LikeStatusItem(post_id=post_id, liked=post_id in liked, like_count=visible[post_id])
+            for post_id in post_ids
+            if post_id in visible
+        ]
     )
 
 
 @router.get("/{post_id}/like", response_model=LikeStatusOut)
 def get_like_status(
     post_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> LikeStatusOut:
+    post = _load_post_for_like(session, post_id, current_user)
+
+    liked = liked_set_cache.is_liked(session, current_user.id, post_id)
+    return LikeStatusOut(liked=liked, like_count=post.like_count)
+
+
+def _like(post_id: int, user_id: int) -> Callable[[Session], int]:
+    def mutation(session: Session) -> int:
+        add_like(session, post_id, user_id)
+        return _current_like_count(session, post_id)
+
+    return mutation
+
+
+def _unlike(post_id: int, user_id: int) -> Callable[[Session], int]:
+    def mutation(session: Session) -> int:
+        remove_like(session, post_id, user_id)
+        return _current_like_count(session, post_id)
+
+    return mutation
+
+
+def _toggle(post_id: int, user_id: int) -> Callable[[Session], tuple[bool, int]]:
+    def mutation(session: Session) -> tuple[bool, int]:
+        liked = add_like(session, post_id, user_id)
+        if not liked:
+            remove_like(session, post_id, user_id)
+        return liked, _current_like_count(session, post_id)
+
+    return mutation
+
+
+@router.put("/{post_id}/like", response_model=LikeStatusOut)
+def like_post(
+    post_id: int,
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user),
 ) -> LikeStatusOut:
     _load_post_for_like(session, post_id, current_user)
 
-    liked = session.exec(
-        select(PostLike)
-        .where(PostLike.post_id == post_id)
-        .where(PostLike.user_id == current_user.id)
-    ).first()
+    like_count = group_commit.run(_like(post_id, current_user.id))
+    liked_set_cache.add(current_user.id, post_id)
+
+    return LikeStatusOut(liked=True, like_count=like_count)
 
-    return LikeStatusOut(liked=liked is not None, like_count=_count_likes(session, post_id))
+
+@router.delete("/{post_id}/like", response_model=LikeStatusOut)
+def unlike_post(
+    post_id: int,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> LikeStatusOut:
+    _load_post_for_like(session, post_id, current_user)
+
+    like_count = group_commit.run(_unlike(post_id, current_user.id))
+    liked_set_cache.remove(current_user.id, post_id)
+
+    return LikeStatusOut(liked=False, like_count=like_count)
 
 
 @router.post("/{post_id}/like", response_model=LikeStatusOut)
 def toggle_like(
     post_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     current_user: CurrentUser = Depends(get_current_user),
 ) -> LikeStatusOut:
     _load_post_for_like(session, post_id, current_user)
 
-    existing = session.exec(
-        select(PostLike)
-        .where(PostLike.post_id == post_id)
-        .where(PostLike.user_id == current_user.id)
-    ).first()
-
-    liked: bool
-    if existing:
-        session.delete(existing)
-        liked = False
+    liked, like_count = group_commit.run(_toggle(post_id, current_user.id))
+    if liked:
+        liked_set_cache.add(current_user.id, post_id)
     else:
-        session.add(PostLike(post_id=post_id, user_id=current_user.id))
-        liked = True
-
-    session.commit()
+        liked_set_cache.remove(current_user.id, post_id)
 
-    return LikeStatusOut(liked=liked, like_count=_count_likes(session, post_id))
+    return LikeStatusOut(liked=liked, like_count=like_count)
@@ -1,27 +1,50 @@
 from __future__ import annotations
 
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from threading import Lock
 from time import monotonic
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import or_
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import Select, or_, update
 from sqlmodel import Session, func, select
-
-from app.core.deps import CurrentUser, ensure_board_permission, get_current_user, has_admin_privilege
-from app.db.session import get_session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.api.routes.comments import COMMENT_PAGE_MAX_LIMIT, fetch_comment_page
+from app.core.deps import (
+    CurrentUser,
+    ensure_board_permission,
+    get_current_user,
+    get_current_user_async,
+    has_admin_privilege,
+)
+from app.db.session import get_async_read_session, get_async_search_session, get_read_session, get_session
 from app.models.attachment import Attachment
-from app.models.comment import Comment
+from app.models.attachment_text import AttachmentText, attachment_text_fts
 from app.models.enums import BoardType, QnaStatus
-from app.models.like import PostLike
 from app.models.post import Post
 from app.models.user import User
-from app.schemas.post import AttachmentMeta, PostCreate, PostListItem, PostListResponse, PostOut, PostUpdate
+from app.schemas.post import (
+    AttachmentMeta,
+    PostCreate,
+    PostDetailOut,
+    PostListItem,
+    PostListResponse,
+    PostOut,
+    PostReaderStats,
+    PostUpdate,
+)
+from app.services import hll
+from app.services.group_commit import group_commit
+from app.services.like_cache import liked_set_cache
+from app.services.reader_sketch import ALL_TIME_BUCKET, day_bucket, reader_sketches
 
 router = APIRouter(prefix="/boards/{board_id}/posts", tags=["posts"])
 VIEW_DEDUPE_SECONDS = 1.0
 VIEW_GUARD_TTL_SECONDS = 300.0
 VIEW_GUARD_MAX_SIZE = 20000
+# The trigram index cannot answer terms shorter than one trigram.
+ATTACHMENT_FTS_MIN_CHARS = 3
 _view_guard_lock = Lock()
 _view_guard: dict[tuple[int, int], float] = {}
 
@@ -35,6 +58,22 @@ def _validate_qna_status(qna_status: str | None) -> str | None:
     return qna_status
 
 
+def _attachment_matches(board_id: int, search: str) -> Select:
+    board_attachments = (
+        select(Attachment.post_id).join(Post, Post.id == Attachment.post_id).where(Post.board_id == board_id)
+    )
+    if len(search) >= ATTACHMENT_FTS_MIN_CHARS:
+        phrase = '"' + search.replace('"', '""') + '"'
+        return board_attachments.where(
+            Attachment.content_hash.in_(
+                select(attachment_text_fts.c.content_hash).where(attachment_text_fts.c.content.op("MATCH")(phrase))
+            )
+        )
+    return board_attachments.join(AttachmentText, AttachmentText.content_hash == Attachment.content_hash).where(
+        AttachmentText.content.contains(search)
+    )
+
+
 def _author_names(session: Session, author_ids: list[int]) -> dict[int, str]:
     if not author_ids:
         return {}
@@ -42,41 +81,10 @@ def _author_names(session: Session, author_ids: list[int]) -> dict[int, str]:
     return {user.id: user.username for user in users}
 
 
-def _post_metrics(
-    session: Session, post_ids: list[int], current_user_id: int
-) -> tuple[dict[int, int], dict[int, int], set[int]]:
-    if not post_ids:
-        return {}, {}, set()
-
-    like_rows = session.exec(
-        select(PostLike.post_id, func.count(PostLike.id))
-        .where(PostLike.post_id.in_(post_ids))
-        .group_by(PostLike.post_id)
-    ).all()
-    like_count_map = {int(post_id): int(count) for post_id, count in like_rows}
-
-    comment_rows = session.exec(
-        select(Comment.post_id, func.count(Comment.id))
-        .where(Comment.post_id.in_(post_ids))
-        .where(Comment.is_deleted == False)
-        .group_by(Comment.post_id)
-    ).all()
-    comment_count_map = {int(post_id): int(count) for post_id, count in comment_rows}
-
-    liked_rows = session.exec(
-        select(PostLike.post_id)
-        .where(PostLike.post_id.in_(post_ids))
-        .where(PostLike.user_id == current_user_id)
-    ).all()
-    liked_post_ids = {int(post_id) for post_id in liked_rows}
-
-    return like_count_map, comment_count_map, liked_post_ids
-
-
 def _post_to_out(session: Session, post: Post, current_user_id: int) -> PostOut:
     author = session.get(User, post.author_id)
     attachments = session.exec(select(Attachment).where(Attachment.post_id == post.id)).all()
-    like_count_map, comment_count_map, liked_post_ids = _post_metrics(session, [post.id], current_user_id)
+    liked_post_ids = liked_set_cache.liked_among(session, current_user_id, [post.id])
 
     return PostOut(
         id=post.id,
@@ -88,8 +96,8 @@ def _post_to_out(session: Session, post: Post, current_user_id: int) -> PostOut:
         is_pinned=post.is_pinned,
         is_deleted=post.is_deleted,
         view_count=post.view_count,
-        like_count=like_count_map.get(post.id, 0),
-        comment_count=comment_count_map.get(post.id, 0),
+        like_count=post.like_count,
+        comment_count=post.comment_count,
         liked_by_me=post.id in liked_post_ids,
         qna_status=post.qna_status,
         created_at=post.created_at,
@@ -137,7 +145,7 @@ def _should_increase_view(user_id: int, post_id: int) -> bool:
 
 
 @router.get("", response_model=PostListResponse)
-def list_posts(
+async def list_posts(
     board_id: int,
     page: int = Query(default=1, ge=1),
     page_size: int = Query(default=10, ge=1, le=100),
@@ -147,14 +155,20 @@ def list_posts(
     qna_status: str | None = None,
     is_pinned: bool | None = None,
     include_deleted: bool = False,
-    session: Session = Depends(get_session),
-    current_user: CurrentUser = Depends(get_current_user),
+    session: AsyncSession = Depends(get_async_search_session),
+    current_user: CurrentUser = Depends(get_current_user_async),
 ) -> PostListResponse:
-    board = ensure_board_permission(session, board_id, current_user, action="read")
+    board = await session.run_sync(ensure_board_permission, board_id, current_user, "read")
 
     conditions = [Post.board_id == board.id]
     if search:
-        conditions.append(or_(Post.title.contains(search), Post.content.contains(search)))
+        conditions.append(
+            or_(
+                Post.title.contains(search),
+                Post.content.contains(search),
+                Post.id.in_(_attachment_matches(board.id, search)),
+            )
+        )
     if qna_status and board.board_type == BoardType.QNA.value:
         conditions.append(Post.qna_status == qna_status)
     if is_pinned is not None:
@@ -180,12 +194,12 @@ def list_posts(
         .offset((page - 1) * page_size)
         .limit(page_size)
     )
-    items = session.exec(statement).all()
+    items = (await session.exec(statement)).all()
 
-    total = session.exec(select(func.count()).select_from(Post).where(*conditions)).one()
-    author_map = _author_names(session, [item.author_id for item in items])
+    total = (await session.exec(select(func.count()).select_from(Post).where(*conditions))).one()
+    author_map = await session.run_sync(_author_names, [item.author_id for item in items])
     post_ids = [item.id for item in items]
-    like_count_map, comment_count_map, liked_post_ids = _post_metrics(session, post_ids, current_user.id)
+    liked_post_ids = await session.run_sync(liked_set_cache.liked_among, current_user.id, post_ids)
 
     return PostListResponse(
         items=[
@@ -198,8 +212,8 @@ def list_posts(
                 is_pinned=item.is_pinned,
                 is_deleted=item.is_deleted,
                 view_count=item.view_count,
-                like_count=like_count_map.get(item.id, 0),
-                comment_count=comment_count_map.get(item.id, 0),
+                like_count=item.like_count,
+                comment_count=item.comment_count,
                 liked_by_me=item.id in liked_post_ids,
                 qna_status=item.qna_status,
                 created_at=item.created_at,
@@ -244,13 +258,7 @@ def create_post(
     return _post_to_out(session, post, current_user.id)
 
 
-@router.get("/{post_id}", response_model=PostOut)
-def get_post(
-    board_id: int,
-    post_id: int,
-    session: Session = Depends(get_session),
-    current_user: CurrentUser = Depends(get_current_user),
-) -> PostOut:
+def _load_readable_post(session: Session, board_id: int, post_id: int, current_user: CurrentUser) -> Post:
     ensure_board_permission(session, board_id, current_user, action="read")
     post = session.get(Post, post_id)
     if not post or post.board_id != board_id:
@@ -258,14 +266,81 @@ def get_post(
 
     if post.is_deleted and current_user.role_code != "ADMIN":
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+    return post
 
-    if _should_increase_view(current_user.id, post.id):
-        post.view_count += 1
-        session.add(post)
-        session.commit()
-        session.refresh(post)
 
-    return _post_to_out(session, post, current_user.id)
+def _record_view(post_id: int, current_user: CurrentUser) -> int | None:
+    # Read paths load the post on a query-only connection; the counter goes through the writer.
+    reader_sketches.observe(post_id, current_user.id)
+    if not _should_increase_view(current_user.id, post_id):
+        return None
+
+    def increment(session: Session) -> int:
+        session.exec(update(Post).where(Post.id == post_id).values(view_count=Post.view_count + 1))
+        return session.exec(select(Post.view_count).where(Post.id == post_id)).one()
+
+    return group_commit.run(increment)
+
+
+@router.get("/{post_id}", response_model=PostOut)
+async def get_post(
+    board_id: int,
+    post_id: int,
+    session: AsyncSession = Depends(get_async_read_session),
+    current_user: CurrentUser = Depends(get_current_user_async),
+) -> PostOut:
+    post = await session.run_sync(_load_readable_post, board_id, post_id, current_user)
+    view_count = await run_in_threadpool(_record_view, post.id, current_user)
+    out = await session.run_sync(_post_to_out, post, current_user.id)
+    if view_count is not None:
+        out.view_count = view_count
+    return out
+
+
+@router.get("/{post_id}/detail", response_model=PostDetailOut)
+def get_post_detail(
+    board_id: int,
+    post_id: int,
+    comment_limit: int = Query(default=20, ge=1, le=COMMENT_PAGE_MAX_LIMIT),
+    latest_comments: bool = False,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> PostDetailOut:
+    # One permission check and one post load shared by the post, its like status and the first comment page.
+    post = _load_readable_post(session, board_id, post_id, current_user)
+    view_count = _record_view(post.id, current_user)
+
+    comments = fetch_comment_page(
+        session,
+        post,
+        current_user,
+        limit=comment_limit,
+        latest=comment_limit if latest_comments else None,
+    )
+    post_out = _post_to_out(session, post, current_user.id)
+    if view_count is not None:
+        post_out.view_count = view_count
+    return PostDetailOut(post=post_out, comments=comments)
+
+
+@router.get("/{post_id}/readers", response_model=PostReaderStats)
+def get_post_readers(
+    board_id: int,
+    post_id: int,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> PostReaderStats:
+    post = _load_readable_post(session, board_id, post_id, current_user)
+
+    today = datetime.now(timezone.utc).date()
+    week = [day_bucket(today - timedelta(days=offset)) for offset in range(7)]
+    return PostReaderStats(
+        post_id=post.id,
+        unique_readers=hll.estimate(reader_sketches.merged(session, post.id, [ALL_TIME_BUCKET])),
+        unique_readers_today=hll.estimate(reader_sketches.merged(session, post.id, week[:1])),
+        unique_readers_7d=hll.estimate(reader_sketches.merged(session, post.id, week)),
+        standard_error=hll.HLL_STANDARD_ERROR,
+    )
 
 
 def _can_edit_post(post: Post, current_user: CurrentUser) -> bool:
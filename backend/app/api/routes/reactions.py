@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import delete, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from app.core.deps import (
+    CurrentUser,
+    ensure_board_permission,
+    get_current_user,
+    parse_id_list,
+    readable_board_ids,
+)
+from app.db.session import get_read_session, get_session
+from app.models.enums import ReactionType
+from app.models.post import Post
+from app.models.reaction import PostReaction
+from app.models.reaction_count import REACTION_COUNT_COLUMNS, PostReactionCount
+from app.schemas.reaction import ReactionBatchOut, ReactionSet, ReactionSummary
+
+router = APIRouter(prefix="/posts", tags=["reactions"])
+REACTION_BATCH_MAX = 100
+
+
+def _load_post_for_reaction(session: Session, post_id: int, current_user: CurrentUser) -> Post:
+    post = session.get(Post, post_id)
+    if not post or post.is_deleted:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Post not found")
+
+    ensure_board_permission(session, post.board_id, current_user, action="read")
+    return post
+
+
+def _validate_reaction_type(reaction_type: str) -> str:
+    allowed = {item.value for item in ReactionType}
+    if reaction_type not in allowed:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid reaction_type")
+    return reaction_type
+
+
+def _summary(post_id: int, row: PostReactionCount | None, my_reaction: str | None) -> ReactionSummary:
+    counts = {
+        reaction_type: int(getattr(row, column)) if row else 0
+        for reaction_type, column in REACTION_COUNT_COLUMNS.items()
+    }
+    return ReactionSummary(post_id=post_id, counts=counts, total=sum(counts.values()), my_reaction=my_reaction)
+
+
+def _apply_count_delta(session: Session, post_id: int, deltas: dict[str, int]) -> None:
+    values = {
+        REACTION_COUNT_COLUMNS[reaction_type]: getattr(PostReactionCount, REACTION_COUNT_COLUMNS[reaction_type]) + delta
+        for reaction_type, delta in deltas.items()
+        if delta
+    }
+    if not values:
+        return
+
+    session.exec(
+        insert(PostReactionCount.__table__).values(post_id=post_id).on_conflict_do_nothing(index_elements=["post_id"])
+    )
+    session.exec(update(PostReactionCount).where(PostReactionCount.post_id == post_id).values(**values))
+
+
+def _remove_reaction(session: Session, post_id: int, user_id: int) -> str | None:
+    removed = session.exec(
+        delete(PostReaction)
+        .where(PostReaction.post_id == post_id)
+        .where(PostReaction.user_id == user_id)
+        .returning(PostReaction.reaction_type)
+    ).first()
+    return removed[0] if removed else None
+
+
+def set_reaction(session: Session, post_id: int, user_id: int, reaction_type: str) -> None:
+    # The DELETE takes SQLite's write lock first, so the swap and both counter deltas land atomically.
+    previous = _remove_reaction(session, post_id, user_id)
+    session.exec(
+        insert(PostReaction.__table__)
+        .values(
+            post_id=post_id,
+            user_id=user_id,
+            reaction_type=reaction_type,
+            created_at=datetime.now(timezone.utc),
+        )
+        .on_conflict_do_nothing(index_elements=["post_id", "user_id"])
+    )
+    deltas = {reaction_type: 1}
+    if previous:
+        deltas[previous] = deltas.get(previous, 0) - 1
+    _apply_count_delta(session, post_id, deltas)
+
+
+def clear_reaction(session: Session, post_id: int, user_id: int) -> None:
+    previous = _remove_reaction(session, post_id, user_id)
+    if previous:
+        _apply_count_delta(session, post_id, {previous: -1})
+
+
+def _post_summary(session: Session, post_id: int, user_id: int) -> ReactionSummary:
+    row = session.get(PostReactionCount, post_id)
+    my_reaction = session.exec(
+        select(PostReaction.reaction_type)
+        .where(PostReaction.post_id == post_id)
+        .where(PostReaction.user_id == user_id)
+    ).first()
+    return _summary(post_id, row, my_reaction)
+
+
+@router.get("/reactions", response_model=ReactionBatchOut)
+def get_reactions_batch(
+    ids: str = Query(..., description="Comma-separated post ids"),
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> ReactionBatchOut:
+    post_ids = parse_id_list(ids, REACTION_BATCH_MAX)
+    if not post_ids:
+        return ReactionBatchOut(items=[])
+
+    rows = session.exec(
+        select(Post.id, Post.board_id)
+        .where(Post.id.in_(post_ids))
+        .where(Post.is_deleted == False)
+    ).all()
+    readable = readable_board_ids(session, {int(board_id) for _, board_id in rows}, current_user)
+    visible_ids = [int(post_id) for post_id, board_id in rows if board_id in readable]
+    if not visible_ids:
+        return ReactionBatchOut(items=[])
+
+    count_rows = session.exec(select(PostReactionCount).where(PostReactionCount.post_id.in_(visible_ids))).all()
+    count_map = {row.post_id: row for row in count_rows}
+    mine = session.exec(
+        select(PostReaction.post_id, PostReaction.reaction_type)
+        .where(PostReaction.user_id == current_user.id)
+        .where(PostReaction.post_id.in_(visible_ids))
+    ).all()
+    my_map = {int(post_id): reaction_type for post_id, reaction_type in mine}
+
+    visible = set(visible_ids)
+    return ReactionBatchOut(
+        items=[
+            _summary(post_id, count_map.get(post_id), my_map.get(post_id))
+            for post_id in post_ids
+            if post_id in visible
+        ]
+    )
+
+
+@router.get("/{post_id}/reaction", response_model=ReactionSummary)
+def get_reaction(
+    post_id: int,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> ReactionSummary:
+    _load_post_for_reaction(session, post_id, current_user)
+    return _post_summary(session, post_id, current_user.id)
+
+
+@router.put("/{post_id}/reaction", response_model=ReactionSummary)
+def put_reaction(
+    post_id: int,
+    payload: ReactionSet,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> ReactionSummary:
+    _load_post_for_reaction(session, post_id, current_user)
+    reaction_type = _validate_reaction_type(payload.reaction_type)
+
+    set_reaction(session, post_id, current_user.id, reaction_type)
+    summary = _post_summary(session, post_id, current_user.id)
+    session.commit()
+
+    return summary
+
+
+@router.delete("/{post_id}/reaction", response_model=ReactionSummary)
+def delete_reaction(
+    post_id: int,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> ReactionSummary:
+    _load_post_for_reaction(session, post_id, current_user)
+
+    clear_reaction(session, post_id, current_user.id)
+    summary = _post_summary(session, post_id, current_user.id)
+    session.commit()
+
+    return summary
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import delete, update
+from sqlmodel import Session
+
+from app.api.routes.attachments import (
+    attachment_to_out,
+    ensure_allowed_extension,
+    load_writable_post,
+    quota_exceeded,
+    save_attachment,
+    schedule_post_processing,
+)
+from app.core.deps import CurrentUser, get_current_user
+from app.db.session import get_read_session, get_session
+from app.models.attachment import Attachment
+from app.models.upload_session import UploadSession
+from app.schemas.attachment import AttachmentOut, UploadSessionCreate, UploadSessionOut
+from app.services.blob_store import adopt_file, hash_stream
+from app.services.group_commit import group_commit
+from app.services.upload_quota import QuotaExceededError, ensure_quota_available
+from app.services.upload_sessions import append_chunk, purge_expired_sessions_if_due, session_file
+
+router = APIRouter(tags=["attachments"])
+
+UPLOAD_CHUNK_SIZE = 5 * 1024 * 1024
+RESUMABLE_MAX_FILE_SIZE = 200 * 1024 * 1024
+UPLOAD_SESSION_TTL = timedelta(hours=24)
+
+
+def _total_chunks(upload: UploadSession) -> int:
+    return -(-upload.total_size // upload.chunk_size)
+
+
+def _session_to_out(upload: UploadSession) -> UploadSessionOut:
+    return UploadSessionOut(
+        id=upload.id,
+        post_id=upload.post_id,
+        original_name=upload.original_name,
+        total_size=upload.total_size,
+        chunk_size=upload.chunk_size,
+        received_bytes=upload.received_bytes,
+        next_chunk=upload.next_chunk,
+        total_chunks=_total_chunks(upload),
+        expires_at=upload.expires_at,
+    )
+
+
+def _load_upload(session: Session, upload_id: str, current_user: CurrentUser) -> UploadSession:
+    upload = session.get(UploadSession, upload_id)
+    if not upload or upload.uploader_id != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found")
+
+    expires_at = upload.expires_at if upload.expires_at.tzinfo else upload.expires_at.replace(tzinfo=timezone.utc)
+    if expires_at < datetime.now(timezone.utc):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload expired")
+    return upload
+
+
+@router.post("/posts/{post_id}/uploads", response_model=UploadSessionOut, status_code=status.HTTP_201_CREATED)
+def create_upload(
+    post_id: int,
+    payload: UploadSessionCreate,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> UploadSessionOut:
+    post = load_writable_post(session, post_id, current_user)
+    ensure_allowed_extension(payload.filename)
+    if payload.size > RESUMABLE_MAX_FILE_SIZE:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="File too large (max 200MB)")
+    try:
+        ensure_quota_available(session, current_user.id, post.board_id, payload.size)
+    except QuotaExceededError as exc:
+        raise quota_exceeded(exc) from exc
+
+    upload = UploadSession(
+        id=uuid4().hex,
+        post_id=post.id,
+        uploader_id=current_user.id,
+        original_name=payload.filename,
+        mime_type=payload.mime_type or "application/octet-stream",
+        total_size=payload.size,
+        chunk_size=UPLOAD_CHUNK_SIZE,
+        expected_hash=payload.sha256.lower() if payload.sha256 else None,
+        expires_at=datetime.now(timezone.utc) + UPLOAD_SESSION_TTL,
+    )
+    session.add(upload)
+    session.commit()
+    session.refresh(upload)
+    background_tasks.add_task(purge_expired_sessions_if_due)
+    return _session_to_out(upload)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionOut)
+def get_upload(
+    upload_id: str,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> UploadSessionOut:
+    return _session_to_out(_load_upload(session, upload_id, current_user))
+
+
+def _store_chunk(
+    session: Session, upload_id: str, index: int, data: bytes, current_user: CurrentUser
+) -> UploadSessionOut:
+    upload = _load_upload(session, upload_id, current_user)
+    if index < 0 or index >= _total_chunks(upload):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Chunk index out of range")
+    if index < upload.next_chunk:
+        # Retried chunk whose response was lost; it is already on disk.
+        return _session_to_out(upload)
+    if index > upload.next_chunk:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=f"Expected chunk {upload.next_chunk}")
+
+    offset = index * upload.chunk_size
+    if len(data) != min(upload.chunk_size, upload.total_size - offset):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unexpected chunk length")
+
+    # The conditional update claims the chunk and takes SQLite's write lock, so two concurrent
+    # PUTs of the same chunk cannot both append.
+    claimed = session.exec(
+        update(UploadSession)
+        .where(UploadSession.id == upload.id)
+        .where(UploadSession.next_chunk == index)
+        .values(
+            next_chunk=index + 1,
+            received_bytes=offset + len(data),
+            expires_at=datetime.now(timezone.utc) + UPLOAD_SESSION_TTL,
+        )
+    )
+    if claimed.rowcount != 1:
+        session.rollback()
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Chunk already being written")
+
+    try:
+        append_chunk(session_file(upload.id), offset, data)
+    except OSError:
+        session.rollback()
+        raise
+    session.commit()
+    session.refresh(upload)
+    return _session_to_out(upload)
+
+
+async def _read_chunk_body(request: Request) -> bytes:
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > UPLOAD_CHUNK_SIZE:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Chunk too large")
+
+    body = bytearray()
+    async for part in request.stream():
+        body.extend(part)
+        if len(body) > UPLOAD_CHUNK_SIZE:
+            raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail="Chunk too large")
+    return bytes(body)
+
+
+@router.put("/uploads/{upload_id}/chunks/{index}", response_model=UploadSessionOut)
+async def upload_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> UploadSessionOut:
+    data = await _read_chunk_body(request)
+    return await run_in_threadpool(_store_chunk, session, upload_id, index, data, current_user)
+
+
+def _delete_upload(upload_id: str) -> int:
+    return group_commit.run(
+        lambda write_session: write_session.exec(delete(UploadSession).where(UploadSession.id == upload_id)).rowcount
+    )
+
+
+@router.post("/uploads/{upload_id}/complete", response_model=AttachmentOut, status_code=status.HTTP_201_CREATED)
+def complete_upload(
+    upload_id: str,
+    background_tasks: BackgroundTasks,
+    session: Session = Depends(get_read_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> AttachmentOut:
+    # Checks and the hash of up to 200MB run on a read session; the writer is only taken for the claim
+    # and, once the file is in storage, for the attachment insert.
+    upload = _load_upload(session, upload_id, current_user)
+    if upload.next_chunk < _total_chunks(upload):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail=f"Upload incomplete (next chunk {upload.next_chunk})"
+        )
+
+    post = load_writable_post(session, upload.post_id, current_user)
+    path = session_file(upload.id)
+    try:
+        with path.open("rb") as handle:
+            size_bytes, content_hash = hash_stream(handle)
+    except FileNotFoundError as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload already completed") from exc
+
+    if size_bytes != upload.total_size or (upload.expected_hash and content_hash != upload.expected_hash):
+        _delete_upload(upload.id)
+        path.unlink(missing_ok=True)
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Checksum mismatch, upload discarded")
+    try:
+        # Checked while the upload can still be retried; the charge after the move only fails on a race.
+        ensure_quota_available(session, current_user.id, post.board_id, size_bytes)
+    except QuotaExceededError as exc:
+        raise quota_exceeded(exc) from exc
+
+    # Deleting the session row claims the completion; a concurrent finalize gets 409. The claim commits
+    # before the file moves into storage, so no write transaction spans that copy.
+    if _delete_upload(upload.id) != 1:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload already completed")
+
+    try:
+        blob = adopt_file(path, content_hash, size_bytes)
+    except Exception:
+        # The assembled file is still in place; give the session back so the client can complete again.
+        restored = UploadSession(**upload.model_dump())
+        group_commit.run(lambda write_session: write_session.add(restored))
+        raise
+
+    attachment = Attachment(
+        post_id=post.id,
+        uploader_id=current_user.id,
+        original_name=upload.original_name,
+        stored_name=blob.content_hash,
+        mime_type=upload.mime_type,
+        size_bytes=blob.size_bytes,
+        content_hash=blob.content_hash,
+        path=str(blob.path),
+    )
+    attachment = save_attachment(session, attachment, post.board_id, blob)
+    schedule_post_processing(background_tasks, attachment)
+    return attachment_to_out(attachment)
+
+
+@router.delete("/uploads/{upload_id}")
+def abort_upload(
+    upload_id: str,
+    session: Session = Depends(get_session),
+    current_user: CurrentUser = Depends(get_current_user),
+) -> dict[str, str]:
+    upload = _load_upload(session, upload_id, current_user)
+    session.delete(upload)
+    session.commit()
+    session_file(upload_id).unlink(missing_ok=True)
+    return {"message": "Upload aborted"}
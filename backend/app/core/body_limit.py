@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+
+from fastapi import HTTPException, status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+@dataclass(frozen=True)
+class BodyLimit:
+    method: str
+    path: re.Pattern[str]
+    max_bytes: int
+    detail: str
+
+
+class BodySizeLimitMiddleware:
+    # Starlette spools the whole multipart body before a route runs, so a per-file check in the handler
+    # only fires after an oversized upload has already been written to a temporary file. This rejects it
+    # from Content-Length up front, or stops reading once a chunked/undeclared body passes the limit.
+    def __init__(self, app: ASGIApp, limits: list[BodyLimit]) -> None:
+        self.app = app
+        self.limits = limits
+
+    def _limit_for(self, scope: Scope) -> BodyLimit | None:
+        for limit in self.limits:
+            if scope["method"] == limit.method and limit.path.fullmatch(scope["path"]):
+                return limit
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        limit = self._limit_for(scope) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope["headers"]:
+            if name == b"content-length" and value.isdigit() and int(value) > limit.max_bytes:
+                response = JSONResponse(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    content={"detail": limit.detail},
+                    headers={"Connection": "close"},
+                )
+                await response(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit.max_bytes:
+                    # Raised inside the route's body parsing, so the app's exception handling answers 413.
+                    raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=limit.detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -13,6 +13,20 @@ class Settings(BaseSettings):
     app_name: str = "Corporate Board API"
     api_prefix: str = "/api"
     database_url: str = Field(default="sqlite:///./app.db", alias="DATABASE_URL")
+    sqlite_profile: str = Field(default="wal", alias="SQLITE_PROFILE")
+    sqlite_synchronous: str = Field(default="NORMAL", alias="SQLITE_SYNCHRONOUS")
+    sqlite_cache_size_kb: int = Field(default=65536, alias="SQLITE_CACHE_SIZE_KB")
+    sqlite_mmap_size_mb: int = Field(default=256, alias="SQLITE_MMAP_SIZE_MB")
+    sqlite_busy_timeout_ms: int = Field(default=5000, alias="SQLITE_BUSY_TIMEOUT_MS")
+    sqlite_read_pool_size: int = Field(default=8, alias="SQLITE_READ_POOL_SIZE")
+    sqlite_writer_wait_seconds: float = Field(default=30.0, alias="SQLITE_WRITER_WAIT_SECONDS")
+    query_deadline_read_ms: int = Field(default=5000, alias="QUERY_DEADLINE_READ_MS")
+    query_deadline_search_ms: int = Field(default=3000, alias="QUERY_DEADLINE_SEARCH_MS")
+    query_deadline_admin_ms: int = Field(default=15000, alias="QUERY_DEADLINE_ADMIN_MS")
+    query_deadline_write_ms: int = Field(default=0, alias="QUERY_DEADLINE_WRITE_MS")
+    group_commit_enabled: bool = Field(default=False, alias="GROUP_COMMIT_ENABLED")
+    group_commit_window_ms: float = Field(default=0.0, alias="GROUP_COMMIT_WINDOW_MS")
+    group_commit_max_batch: int = Field(default=64, alias="GROUP_COMMIT_MAX_BATCH")
 
     jwt_secret: str = Field(default="change-me-in-production", alias="JWT_SECRET")
     jwt_algorithm: str = "HS256"
@@ -20,6 +34,23 @@ class Settings(BaseSettings):
     refresh_token_days: int = Field(default=7, alias="REFRESH_TOKEN_DAYS")
 
     upload_dir: str = Field(default="./uploads", alias="UPLOAD_DIR")
+    storage_backend: str = Field(default="local", alias="STORAGE_BACKEND")
+    s3_bucket: str = Field(default="", alias="S3_BUCKET")
+    s3_prefix: str = Field(default="", alias="S3_PREFIX")
+    s3_endpoint_url: str = Field(default="", alias="S3_ENDPOINT_URL")
+    s3_region: str = Field(default="", alias="S3_REGION")
+    s3_access_key_id: str = Field(default="", alias="S3_ACCESS_KEY_ID")
+    s3_secret_access_key: str = Field(default="", alias="S3_SECRET_ACCESS_KEY")
+    s3_presign_seconds: int = Field(default=300, alias="S3_PRESIGN_SECONDS")
+    s3_multipart_threshold_mb: int = Field(default=8, alias="S3_MULTIPART_THRESHOLD_MB")
+    download_mode: str = Field(default="direct", alias="DOWNLOAD_MODE")
+    download_accel_prefix: str = Field(default="/protected-uploads", alias="DOWNLOAD_ACCEL_PREFIX")
+    user_upload_quota_mb: int = Field(default=2048, alias="USER_UPLOAD_QUOTA_MB")
+    board_upload_quota_mb: int = Field(default=20480, alias="BOARD_UPLOAD_QUOTA_MB")
+    attachment_retention_days: int = Field(default=30, alias="ATTACHMENT_RETENTION_DAYS")
+    upload_gc_interval_minutes: int = Field(default=0, alias="UPLOAD_GC_INTERVAL_MINUTES")
+    upload_gc_mode: str = Field(default="quarantine", alias="UPLOAD_GC_MODE")
+    upload_gc_batch_files: int = Field(default=5000, alias="UPLOAD_GC_BATCH_FILES")
     cors_origins: str = Field(default="http://localhost:3000", alias="CORS_ORIGINS")
 
     @property
@@ -6,9 +6,10 @@ from datetime import datetime, timezone
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.security import TokenError, decode_token
-from app.db.session import get_session
+from app.db.session import get_async_read_session, get_read_session
 from app.models.board import Board
 from app.models.menu import Menu
 from app.models.menu_permission import MenuPermission
@@ -54,10 +55,7 @@ def _load_current_user(session: Session, user_id: int) -> CurrentUser:
     )
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session),
-) -> CurrentUser:
+def _token_user_id(token: str) -> int:
     try:
         payload = decode_token(token, expected_type="access")
     except TokenError as exc:
@@ -66,14 +64,35 @@ def get_current_user(
     subject = payload.get("sub")
     if not subject:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    return int(subject)
 
-    current_user = _load_current_user(session, int(subject))
+
+def _ensure_unlocked(current_user: CurrentUser) -> CurrentUser:
     if current_user.is_locked:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User account is locked")
-
     return current_user
 
 
+def get_current_user(
+    token: str = Depends(oauth2_scheme),
+    session: Session = Depends(get_read_session),
+) -> CurrentUser:
+    return _ensure_unlocked(_load_current_user(session, _token_user_id(token)))
+
+
+async def get_current_user_async(
+    token: str = Depends(oauth2_scheme),
+    session: AsyncSession = Depends(get_async_read_session),
+) -> CurrentUser:
+    # For async handlers: a sync dependency would still be scheduled on the threadpool.
+    user_id = _token_user_id(token)
+    current_user = await session.run_sync(_load_current_user, user_id)
+    # Hand the connection back before the handler runs: list_posts reads through its own search session,
+    # and holding both for the whole request lets a burst of requests exhaust the pool and wait on itself.
+    await session.rollback()
+    return _ensure_unlocked(current_user)
+
+
 def require_roles(*allowed_roles: str):
     def _checker(current_user: CurrentUser = Depends(get_current_user)) -> CurrentUser:
         if current_user.role_code not in allowed_roles:
@@ -166,6 +185,31 @@ def can_access_board_by_menu(
     return can_access_board(board, role_code, action=action)
 
 
+def readable_board_ids(session: Session, board_ids: set[int], current_user: CurrentUser) -> set[int]:
+    if not board_ids:
+        return set()
+
+    boards = session.exec(select(Board).where(Board.id.in_(board_ids))).all()
+    if current_user.role_code == "ADMIN":
+        return {board.id for board in boards}
+    return {
+        board.id
+        for board in boards
+        if board.is_active and can_access_board_by_menu(session, board, current_user.role_code, action="read")
+    }
+
+
+def parse_id_list(raw_ids: str, max_items: int) -> list[int]:
+    try:
+        ids = list(dict.fromkeys(int(item) for item in raw_ids.split(",") if item.strip()))
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid id list") from exc
+
+    if len(ids) > max_items:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Too many ids (max {max_items})")
+    return ids
+
+
 def ensure_board_permission(
     session: Session,
     board_id: int,
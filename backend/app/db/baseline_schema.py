@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+# Schema as of migration 1, when versioned migrations were introduced. Frozen on purpose: later model
+# changes ship as their own migrations, so a fresh database and an upgraded one end up identical.
+# Indexes on columns that migrations 2-7 add to older databases are created by those migrations.
+BASELINE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS attachment_blobs (
+    content_hash VARCHAR(64) NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    path VARCHAR(500) NOT NULL,
+    ref_count INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (content_hash)
+);
+CREATE TABLE IF NOT EXISTS attachment_texts (
+    content_hash VARCHAR(64) NOT NULL,
+    status VARCHAR(20) NOT NULL,
+    content TEXT NOT NULL,
+    extracted_at DATETIME NOT NULL,
+    PRIMARY KEY (content_hash)
+);
+CREATE TABLE IF NOT EXISTS boards (
+    id INTEGER NOT NULL,
+    "key" VARCHAR(30) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    description VARCHAR(255),
+    board_type VARCHAR(20) NOT NULL,
+    is_active BOOLEAN NOT NULL,
+    sort_order INTEGER NOT NULL,
+    read_roles JSON NOT NULL,
+    write_roles JSON NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_boards_key ON boards ("key");
+CREATE TABLE IF NOT EXISTS roles (
+    id INTEGER NOT NULL,
+    code VARCHAR(20) NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    description VARCHAR(255),
+    system_permissions JSON NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_roles_code ON roles (code);
+CREATE TABLE IF NOT EXISTS upload_usage (
+    scope VARCHAR(10) NOT NULL,
+    scope_id INTEGER NOT NULL,
+    bytes_used INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (scope, scope_id)
+);
+CREATE TABLE IF NOT EXISTS menus (
+    id INTEGER NOT NULL,
+    name VARCHAR(100) NOT NULL,
+    path VARCHAR(200) NOT NULL,
+    icon VARCHAR(50),
+    parent_id INTEGER,
+    board_id INTEGER,
+    sort_order INTEGER NOT NULL,
+    is_active BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(parent_id) REFERENCES menus (id),
+    FOREIGN KEY(board_id) REFERENCES boards (id)
+);
+CREATE INDEX IF NOT EXISTS ix_menus_board_id ON menus (board_id);
+CREATE INDEX IF NOT EXISTS ix_menus_parent_id ON menus (parent_id);
+CREATE TABLE IF NOT EXISTS users (
+    id INTEGER NOT NULL,
+    username VARCHAR(50) NOT NULL,
+    email VARCHAR(255) NOT NULL,
+    password_hash VARCHAR(255) NOT NULL,
+    role_id INTEGER NOT NULL,
+    is_locked BOOLEAN NOT NULL,
+    is_active BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(role_id) REFERENCES roles (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_email ON users (email);
+CREATE INDEX IF NOT EXISTS ix_users_role_id ON users (role_id);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_users_username ON users (username);
+CREATE TABLE IF NOT EXISTS menu_permissions (
+    id INTEGER NOT NULL,
+    menu_id INTEGER NOT NULL,
+    role_code VARCHAR(20) NOT NULL,
+    can_read BOOLEAN NOT NULL,
+    can_write BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_menu_permission_menu_role UNIQUE (menu_id, role_code),
+    FOREIGN KEY(menu_id) REFERENCES menus (id)
+);
+CREATE INDEX IF NOT EXISTS ix_menu_permissions_menu_id ON menu_permissions (menu_id);
+CREATE INDEX IF NOT EXISTS ix_menu_permissions_role_code ON menu_permissions (role_code);
+CREATE TABLE IF NOT EXISTS posts (
+    id INTEGER NOT NULL,
+    board_id INTEGER NOT NULL,
+    title VARCHAR(255) NOT NULL,
+    content VARCHAR NOT NULL,
+    author_id INTEGER NOT NULL,
+    is_pinned BOOLEAN NOT NULL,
+    is_deleted BOOLEAN NOT NULL,
+    view_count INTEGER NOT NULL,
+    comment_count INTEGER NOT NULL,
+    like_count INTEGER NOT NULL,
+    qna_status VARCHAR(30),
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    deleted_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(board_id) REFERENCES boards (id),
+    FOREIGN KEY(author_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_posts_author_id ON posts (author_id);
+CREATE INDEX IF NOT EXISTS ix_posts_board_id ON posts (board_id);
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    token_hash VARCHAR(64) NOT NULL,
+    expires_at DATETIME NOT NULL,
+    revoked_at DATETIME,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE UNIQUE INDEX IF NOT EXISTS ix_refresh_tokens_token_hash ON refresh_tokens (token_hash);
+CREATE INDEX IF NOT EXISTS ix_refresh_tokens_user_id ON refresh_tokens (user_id);
+CREATE TABLE IF NOT EXISTS attachments (
+    id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    uploader_id INTEGER NOT NULL,
+    original_name VARCHAR(255) NOT NULL,
+    stored_name VARCHAR(255) NOT NULL,
+    mime_type VARCHAR(120) NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    content_hash VARCHAR(64),
+    path VARCHAR(500) NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(post_id) REFERENCES posts (id),
+    FOREIGN KEY(uploader_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_attachments_post_id ON attachments (post_id);
+CREATE INDEX IF NOT EXISTS ix_attachments_uploader_id ON attachments (uploader_id);
+CREATE TABLE IF NOT EXISTS comments (
+    id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    author_id INTEGER NOT NULL,
+    parent_id INTEGER,
+    depth INTEGER NOT NULL,
+    content VARCHAR NOT NULL,
+    is_deleted BOOLEAN NOT NULL,
+    created_at DATETIME NOT NULL,
+    updated_at DATETIME NOT NULL,
+    deleted_at DATETIME,
+    PRIMARY KEY (id),
+    FOREIGN KEY(post_id) REFERENCES posts (id),
+    FOREIGN KEY(author_id) REFERENCES users (id),
+    FOREIGN KEY(parent_id) REFERENCES comments (id)
+);
+CREATE INDEX IF NOT EXISTS ix_comments_author_id ON comments (author_id);
+CREATE INDEX IF NOT EXISTS ix_comments_post_id ON comments (post_id);
+CREATE TABLE IF NOT EXISTS post_likes (
+    id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_post_like_post_user UNIQUE (post_id, user_id),
+    FOREIGN KEY(post_id) REFERENCES posts (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_post_likes_post_id ON post_likes (post_id);
+CREATE INDEX IF NOT EXISTS ix_post_likes_user_id ON post_likes (user_id);
+CREATE TABLE IF NOT EXISTS post_reaction_counts (
+    post_id INTEGER NOT NULL,
+    like_count INTEGER NOT NULL,
+    celebrate_count INTEGER NOT NULL,
+    love_count INTEGER NOT NULL,
+    wow_count INTEGER NOT NULL,
+    laugh_count INTEGER NOT NULL,
+    sad_count INTEGER NOT NULL,
+    PRIMARY KEY (post_id),
+    FOREIGN KEY(post_id) REFERENCES posts (id)
+);
+CREATE TABLE IF NOT EXISTS post_reactions (
+    id INTEGER NOT NULL,
+    post_id INTEGER NOT NULL,
+    user_id INTEGER NOT NULL,
+    reaction_type VARCHAR(20) NOT NULL,
+    created_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    CONSTRAINT uq_post_reaction_post_user UNIQUE (post_id, user_id),
+    FOREIGN KEY(post_id) REFERENCES posts (id),
+    FOREIGN KEY(user_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_post_reactions_post_id ON post_reactions (post_id);
+CREATE INDEX IF NOT EXISTS ix_post_reactions_user_id ON post_reactions (user_id);
+CREATE TABLE IF NOT EXISTS post_reader_sketches (
+    post_id INTEGER NOT NULL,
+    bucket VARCHAR(10) NOT NULL,
+    registers BLOB NOT NULL,
+    updated_at DATETIME NOT NULL,
+    PRIMARY KEY (post_id, bucket),
+    FOREIGN KEY(post_id) REFERENCES posts (id)
+);
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    id VARCHAR(32) NOT NULL,
+    post_id INTEGER NOT NULL,
+    uploader_id INTEGER NOT NULL,
+    original_name VARCHAR(255) NOT NULL,
+    mime_type VARCHAR(120) NOT NULL,
+    total_size INTEGER NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    received_bytes INTEGER NOT NULL,
+    next_chunk INTEGER NOT NULL,
+    expected_hash VARCHAR(64),
+    created_at DATETIME NOT NULL,
+    expires_at DATETIME NOT NULL,
+    PRIMARY KEY (id),
+    FOREIGN KEY(post_id) REFERENCES posts (id),
+    FOREIGN KEY(uploader_id) REFERENCES users (id)
+);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_expires_at ON upload_sessions (expires_at);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_post_id ON upload_sessions (post_id);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_uploader_id ON upload_sessions (uploader_id);
+CREATE TABLE IF NOT EXISTS comment_closure (
+    ancestor_id INTEGER NOT NULL,
+    descendant_id INTEGER NOT NULL,
+    depth INTEGER NOT NULL,
+    PRIMARY KEY (ancestor_id, descendant_id),
+    FOREIGN KEY(ancestor_id) REFERENCES comments (id),
+    FOREIGN KEY(descendant_id) REFERENCES comments (id)
+);
+CREATE INDEX IF NOT EXISTS ix_comment_closure_descendant ON comment_closure (descendant_id, depth);
+"""
@@ -1,20 +1,150 @@
 from __future__ import annotations
 
 from sqlalchemy import text
-from sqlmodel import SQLModel
+from sqlalchemy.engine import Connection
 
+from app.db.baseline_schema import BASELINE_SCHEMA
+from app.db.migrations import Backfill, Migration, add_column, column_names, create_index, execute_script, run_migrations
 from app.db.session import engine
-from app.models import Attachment, Board, Comment, Menu, MenuPermission, Post, PostLike, RefreshToken, Role, User  # noqa: F401
+from app.models import Attachment, AttachmentBlob, AttachmentText, Board, Comment, CommentClosure, Menu, MenuPermission, Post, PostLike, PostReaction, PostReactionCount, PostReaderSketch, RefreshToken, Role, UploadSession, UploadUsage, User  # noqa: F401
 
 
-def _ensure_board_type_column() -> None:
-    with engine.begin() as conn:
-        columns = [str(row[1]) for row in conn.execute(text("PRAGMA table_info(boards)")).fetchall()]
-        if "board_type" not in columns:
-            conn.execute(text("ALTER TABLE boards ADD COLUMN board_type VARCHAR(20) NOT NULL DEFAULT 'GENERAL'"))
-        conn.execute(text("UPDATE boards SET board_type='QNA' WHERE lower(key)='qna'"))
+def _baseline_tables(conn: Connection) -> None:
+    # Creates any missing table as it looked at this version; tables for new models ship as their own migration.
+    execute_script(conn, BASELINE_SCHEMA)
+
+
+def _board_type_column(conn: Connection) -> None:
+    add_column(conn, "boards", "board_type", "VARCHAR(20) NOT NULL DEFAULT 'GENERAL'")
+    conn.execute(text("UPDATE boards SET board_type='QNA' WHERE lower(key)='qna'"))
+
+
+def _comment_count_column(conn: Connection) -> None:
+    add_column(conn, "posts", "comment_count", "INTEGER NOT NULL DEFAULT 0")
+    create_index(conn, "ix_comments_post_seek", "comments", "post_id, is_deleted, created_at, id")
+
+
+def _comment_thread_columns(conn: Connection) -> None:
+    add_column(conn, "comments", "parent_id", "INTEGER REFERENCES comments (id)")
+    add_column(conn, "comments", "depth", "INTEGER NOT NULL DEFAULT 0")
+    create_index(conn, "ix_comments_post_thread_seek", "comments", "post_id, parent_id, is_deleted, created_at, id")
+
+
+def _like_count_column(conn: Connection) -> None:
+    add_column(conn, "posts", "like_count", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _attachment_hash_column(conn: Connection) -> None:
+    add_column(conn, "attachments", "content_hash", "VARCHAR(64)")
+    create_index(conn, "ix_attachments_content_hash", "attachments", "content_hash")
+
+
+def _upload_usage_backfill(conn: Connection) -> None:
+    if conn.execute(text("SELECT 1 FROM upload_usage LIMIT 1")).first():
+        return
+    conn.execute(
+        text(
+            "INSERT INTO upload_usage (scope, scope_id, bytes_used, file_count, updated_at) "
+            "SELECT 'user', uploader_id, SUM(size_bytes), COUNT(*), CURRENT_TIMESTAMP "
+            "FROM attachments GROUP BY uploader_id"
+        )
+    )
+    conn.execute(
+        text(
+            "INSERT INTO upload_usage (scope, scope_id, bytes_used, file_count, updated_at) "
+            "SELECT 'board', posts.board_id, SUM(attachments.size_bytes), COUNT(*), CURRENT_TIMESTAMP "
+            "FROM attachments JOIN posts ON posts.id = attachments.post_id GROUP BY posts.board_id"
+        )
+    )
+
+
+ATTACHMENT_TEXT_FTS_DDL = (
+    # External content: the index stores only trigram postings and reads text back from attachment_texts.
+    "CREATE VIRTUAL TABLE IF NOT EXISTS attachment_text_fts USING fts5("
+    "content_hash UNINDEXED, content, content='attachment_texts', content_rowid='rowid', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS attachment_texts_fts_insert AFTER INSERT ON attachment_texts BEGIN "
+    "INSERT INTO attachment_text_fts (rowid, content_hash, content) "
+    "VALUES (new.rowid, new.content_hash, new.content); END",
+    "CREATE TRIGGER IF NOT EXISTS attachment_texts_fts_delete AFTER DELETE ON attachment_texts BEGIN "
+    "INSERT INTO attachment_text_fts (attachment_text_fts, rowid, content_hash, content) "
+    "VALUES ('delete', old.rowid, old.content_hash, old.content); END",
+    "CREATE TRIGGER IF NOT EXISTS attachment_texts_fts_update AFTER UPDATE ON attachment_texts BEGIN "
+    "INSERT INTO attachment_text_fts (attachment_text_fts, rowid, content_hash, content) "
+    "VALUES ('delete', old.rowid, old.content_hash, old.content); "
+    "INSERT INTO attachment_text_fts (rowid, content_hash, content) "
+    "VALUES (new.rowid, new.content_hash, new.content); END",
+)
+
+
+def _attachment_text_fts(conn: Connection) -> None:
+    for statement in ATTACHMENT_TEXT_FTS_DDL:
+        conn.execute(text(statement))
+    # Indexes text extracted before this migration.
+    conn.execute(text("INSERT INTO attachment_text_fts (attachment_text_fts) VALUES ('rebuild')"))
+
+
+def _deleted_comment_count_column(conn: Connection) -> None:
+    add_column(conn, "posts", "deleted_comment_count", "INTEGER NOT NULL DEFAULT 0")
+
+
+def _like_reactions_to_likes(conn: Connection) -> None:
+    # LIKE duplicated the like engine as a reaction type; fold those reactions into post_likes.
+    conn.execute(
+        text(
+            "INSERT OR IGNORE INTO post_likes (post_id, user_id, created_at) "
+            "SELECT post_id, user_id, created_at FROM post_reactions WHERE reaction_type = 'LIKE'"
+        )
+    )
+    conn.execute(
+        text(
+            "UPDATE posts SET like_count = (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id) "
+            "WHERE id IN (SELECT post_id FROM post_reactions WHERE reaction_type = 'LIKE')"
+        )
+    )
+    conn.execute(text("DELETE FROM post_reactions WHERE reaction_type = 'LIKE'"))
+    if "like_count" in column_names(conn, "post_reaction_counts"):
+        conn.execute(text("ALTER TABLE post_reaction_counts DROP COLUMN like_count"))
+
+
+COMMENT_COUNT_BACKFILL = Backfill(
+    "posts",
+    "UPDATE posts SET comment_count = "
+    "(SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id AND comments.is_deleted = 0) "
+    "WHERE rowid > :low AND rowid <= :high",
+)
+# Every comment is its own depth-0 ancestor; legacy flat comments only need that row.
+COMMENT_CLOSURE_BACKFILL = Backfill(
+    "comments",
+    "INSERT OR IGNORE INTO comment_closure (ancestor_id, descendant_id, depth) "
+    "SELECT id, id, 0 FROM comments WHERE rowid > :low AND rowid <= :high",
+)
+LIKE_COUNT_BACKFILL = Backfill(
+    "posts",
+    "UPDATE posts SET like_count = (SELECT COUNT(*) FROM post_likes WHERE post_likes.post_id = posts.id) "
+    "WHERE rowid > :low AND rowid <= :high",
+)
+DELETED_COMMENT_COUNT_BACKFILL = Backfill(
+    "posts",
+    "UPDATE posts SET deleted_comment_count = "
+    "(SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id AND comments.is_deleted = 1) "
+    "WHERE rowid > :low AND rowid <= :high",
+)
+
+
+# Append only: a released version number never changes meaning.
+MIGRATIONS = [
+    Migration(1, "baseline_tables", _baseline_tables),
+    Migration(2, "board_type_column", _board_type_column),
+    Migration(3, "comment_count_column", _comment_count_column, (COMMENT_COUNT_BACKFILL,)),
+    Migration(4, "comment_thread_columns", _comment_thread_columns, (COMMENT_CLOSURE_BACKFILL,)),
+    Migration(5, "like_count_column", _like_count_column, (LIKE_COUNT_BACKFILL,)),
+    Migration(6, "attachment_hash_column", _attachment_hash_column),
+    Migration(7, "upload_usage_backfill", _upload_usage_backfill),
+    Migration(8, "attachment_text_fts", _attachment_text_fts),
+    Migration(9, "deleted_comment_count_column", _deleted_comment_count_column, (DELETED_COMMENT_COUNT_BACKFILL,)),
+    Migration(10, "like_reactions_to_likes", _like_reactions_to_likes),
+]
 
 
 def create_db_and_tables() -> None:
-    SQLModel.metadata.create_all(engine)
-    _ensure_board_type_column()
+    run_migrations(engine, MIGRATIONS)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from dataclasses import dataclass
+from time import monotonic
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import OperationalError
+
+SCHEMA_TABLE = "schema_migrations"
+MIGRATION_LOCK_WAIT_SECONDS = 600
+BACKFILL_BATCH_ROWS = 5000
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Backfill:
+    # `statement` runs once per rowid window of `table`, bound as :low (exclusive) and :high (inclusive).
+    # It must be safe to re-run: a crash or a second worker can repeat windows before the version is recorded.
+    table: str
+    statement: str
+
+
+@dataclass(frozen=True)
+class Migration:
+    # `apply` runs inside the migration's locked transaction and must use the given connection without
+    # committing. Without backfills that transaction also records the schema_migrations row. With them,
+    # the schema change commits first, each backfill window commits on its own so startup never holds
+    # the write lock for a whole table, and the version is recorded only after the last window.
+    version: int
+    name: str
+    apply: Callable[[Connection], None]
+    backfills: tuple[Backfill, ...] = ()
+
+
+def column_names(conn: Connection, table: str) -> set[str]:
+    return {str(row[1]) for row in conn.execute(text(f"PRAGMA table_info({table})")).fetchall()}
+
+
+def add_column(conn: Connection, table: str, column: str, ddl: str) -> None:
+    # ADD COLUMN only rewrites the schema entry in SQLite, so it is constant time on any table size.
+    if column not in column_names(conn, table):
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+
+
+def create_index(conn: Connection, name: str, table: str, columns: str) -> None:
+    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})"))
+
+
+def execute_script(conn: Connection, script: str) -> None:
+    # executescript() would commit the open transaction first, so statements go through one at a time.
+    for statement in script.split(";"):
+        if statement.strip():
+            conn.exec_driver_sql(statement)
+
+
+def current_version(engine: Engine) -> int:
+    try:
+        with engine.connect() as conn:
+            return int(conn.execute(text(f"SELECT MAX(version) FROM {SCHEMA_TABLE}")).scalar() or 0)
+    except OperationalError:
+        return 0
+
+
+def applied_versions(engine: Engine) -> dict[int, str]:
+    try:
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"SELECT version, applied_at FROM {SCHEMA_TABLE} ORDER BY version")).fetchall()
+    except OperationalError:
+        return {}
+    return {int(row[0]): str(row[1]) for row in rows}
+
+
+def _begin_locked(conn: Connection) -> None:
+    # BEGIN IMMEDIATE takes SQLite's write lock up front. Another worker migrating the same file holds it
+    # for as long as its step runs, which can outlast busy_timeout, so keep waiting for a while.
+    deadline = monotonic() + MIGRATION_LOCK_WAIT_SECONDS
+    while True:
+        try:
+            conn.exec_driver_sql("BEGIN IMMEDIATE")
+            return
+        except OperationalError as exc:
+            conn.rollback()
+            if "database is locked" not in str(exc.orig) or monotonic() >= deadline:
+                raise
+
+
+def _run_backfill(conn: Connection, backfill: Backfill, batch_rows: int = BACKFILL_BATCH_ROWS) -> None:
+    max_rowid = conn.execute(text(f"SELECT MAX(rowid) FROM {backfill.table}")).scalar()
+    conn.rollback()
+    low = 0
+    while max_rowid is not None and low < max_rowid:
+        high = low + batch_rows
+        _begin_locked(conn)
+        try:
+            conn.execute(text(backfill.statement), {"low": low, "high": high})
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        low = high
+
+
+def _record_version(conn: Connection, migration: Migration) -> None:
+    conn.execute(
+        text(f"INSERT OR IGNORE INTO {SCHEMA_TABLE} (version, name) VALUES (:version, :name)"),
+        {"version": migration.version, "name": migration.name},
+    )
+
+
+def run_migrations(engine: Engine, migrations: list[Migration]) -> list[Migration]:
+    latest = migrations[-1].version if migrations else 0
+    version = current_version(engine)
+    if version >= latest:
+        # The common boot path: one indexed read, no schema inspection.
+        if version > latest:
+            logger.warning("Database schema version %s is newer than this build (%s)", version, latest)
+        return []
+
+    applied: list[Migration] = []
+    with engine.connect() as conn:
+        for migration in migrations:
+            # Workers booting together serialize here; whoever gets the lock second re-reads the versions
+            # and skips what the first one already recorded.
+            _begin_locked(conn)
+            try:
+                conn.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {SCHEMA_TABLE} ("
+                        "version INTEGER PRIMARY KEY, name VARCHAR(100) NOT NULL, "
+                        "applied_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP)"
+                    )
+                )
+                done = conn.execute(
+                    text(f"SELECT 1 FROM {SCHEMA_TABLE} WHERE version = :version"), {"version": migration.version}
+                ).first()
+                if done:
+                    conn.rollback()
+                    continue
+                logger.info("Applying schema migration %s (%s)", migration.version, migration.name)
+                migration.apply(conn)
+                if not migration.backfills:
+                    _record_version(conn, migration)
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+            if migration.backfills:
+                for backfill in migration.backfills:
+                    _run_backfill(conn, backfill)
+                # A worker that raced through the same windows may have recorded it already.
+                _begin_locked(conn)
+                try:
+                    _record_version(conn, migration)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+            applied.append(migration)
+    return applied
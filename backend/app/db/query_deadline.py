@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import sqlite3
+from threading import Lock
+from time import monotonic
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.util import await_only
+from sqlmodel import Session
+
+from app.core.config import settings
+
+ROUTE_CLASS_READ = "read"
+ROUTE_CLASS_SEARCH = "search"
+ROUTE_CLASS_ADMIN = "admin"
+ROUTE_CLASS_WRITE = "write"
+ROUTE_CLASSES = (ROUTE_CLASS_READ, ROUTE_CLASS_SEARCH, ROUTE_CLASS_ADMIN, ROUTE_CLASS_WRITE)
+QUERY_DEADLINE_KEY = "query_deadline"
+QUERY_ROUTE_CLASS_KEY = "query_route_class"
+QUERY_INTERRUPTED_KEY = "query_interrupted"
+# SQLite calls the handler every N virtual machine instructions, roughly every few hundred microseconds.
+PROGRESS_HANDLER_INSTRUCTIONS = 10000
+SQLITE_INTERRUPTED_MESSAGE = "interrupted"
+
+
+class QueryDeadlineStats:
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._cancelled = dict.fromkeys(ROUTE_CLASSES, 0)
+
+    def record(self, route_class: str) -> None:
+        with self._lock:
+            self._cancelled[route_class] = self._cancelled.get(route_class, 0) + 1
+
+    def snapshot(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._cancelled)
+
+
+query_deadline_stats = QueryDeadlineStats()
+
+
+def query_budget_ms(route_class: str) -> int:
+    budgets = {
+        ROUTE_CLASS_READ: settings.query_deadline_read_ms,
+        ROUTE_CLASS_SEARCH: settings.query_deadline_search_ms,
+        ROUTE_CLASS_ADMIN: settings.query_deadline_admin_ms,
+        ROUTE_CLASS_WRITE: settings.query_deadline_write_ms,
+    }
+    return budgets[route_class]
+
+
+def deadline_info(route_class: str) -> dict[str, object]:
+    # Session.info for a request-scoped session: the budget starts when the request's session is created.
+    budget_ms = query_budget_ms(route_class)
+    if budget_ms <= 0:
+        return {}
+    return {QUERY_DEADLINE_KEY: monotonic() + budget_ms / 1000, QUERY_ROUTE_CLASS_KEY: route_class}
+
+
+def is_deadline_interrupt(exc: OperationalError) -> bool:
+    return isinstance(exc.orig, sqlite3.OperationalError) and str(exc.orig) == SQLITE_INTERRUPTED_MESSAGE
+
+
+def install_query_deadlines(target: Engine) -> Engine:
+    # The deadline rides on the pooled connection's info dict: copied from the session when a transaction
+    # begins, cleared when the connection goes back to the pool.
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        info = connection_record.info
+
+        def _progress() -> int:
+            deadline = info.get(QUERY_DEADLINE_KEY)
+            if deadline is None or monotonic() < deadline:
+                return 0
+            # Non-zero aborts the running statement with "interrupted"; counted once per transaction.
+            if not info.get(QUERY_INTERRUPTED_KEY):
+                info[QUERY_INTERRUPTED_KEY] = True
+                query_deadline_stats.record(info.get(QUERY_ROUTE_CLASS_KEY, ROUTE_CLASS_READ))
+            return 1
+
+        if isinstance(dbapi_connection, sqlite3.Connection):
+            dbapi_connection.set_progress_handler(_progress, PROGRESS_HANDLER_INSTRUCTIONS)
+        else:
+            # aiosqlite runs statements on its own thread, so the handler goes on that connection.
+            driver_connection = dbapi_connection.driver_connection
+            await_only(driver_connection.set_progress_handler(_progress, PROGRESS_HANDLER_INSTRUCTIONS))
+
+    @event.listens_for(target, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        for key in (QUERY_DEADLINE_KEY, QUERY_ROUTE_CLASS_KEY, QUERY_INTERRUPTED_KEY):
+            connection_record.info.pop(key, None)
+
+    return target
+
+
+@event.listens_for(Session, "after_begin")
+def _attach_deadline(session, transaction, connection) -> None:
+    deadline = session.info.get(QUERY_DEADLINE_KEY)
+    if deadline is not None:
+        connection.info[QUERY_DEADLINE_KEY] = deadline
+        connection.info[QUERY_ROUTE_CLASS_KEY] = session.info[QUERY_ROUTE_CLASS_KEY]
+        connection.info.pop(QUERY_INTERRUPTED_KEY, None)
@@ -1,13 +1,134 @@
 from __future__ import annotations
 
+from sqlalchemy import event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlmodel import Session, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
+from app.db.query_deadline import (
+    ROUTE_CLASS_ADMIN,
+    ROUTE_CLASS_READ,
+    ROUTE_CLASS_SEARCH,
+    ROUTE_CLASS_WRITE,
+    deadline_info,
+    install_query_deadlines,
+)
 
+SQLITE_PROFILE_WAL = "wal"
+SQLITE_PROFILE_LEGACY = "legacy"
 
-engine = create_engine(settings.database_url, echo=False, connect_args={"check_same_thread": False})
+
+def _sqlite_pragmas(read_only: bool) -> list[str]:
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        f"PRAGMA synchronous={settings.sqlite_synchronous}",
+        f"PRAGMA cache_size=-{settings.sqlite_cache_size_kb}",
+        f"PRAGMA mmap_size={settings.sqlite_mmap_size_mb * 1024 * 1024}",
+        f"PRAGMA busy_timeout={settings.sqlite_busy_timeout_ms}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+    return pragmas
+
+
+def _apply_profile(target: Engine, read_only: bool) -> Engine:
+    pragmas = _sqlite_pragmas(read_only)
+
+    @event.listens_for(target, "connect")
+    def _on_connect(dbapi_connection, connection_record) -> None:
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    return target
+
+
+def _build_engines() -> tuple[Engine, Engine]:
+    connect_args = {"check_same_thread": False}
+    is_sqlite = settings.database_url.startswith("sqlite")
+    if not is_sqlite or settings.sqlite_profile.lower() != SQLITE_PROFILE_WAL:
+        shared = create_engine(settings.database_url, echo=False, connect_args=connect_args if is_sqlite else {})
+        if is_sqlite:
+            install_query_deadlines(shared)
+        return shared, shared
+
+    # WAL lets readers run next to the one writer. All mutations share a single pooled connection, so
+    # writers queue in the pool instead of racing for SQLite's lock and failing with "database is locked".
+    writer = create_engine(
+        settings.database_url,
+        echo=False,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=settings.sqlite_writer_wait_seconds,
+    )
+    reader = create_engine(
+        settings.database_url,
+        echo=False,
+        connect_args=connect_args,
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=settings.sqlite_read_pool_size,
+    )
+    for target in (writer, reader):
+        install_query_deadlines(target)
+    return _apply_profile(writer, read_only=False), _apply_profile(reader, read_only=True)
+
+
+def _build_async_read_engine() -> AsyncEngine:
+    url = make_url(settings.database_url)
+    if url.get_backend_name() != "sqlite":
+        return create_async_engine(url, echo=False)
+
+    # Same file through aiosqlite, so async handlers await their reads instead of holding a worker thread.
+    async_url = url.set(drivername="sqlite+aiosqlite")
+    if settings.sqlite_profile.lower() != SQLITE_PROFILE_WAL:
+        shared = create_async_engine(async_url, echo=False, poolclass=AsyncAdaptedQueuePool)
+        install_query_deadlines(shared.sync_engine)
+        return shared
+
+    reader = create_async_engine(
+        async_url,
+        echo=False,
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=settings.sqlite_read_pool_size,
+    )
+    install_query_deadlines(reader.sync_engine)
+    _apply_profile(reader.sync_engine, read_only=True)
+    return reader
+
+
+engine, read_engine = _build_engines()
+async_read_engine = _build_async_read_engine()
 
 
 def get_session():
-    with Session(engine) as session:
+    with Session(engine, info=deadline_info(ROUTE_CLASS_WRITE)) as session:
+        yield session
+
+
+def get_read_session():
+    with Session(read_engine, info=deadline_info(ROUTE_CLASS_READ)) as session:
+        yield session
+
+
+def get_admin_read_session():
+    with Session(read_engine, info=deadline_info(ROUTE_CLASS_ADMIN)) as session:
+        yield session
+
+
+async def get_async_read_session():
+    async with AsyncSession(async_read_engine, expire_on_commit=False, info=deadline_info(ROUTE_CLASS_READ)) as session:
+        yield session
+
+
+async def get_async_search_session():
+    async with AsyncSession(
+        async_read_engine, expire_on_commit=False, info=deadline_info(ROUTE_CLASS_SEARCH)
+    ) as session:
         yield session
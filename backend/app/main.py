@@ -1,15 +1,29 @@
 from __future__ import annotations
 
+import logging
 from pathlib import Path
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 
 from app.api.router import api_router
+from app.api.routes.attachments import UPLOAD_BODY_LIMITS
+from app.core.body_limit import BodySizeLimitMiddleware
 from app.core.config import settings
 from app.db.init_db import create_db_and_tables
+from app.db.query_deadline import is_deadline_interrupt
+from app.db.session import async_read_engine
+from app.services.group_commit import group_commit
+from app.services.image_derivatives import derivative_pool
+from app.services.reader_sketch import reader_sketches
+from app.services.text_extraction import text_extraction_pool
+from app.services.upload_gc import start_periodic_sweeper
 
 app = FastAPI(title=settings.app_name)
+logger = logging.getLogger(__name__)
 
 app.add_middleware(
     CORSMiddleware,
@@ -18,12 +32,52 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(BodySizeLimitMiddleware, limits=UPLOAD_BODY_LIMITS)
+
+
+@app.exception_handler(OperationalError)
+async def database_operational_error(request: Request, exc: OperationalError) -> JSONResponse:
+    if is_deadline_interrupt(exc):
+        logger.warning("Query deadline exceeded: %s %s", request.method, request.url.path)
+        return JSONResponse(status_code=status.HTTP_504_GATEWAY_TIMEOUT, content={"detail": "Query deadline exceeded"})
+    if "database is locked" in str(exc.orig):
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"detail": "Database busy"},
+            headers={"Retry-After": "1"},
+        )
+    raise exc
+
+
+@app.exception_handler(PoolTimeoutError)
+async def database_pool_timeout(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    # The single writer connection stayed busy for longer than SQLITE_WRITER_WAIT_SECONDS.
+    logger.warning("Database connection wait timed out: %s %s", request.method, request.url.path)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Database busy"},
+        headers={"Retry-After": "1"},
+    )
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     create_db_and_tables()
     Path(settings.upload_dir).mkdir(parents=True, exist_ok=True)
+    start_periodic_sweeper()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    group_commit.shutdown()
+    reader_sketches.flush()
+    derivative_pool.shutdown()
+    text_extraction_pool.shutdown()
+
+
+@app.on_event("shutdown")
+async def on_async_shutdown() -> None:
+    await async_read_engine.dispose()
 
 
 app.include_router(api_router, prefix=settings.api_prefix)
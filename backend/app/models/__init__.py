@@ -1,23 +1,39 @@
 from app.models.attachment import Attachment
+from app.models.attachment_blob import AttachmentBlob
+from app.models.attachment_text import AttachmentText
 from app.models.auth import RefreshToken
 from app.models.board import Board
 from app.models.comment import Comment
+from app.models.comment_closure import CommentClosure
 from app.models.like import PostLike
 from app.models.menu import Menu
 from app.models.menu_permission import MenuPermission
 from app.models.post import Post
+from app.models.reaction import PostReaction
+from app.models.reader_sketch import PostReaderSketch
+from app.models.reaction_count import PostReactionCount
 from app.models.role import Role
+from app.models.upload_session import UploadSession
+from app.models.upload_usage import UploadUsage
 from app.models.user import User
 
 __all__ = [
     "Attachment",
+    "AttachmentBlob",
+    "AttachmentText",
     "RefreshToken",
     "Board",
     "Comment",
+    "CommentClosure",
     "PostLike",
     "Menu",
     "MenuPermission",
     "Post",
+    "PostReaction",
+    "PostReaderSketch",
+    "PostReactionCount",
     "Role",
+    "UploadSession",
+    "UploadUsage",
     "User",
 ]
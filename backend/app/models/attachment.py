@@ -15,5 +15,6 @@ class Attachment(SQLModel, table=True):
     stored_name: str = Field(max_length=255)
     mime_type: str = Field(max_length=120)
     size_bytes: int = Field(nullable=False)
+    content_hash: str | None = Field(default=None, max_length=64, index=True)
     path: str = Field(max_length=500)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
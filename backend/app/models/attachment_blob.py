@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class AttachmentBlob(SQLModel, table=True):
+    __tablename__ = "attachment_blobs"
+
+    content_hash: str = Field(primary_key=True, max_length=64)
+    size_bytes: int = Field(nullable=False)
+    path: str = Field(max_length=500)
+    ref_count: int = Field(default=0, nullable=False)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
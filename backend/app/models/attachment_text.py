@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Text, column, table
+from sqlmodel import Field, SQLModel
+
+
+class AttachmentText(SQLModel, table=True):
+    __tablename__ = "attachment_texts"
+
+    content_hash: str = Field(primary_key=True, max_length=64)
+    status: str = Field(max_length=20)
+    content: str = Field(default="", sa_column=Column(Text, nullable=False))
+    extracted_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+# FTS5 index over attachment_texts (trigram tokens, kept in sync by triggers); created by a migration
+# rather than SQLModel.metadata because it is a virtual table.
+attachment_text_fts = table("attachment_text_fts", column("content_hash"), column("content"))
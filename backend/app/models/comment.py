@@ -2,15 +2,22 @@ from __future__ import annotations
 
 from datetime import datetime, timezone
 
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel
 
 
 class Comment(SQLModel, table=True):
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_post_seek", "post_id", "is_deleted", "created_at", "id"),
+        Index("ix_comments_post_thread_seek", "post_id", "parent_id", "is_deleted", "created_at", "id"),
+    )
 
     id: int | None = Field(default=None, primary_key=True)
     post_id: int = Field(foreign_key="posts.id", index=True)
     author_id: int = Field(foreign_key="users.id", index=True)
+    parent_id: int | None = Field(default=None, foreign_key="comments.id")
+    depth: int = Field(default=0, nullable=False)
     content: str
     is_deleted: bool = Field(default=False, nullable=False)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,13 @@
+from __future__ import annotations
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+
+class CommentClosure(SQLModel, table=True):
+    __tablename__ = "comment_closure"
+    __table_args__ = (Index("ix_comment_closure_descendant", "descendant_id", "depth"),)
+
+    ancestor_id: int = Field(foreign_key="comments.id", primary_key=True)
+    descendant_id: int = Field(foreign_key="comments.id", primary_key=True)
+    depth: int = Field(default=0, nullable=False)
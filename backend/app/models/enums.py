@@ -30,3 +30,12 @@ class SystemPermission(StrEnum):
     MANAGE_USERS = "MANAGE_USERS"
     MANAGE_ROLES = "MANAGE_ROLES"
     MODERATE_CONTENT = "MODERATE_CONTENT"
+
+
+class ReactionType(StrEnum):
+    # Likes are PostLike rows counted in posts.like_count, not a reaction type.
+    CELEBRATE = "CELEBRATE"
+    LOVE = "LOVE"
+    WOW = "WOW"
+    LAUGH = "LAUGH"
+    SAD = "SAD"
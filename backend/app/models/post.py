@@ -16,6 +16,9 @@ class Post(SQLModel, table=True):
     is_pinned: bool = Field(default=False, nullable=False)
     is_deleted: bool = Field(default=False, nullable=False)
     view_count: int = Field(default=0, nullable=False)
+    comment_count: int = Field(default=0, nullable=False)
+    deleted_comment_count: int = Field(default=0, nullable=False)
+    like_count: int = Field(default=0, nullable=False)
     qna_status: str | None = Field(default=None, max_length=30)
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
     updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
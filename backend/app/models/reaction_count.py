@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from sqlmodel import Field, SQLModel
+
+from app.models.enums import ReactionType
+
+
+class PostReactionCount(SQLModel, table=True):
+    __tablename__ = "post_reaction_counts"
+
+    post_id: int = Field(foreign_key="posts.id", primary_key=True)
+    celebrate_count: int = Field(default=0, nullable=False)
+    love_count: int = Field(default=0, nullable=False)
+    wow_count: int = Field(default=0, nullable=False)
+    laugh_count: int = Field(default=0, nullable=False)
+    sad_count: int = Field(default=0, nullable=False)
+
+
+REACTION_COUNT_COLUMNS = {
+    ReactionType.CELEBRATE.value: "celebrate_count",
+    ReactionType.LOVE.value: "love_count",
+    ReactionType.WOW.value: "wow_count",
+    ReactionType.LAUGH.value: "laugh_count",
+    ReactionType.SAD.value: "sad_count",
+}
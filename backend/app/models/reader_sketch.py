@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, LargeBinary
+from sqlmodel import Field, SQLModel
+
+
+class PostReaderSketch(SQLModel, table=True):
+    __tablename__ = "post_reader_sketches"
+
+    post_id: int = Field(foreign_key="posts.id", primary_key=True)
+    bucket: str = Field(primary_key=True, max_length=10)
+    registers: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class UploadSession(SQLModel, table=True):
+    __tablename__ = "upload_sessions"
+
+    id: str = Field(primary_key=True, max_length=32)
+    post_id: int = Field(foreign_key="posts.id", index=True)
+    uploader_id: int = Field(foreign_key="users.id", index=True)
+    original_name: str = Field(max_length=255)
+    mime_type: str = Field(max_length=120)
+    total_size: int = Field(nullable=False)
+    chunk_size: int = Field(nullable=False)
+    received_bytes: int = Field(default=0, nullable=False)
+    next_chunk: int = Field(default=0, nullable=False)
+    expected_hash: str | None = Field(default=None, max_length=64)
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
+    expires_at: datetime = Field(index=True, nullable=False)
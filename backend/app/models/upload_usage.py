@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlmodel import Field, SQLModel
+
+
+class UploadUsage(SQLModel, table=True):
+    __tablename__ = "upload_usage"
+
+    scope: str = Field(primary_key=True, max_length=10)
+    scope_id: int = Field(primary_key=True)
+    bytes_used: int = Field(default=0, nullable=False)
+    file_count: int = Field(default=0, nullable=False)
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), nullable=False)
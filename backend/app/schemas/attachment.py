@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class AttachmentOut(BaseModel):
@@ -12,3 +12,35 @@ class AttachmentOut(BaseModel):
     mime_type: str
     size_bytes: int
     created_at: datetime
+
+
+class UploadSessionCreate(BaseModel):
+    filename: str = Field(min_length=1, max_length=255)
+    size: int = Field(gt=0)
+    mime_type: str | None = Field(default=None, max_length=120)
+    sha256: str | None = Field(default=None, min_length=64, max_length=64)
+
+
+class UploadSessionOut(BaseModel):
+    id: str
+    post_id: int
+    original_name: str
+    total_size: int
+    chunk_size: int
+    received_bytes: int
+    next_chunk: int
+    total_chunks: int
+    expires_at: datetime
+
+
+class AttachmentBatchItem(BaseModel):
+    original_name: str
+    ok: bool
+    attachment: AttachmentOut | None = None
+    error: str | None = None
+
+
+class AttachmentBatchOut(BaseModel):
+    items: list[AttachmentBatchItem]
+    succeeded: int
+    failed: int
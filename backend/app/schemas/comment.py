@@ -7,6 +7,7 @@ from pydantic import BaseModel
 
 class CommentCreate(BaseModel):
     content: str
+    parent_id: int | None = None
 
 
 class CommentUpdate(BaseModel):
@@ -18,7 +19,28 @@ class CommentOut(BaseModel):
     post_id: int
     author_id: int
     author_name: str
+    parent_id: int | None = None
+    depth: int = 0
     content: str
     is_deleted: bool
     created_at: datetime
     updated_at: datetime
+
+
+class CommentPage(BaseModel):
+    items: list[CommentOut]
+    total: int
+    next_cursor: str | None = None
+    has_more: bool
+
+
+class CommentThreadOut(CommentOut):
+    reply_count: int
+    replies: list[CommentOut]
+
+
+class CommentThreadPage(BaseModel):
+    items: list[CommentThreadOut]
+    total: int
+    next_cursor: str | None = None
+    has_more: bool
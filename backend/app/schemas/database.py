@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class QueryDeadlineClass(BaseModel):
+    route_class: str
+    budget_ms: int
+    cancelled: int
+
+
+class QueryDeadlineReport(BaseModel):
+    items: list[QueryDeadlineClass]
+    total_cancelled: int
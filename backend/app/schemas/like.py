@@ -4,3 +4,13 @@ from pydantic import BaseModel
 class LikeStatusOut(BaseModel):
     liked: bool
     like_count: int
+
+
+class LikeStatusItem(BaseModel):
+    post_id: int
+    liked: bool
+    like_count: int
+
+
+class LikeBatchStatusOut(BaseModel):
+    items: list[LikeStatusItem]
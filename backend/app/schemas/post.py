@@ -4,6 +4,8 @@ from datetime import datetime
 
 from pydantic import BaseModel
 
+from app.schemas.comment import CommentPage
+
 
 class AttachmentMeta(BaseModel):
     id: int
@@ -67,3 +69,16 @@ class PostListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+
+
+class PostDetailOut(BaseModel):
+    post: PostOut
+    comments: CommentPage
+
+
+class PostReaderStats(BaseModel):
+    post_id: int
+    unique_readers: int
+    unique_readers_today: int
+    unique_readers_7d: int
+    standard_error: float
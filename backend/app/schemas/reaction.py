@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+from pydantic import BaseModel
+
+
+class ReactionSet(BaseModel):
+    reaction_type: str
+
+
+class ReactionSummary(BaseModel):
+    post_id: int
+    counts: dict[str, int]
+    total: int
+    my_reaction: str | None = None
+
+
+class ReactionBatchOut(BaseModel):
+    items: list[ReactionSummary]
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class UploadUsageItem(BaseModel):
+    scope: str
+    scope_id: int
+    name: str
+    bytes_used: int
+    file_count: int
+    quota_bytes: int | None = None
+    usage_ratio: float | None = None
+    updated_at: datetime
+
+
+class UploadUsageReport(BaseModel):
+    scope: str
+    items: list[UploadUsageItem]
+    total_bytes: int
+    total_files: int
+
+
+class UploadUsageReconcileOut(BaseModel):
+    rows: int
+    corrected: int
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO
+
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.models.attachment_blob import AttachmentBlob
+from app.models.attachment_text import AttachmentText
+from app.services.image_derivatives import DERIVATIVE_VARIANTS, derivative_path
+from app.services.storage import get_storage, storage_for
+
+BLOB_DIR_NAME = "blobs"
+BLOB_CHUNK_SIZE = 1024 * 1024
+FOLD_BATCH_SIZE = 200
+
+
+class FileTooLargeError(Exception):
+    pass
+
+
+@dataclass
+class StoredBlob:
+    content_hash: str
+    size_bytes: int
+    path: str
+    deduplicated: bool
+
+
+@dataclass
+class FoldReport:
+    scanned: int = 0
+    folded: int = 0
+    duplicates: int = 0
+    missing: int = 0
+    reclaimed_bytes: int = 0
+
+
+def blob_root() -> Path:
+    return settings.upload_path / BLOB_DIR_NAME
+
+
+def blob_key(content_hash: str) -> str:
+    return f"{BLOB_DIR_NAME}/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+
+def blob_path(content_hash: str) -> Path:
+    return settings.upload_path / blob_key(content_hash)
+
+
+def hash_stream(source: BinaryIO, max_size: int | None = None) -> tuple[int, str]:
+    digest = hashlib.sha256()
+    size = 0
+    while chunk := source.read(BLOB_CHUNK_SIZE):
+        size += len(chunk)
+        if max_size is not None and size > max_size:
+            raise FileTooLargeError(f"File exceeds {max_size} bytes")
+        digest.update(chunk)
+    return size, digest.hexdigest()
+
+
+def write_blob(source: BinaryIO, content_hash: str) -> str:
+    return get_storage().save(source, blob_key(content_hash))
+
+
+def acquire_blob(session: Session, content_hash: str, size_bytes: int, path: str) -> None:
+    session.exec(
+        insert(AttachmentBlob.__table__)
+        .values(content_hash=content_hash, size_bytes=size_bytes, path=path, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=["content_hash"],
+            set_={"ref_count": AttachmentBlob.__table__.c.ref_count + 1},
+        )
+    )
+
+
+def release_blob(session: Session, content_hash: str) -> str | None:
+    # Returns the locator to discard once the caller has committed, or None while other rows still share it.
+    session.exec(
+        update(AttachmentBlob)
+        .where(AttachmentBlob.content_hash == content_hash)
+        .values(ref_count=AttachmentBlob.ref_count - 1)
+    )
+    blob = session.get(AttachmentBlob, content_hash)
+    if not blob or blob.ref_count > 0:
+        return None
+    session.delete(blob)
+    extracted = session.get(AttachmentText, content_hash)
+    if extracted:
+        session.delete(extracted)
+    return blob.path
+
+
+def blob_in_use(session: Session, content_hash: str) -> bool:
+    ref_count = session.exec(
+        select(AttachmentBlob.ref_count).where(AttachmentBlob.content_hash == content_hash)
+    ).first()
+    return bool(ref_count)
+
+
+def discard_blob(locator: str) -> None:
+    storage = storage_for(locator)
+    storage.delete(locator)
+    local_path = storage.local_path(locator)
+    if local_path is not None:
+        for variant in DERIVATIVE_VARIANTS:
+            derivative_path(local_path, variant).unlink(missing_ok=True)
+
+
+def write_upload(source: BinaryIO, max_size: int) -> StoredBlob:
+    # First pass only hashes, so content that is already stored never gets written again. Touches no
+    # database state, so several uploads can be written from worker threads at once.
+    size_bytes, content_hash = hash_stream(source, max_size)
+    storage = get_storage()
+    target = storage.locator(blob_key(content_hash))
+    deduplicated = storage.touch(target)
+    if not deduplicated:
+        source.seek(0)
+        target = write_blob(source, content_hash)
+    return StoredBlob(content_hash=content_hash, size_bytes=size_bytes, path=target, deduplicated=deduplicated)
+
+
+def adopt_file(source: Path, content_hash: str, size_bytes: int) -> StoredBlob:
+    # Moves an already assembled and hashed file (a finished resumable upload) into the store; local
+    # storage renames it, S3 sends it as a multipart upload. Like write_upload it touches no database
+    # state, so callers run it outside their write transaction.
+    storage = get_storage()
+    target = storage.locator(blob_key(content_hash))
+    deduplicated = storage.touch(target)
+    if deduplicated:
+        source.unlink(missing_ok=True)
+    else:
+        target = storage.save_file(source, blob_key(content_hash))
+    return StoredBlob(content_hash=content_hash, size_bytes=size_bytes, path=target, deduplicated=deduplicated)
+
+
+def abandon_blob(session: Session, blob: StoredBlob) -> None:
+    # Undo for a blob this request stored but never got a row for; content that was already there, or
+    # that another upload has acquired since, stays.
+    if not blob.deduplicated and not blob_in_use(session, blob.content_hash):
+        discard_blob(blob.path)
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    target.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        os.link(source, target)
+    except FileExistsError:
+        pass
+    except OSError:
+        shutil.copy2(source, target)
+
+
+def fold_legacy_attachments(session: Session, batch_size: int = FOLD_BATCH_SIZE) -> FoldReport:
+    # Walks attachments in id order, one batch per transaction. Old files are removed only after the
+    # batch commits, so an interrupted run can simply be started again.
+    report = FoldReport()
+    storage = get_storage()
+    last_id = 0
+    while True:
+        attachments = session.exec(
+            select(Attachment).where(Attachment.id > last_id).order_by(Attachment.id.asc()).limit(batch_size)
+        ).all()
+        if not attachments:
+            break
+
+        obsolete: list[Path] = []
+        for attachment in attachments:
+            last_id = attachment.id
+            report.scanned += 1
+            source = Path(attachment.path)
+            if attachment.content_hash or source.is_relative_to(blob_root()):
+                continue
+            if not source.exists():
+                report.missing += 1
+                continue
+
+            with source.open("rb") as handle:
+                size_bytes, content_hash = hash_stream(handle)
+            target = storage.locator(blob_key(content_hash))
+            local_target = storage.local_path(target)
+            if storage.exists(target) and not (local_target and local_target.samefile(source)):
+                report.duplicates += 1
+                report.reclaimed_bytes += size_bytes
+            elif local_target is not None:
+                _link_or_copy(source, local_target)
+            else:
+                with source.open("rb") as handle:
+                    write_blob(handle, content_hash)
+
+            acquire_blob(session, content_hash, size_bytes, target)
+            attachment.content_hash = content_hash
+            attachment.size_bytes = size_bytes
+            attachment.stored_name = content_hash
+            attachment.path = target
+            session.add(attachment)
+            obsolete.append(source)
+            report.folded += 1
+
+        session.commit()
+        for path in obsolete:
+            path.unlink(missing_ok=True)
+
+    return report
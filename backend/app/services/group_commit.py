@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+from concurrent.futures import Future
+from queue import Empty, SimpleQueue
+from threading import Lock, Thread
+from time import monotonic
+from typing import Any, TypeVar
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.session import engine
+
+T = TypeVar("T")
+Mutation = Callable[[Session], Any]
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitQueue:
+    # Small mutations from concurrent requests are applied on one writer thread, each inside its own
+    # savepoint, and committed together, so a burst of likes or comments costs one fsync instead of one
+    # per request. A mutation receives the batch session, must not commit, and should return plain
+    # values or objects that stay readable after the commit.
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._queue: SimpleQueue[tuple[Mutation, Future] | None] = SimpleQueue()
+        self._thread: Thread | None = None
+
+    def run(self, mutation: Callable[[Session], T]) -> T:
+        if not settings.group_commit_enabled:
+            with Session(engine, expire_on_commit=False) as session:
+                result = mutation(session)
+                session.commit()
+            return result
+        return self.submit(mutation).result()
+
+    def submit(self, mutation: Mutation) -> Future:
+        future: Future = Future()
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(target=self._loop, name="group-commit", daemon=True)
+                self._thread.start()
+            self._queue.put((mutation, future))
+        return future
+
+    def _next_batch(self) -> list[tuple[Mutation, Future]] | None:
+        first = self._queue.get()
+        if first is None:
+            return None
+        batch = [first]
+        deadline = monotonic() + settings.group_commit_window_ms / 1000
+        while len(batch) < settings.group_commit_max_batch:
+            # Everything that queued up while the previous batch was committing joins this one; the
+            # optional window then waits a little longer for stragglers on disks where fsync is slow.
+            try:
+                item = self._queue.get_nowait()
+            except Empty:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except Empty:
+                    break
+            if item is None:
+                # Finish what is queued, then let the loop see the shutdown marker.
+                self._queue.put(None)
+                break
+            batch.append(item)
+        return batch
+
+    def _loop(self) -> None:
+        while (batch := self._next_batch()) is not None:
+            self._commit_batch(batch)
+
+    def _commit_batch(self, batch: list[tuple[Mutation, Future]]) -> None:
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            with Session(engine, expire_on_commit=False) as session:
+                # pysqlite only opens a transaction before DML; start it explicitly so the savepoints below
+                # nest inside one transaction instead of each committing on release.
+                session.connection().exec_driver_sql("BEGIN IMMEDIATE")
+                for mutation, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with session.begin_nested():
+                            outcomes.append((future, mutation(session), None))
+                    except Exception as exc:
+                        outcomes.append((future, None, exc))
+                session.commit()
+        except Exception as exc:
+            logger.exception("Group commit of %s mutations failed", len(batch))
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        # Results are only released once the batch is durable.
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is None:
+                return
+            self._queue.put(None)
+        thread.join(timeout=5)
+
+
+group_commit = GroupCommitQueue()
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from hashlib import blake2b
+from math import log, sqrt
+
+HLL_PRECISION = 11
+HLL_REGISTERS = 1 << HLL_PRECISION
+HLL_STANDARD_ERROR = 1.04 / sqrt(HLL_REGISTERS)
+_RANK_BITS = 64 - HLL_PRECISION
+
+
+def new_sketch() -> bytearray:
+    return bytearray(HLL_REGISTERS)
+
+
+def _hash64(value: int) -> int:
+    return int.from_bytes(blake2b(str(value).encode("ascii"), digest_size=8).digest(), "big")
+
+
+def add(sketch: bytearray, value: int) -> bool:
+    hashed = _hash64(value)
+    index = hashed >> _RANK_BITS
+    remainder = hashed & ((1 << _RANK_BITS) - 1)
+    rank = _RANK_BITS - remainder.bit_length() + 1
+    if rank <= sketch[index]:
+        return False
+    sketch[index] = rank
+    return True
+
+
+def merge(*sketches: bytes | bytearray) -> bytearray:
+    merged = new_sketch()
+    for sketch in sketches:
+        if len(sketch) != HLL_REGISTERS:
+            continue
+        merged = bytearray(map(max, merged, sketch))
+    return merged
+
+
+def estimate(sketch: bytes | bytearray) -> int:
+    registers = len(sketch)
+    if registers == 0:
+        return 0
+
+    alpha = 0.7213 / (1 + 1.079 / registers)
+    raw = alpha * registers * registers / sum(2.0 ** -rank for rank in sketch)
+    zeros = sketch.count(0)
+    if raw <= 2.5 * registers and zeros:
+        # Linear counting is more accurate while many registers are still empty.
+        return round(registers * log(registers / zeros))
+    return round(raw)
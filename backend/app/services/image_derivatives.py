@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import logging
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from pathlib import Path
+from threading import Lock
+
+IMAGE_EXTENSIONS = {"jpg", "jpeg", "png", "webp"}
+DERIVATIVE_VARIANTS: dict[str, int | None] = {
+    "thumb": 320,
+    "webp": None,
+}
+DERIVATIVE_WEBP_QUALITY = 80
+DERIVATIVE_POOL_WORKERS = 2
+DERIVATIVE_WAIT_SECONDS = 10.0
+
+logger = logging.getLogger(__name__)
+
+
+def is_image(filename: str) -> bool:
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    return extension in IMAGE_EXTENSIONS
+
+
+def derivative_path(original: Path, variant: str) -> Path:
+    return original.with_name(f"{original.name}.{variant}.webp")
+
+
+def render_derivative(original: str, variant: str) -> str:
+    # Runs inside the process pool; Pillow is imported here so the API process never decodes images.
+    from PIL import Image, ImageOps
+
+    source = Path(original)
+    target = derivative_path(source, variant)
+    if target.exists():
+        return str(target)
+
+    max_edge = DERIVATIVE_VARIANTS[variant]
+    temp = target.with_name(f".{target.name}.{os.getpid()}.part")
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+        if max_edge:
+            image.thumbnail((max_edge, max_edge))
+        image.save(temp, format="WEBP", quality=DERIVATIVE_WEBP_QUALITY, method=4)
+    os.replace(temp, target)
+    return str(target)
+
+
+class DerivativePool:
+    def __init__(self, max_workers: int = DERIVATIVE_POOL_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._lock = Lock()
+        self._executor: ProcessPoolExecutor | None = None
+        self._inflight: dict[Path, Future] = {}
+
+    def _submit(self, original: Path, variant: str) -> Future:
+        target = derivative_path(original, variant)
+        with self._lock:
+            future = self._inflight.get(target)
+            if future is not None:
+                return future
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            future = self._executor.submit(render_derivative, str(original), variant)
+            self._inflight[target] = future
+        future.add_done_callback(lambda done: self._finished(target, done))
+        return future
+
+    def _finished(self, target: Path, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(target, None)
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Derivative %s failed", target, exc_info=future.exception())
+
+    def schedule(self, original: Path) -> None:
+        for variant in DERIVATIVE_VARIANTS:
+            if not derivative_path(original, variant).exists():
+                self._submit(original, variant)
+
+    def get(self, original: Path, variant: str) -> Path | None:
+        target = derivative_path(original, variant)
+        if target.exists():
+            return target
+        try:
+            return Path(self._submit(original, variant).result(timeout=DERIVATIVE_WAIT_SECONDS))
+        except FutureTimeoutError:
+            return None
+        except Exception:
+            logger.warning("Derivative %s for %s failed", variant, original, exc_info=True)
+            return None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+derivative_pool = DerivativePool()
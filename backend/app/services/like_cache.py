@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+
+from sqlmodel import Session, select
+
+from app.models.like import PostLike
+
+LIKED_SET_MAX_USERS = 5000
+LIKED_SET_TTL_SECONDS = 60.0
+
+
+def _contains(sorted_ids: array, post_id: int) -> bool:
+    index = bisect_left(sorted_ids, post_id)
+    return index < len(sorted_ids) and sorted_ids[index] == post_id
+
+
+class LikedSetCache:
+    # Per-process LRU of user_id -> sorted array of liked post ids. The TTL bounds staleness
+    # when another worker process handles a user's like/unlike.
+    def __init__(self, max_users: int = LIKED_SET_MAX_USERS, ttl_seconds: float = LIKED_SET_TTL_SECONDS) -> None:
+        self.max_users = max_users
+        self.ttl_seconds = ttl_seconds
+        self._lock = Lock()
+        self._entries: OrderedDict[int, tuple[float, array]] = OrderedDict()
+        # A like committed while a user's set is being loaded may be missing from that load, so add/remove
+        # bump the user's generation and a load that saw it change is not cached. Only users with a load
+        # in flight are tracked.
+        self._loading: dict[int, int] = {}
+        self._generations: dict[int, int] = {}
+
+    def _get(self, user_id: int) -> array | None:
+        entry = self._entries.get(user_id)
+        if entry is None:
+            return None
+        loaded_at, post_ids = entry
+        if monotonic() - loaded_at > self.ttl_seconds:
+            self._entries.pop(user_id, None)
+            return None
+        self._entries.move_to_end(user_id)
+        return post_ids
+
+    def _put(self, user_id: int, post_ids: array) -> None:
+        self._entries[user_id] = (monotonic(), post_ids)
+        self._entries.move_to_end(user_id)
+        while len(self._entries) > self.max_users:
+            self._entries.popitem(last=False)
+
+    def _load(self, session: Session, user_id: int) -> array:
+        rows = session.exec(
+            select(PostLike.post_id).where(PostLike.user_id == user_id).order_by(PostLike.post_id.asc())
+        ).all()
+        return array("I", (int(post_id) for post_id in rows))
+
+    def liked_among(self, session: Session, user_id: int, post_ids: list[int]) -> set[int]:
+        if not post_ids:
+            return set()
+
+        with self._lock:
+            liked = self._get(user_id)
+            if liked is None:
+                self._loading[user_id] = self._loading.get(user_id, 0) + 1
+                generation = self._generations.setdefault(user_id, 0)
+        if liked is None:
+            try:
+                liked = self._load(session, user_id)
+            finally:
+                with self._lock:
+                    if liked is not None and self._generations[user_id] == generation:
+                        self._put(user_id, liked)
+                    self._loading[user_id] -= 1
+                    if not self._loading[user_id]:
+                        del self._loading[user_id]
+                        del self._generations[user_id]
+
+        with self._lock:
+            return {post_id for post_id in post_ids if _contains(liked, post_id)}
+
+    def is_liked(self, session: Session, user_id: int, post_id: int) -> bool:
+        return post_id in self.liked_among(session, user_id, [post_id])
+
+    def _bump(self, user_id: int) -> None:
+        if user_id in self._generations:
+            self._generations[user_id] += 1
+
+    def add(self, user_id: int, post_id: int) -> None:
+        with self._lock:
+            self._bump(user_id)
+            liked = self._get(user_id)
+            if liked is None:
+                return
+            if not _contains(liked, post_id):
+                liked.insert(bisect_left(liked, post_id), post_id)
+
+    def remove(self, user_id: int, post_id: int) -> None:
+        with self._lock:
+            self._bump(user_id)
+            liked = self._get(user_id)
+            if liked is None:
+                return
+            if _contains(liked, post_id):
+                del liked[bisect_left(liked, post_id)]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+liked_set_cache = LikedSetCache()
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta, timezone
+from threading import Lock, Thread
+from time import monotonic
+
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, select
+
+from app.db.session import engine
+from app.models.reader_sketch import PostReaderSketch
+from app.services import hll
+
+ALL_TIME_BUCKET = "all"
+READER_SKETCH_FLUSH_SECONDS = 10.0
+READER_SKETCH_FLUSH_MAX_KEYS = 256
+READER_SKETCH_RETENTION_DAYS = 35
+
+logger = logging.getLogger(__name__)
+
+
+def day_bucket(day: date) -> str:
+    return day.isoformat()
+
+
+class ReaderSketchBuffer:
+    # Unique-reader observations are merged into per-process pending sketches and flushed
+    # as register-wise max merges, so repeat views never write and merges are order-free.
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._pending: dict[tuple[int, str], bytearray] = {}
+        self._last_flush = monotonic()
+        self._last_prune: date | None = None
+        self._flushing = False
+
+    def observe(self, post_id: int, user_id: int) -> None:
+        today = day_bucket(datetime.now(timezone.utc).date())
+        with self._lock:
+            for bucket in (ALL_TIME_BUCKET, today):
+                sketch = self._pending.get((post_id, bucket))
+                if sketch is None:
+                    sketch = self._pending[(post_id, bucket)] = hll.new_sketch()
+                hll.add(sketch, user_id)
+            due = not self._flushing and (
+                len(self._pending) >= READER_SKETCH_FLUSH_MAX_KEYS
+                or monotonic() - self._last_flush >= READER_SKETCH_FLUSH_SECONDS
+            )
+            if due:
+                self._flushing = True
+        if due:
+            # The calling request may already hold the single writer connection, so flush on its own thread.
+            Thread(target=self._background_flush, name="reader-sketch-flush", daemon=True).start()
+
+    def _background_flush(self) -> None:
+        try:
+            self.flush()
+        finally:
+            with self._lock:
+                self._flushing = False
+
+    def _take_pending(self) -> dict[tuple[int, str], bytearray]:
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = monotonic()
+        return pending
+
+    def _restore(self, pending: dict[tuple[int, str], bytearray]) -> None:
+        with self._lock:
+            for key, sketch in pending.items():
+                current = self._pending.get(key)
+                self._pending[key] = hll.merge(current, sketch) if current is not None else sketch
+
+    def flush(self) -> None:
+        pending = self._take_pending()
+        if not pending:
+            return
+
+        now = datetime.now(timezone.utc)
+        try:
+            with Session(engine) as session:
+                for (post_id, bucket), sketch in pending.items():
+                    # Writing first takes SQLite's write lock, so the read-merge-write below cannot interleave.
+                    session.exec(
+                        insert(PostReaderSketch.__table__)
+                        .values(post_id=post_id, bucket=bucket, registers=bytes(sketch), updated_at=now)
+                        .on_conflict_do_nothing(index_elements=["post_id", "bucket"])
+                    )
+                    row = session.get(PostReaderSketch, (post_id, bucket))
+                    row.registers = bytes(hll.merge(row.registers, sketch))
+                    row.updated_at = now
+                    session.add(row)
+
+                if self._last_prune != now.date():
+                    cutoff = day_bucket(now.date() - timedelta(days=READER_SKETCH_RETENTION_DAYS))
+                    session.exec(
+                        delete(PostReaderSketch)
+                        .where(PostReaderSketch.bucket != ALL_TIME_BUCKET)
+                        .where(PostReaderSketch.bucket < cutoff)
+                    )
+                session.commit()
+                self._last_prune = now.date()
+        except SQLAlchemyError:
+            # Sketch merges are idempotent, so keeping the observations for the next flush is always safe.
+            logger.warning("Reader sketch flush failed; retrying on next flush", exc_info=True)
+            self._restore(pending)
+
+    def merged(self, session: Session, post_id: int, buckets: list[str]) -> bytearray:
+        rows = session.exec(
+            select(PostReaderSketch.registers)
+            .where(PostReaderSketch.post_id == post_id)
+            .where(PostReaderSketch.bucket.in_(buckets))
+        ).all()
+        with self._lock:
+            pending = [self._pending[(post_id, bucket)] for bucket in buckets if (post_id, bucket) in self._pending]
+        return hll.merge(*rows, *pending)
+
+
+reader_sketches = ReaderSketchBuffer()
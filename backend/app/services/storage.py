@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import os
+import shutil
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, BinaryIO
+from urllib.parse import quote
+
+from app.core.config import settings
+
+STORAGE_BACKEND_LOCAL = "local"
+STORAGE_BACKEND_S3 = "s3"
+S3_LOCATOR_PREFIX = "s3://"
+STORAGE_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class StorageBackend(ABC):
+    # Objects are addressed by a locator, which is what Attachment.path and AttachmentBlob.path store:
+    # an absolute file path for the local backend and s3://bucket/key for S3.
+    name = ""
+
+    @abstractmethod
+    def locator(self, key: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def exists(self, locator: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(self, source: BinaryIO, key: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def save_file(self, source: Path, key: str) -> str:
+        raise NotImplementedError
+
+    @abstractmethod
+    def open(self, locator: str) -> BinaryIO:
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, locator: str) -> None:
+        raise NotImplementedError
+
+    def touch(self, locator: str) -> bool:
+        # Existence check for a deduplicated write; local storage also refreshes the mtime that the upload
+        # sweeper's grace period reads, so a blob being reused is not collected as an old orphan.
+        return self.exists(locator)
+
+    def local_path(self, locator: str) -> Path | None:
+        return None
+
+    def presigned_url(self, locator: str, filename: str, media_type: str) -> str | None:
+        return None
+
+
+class LocalStorage(StorageBackend):
+    name = STORAGE_BACKEND_LOCAL
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def locator(self, key: str) -> str:
+        return str(self.root / key)
+
+    def exists(self, locator: str) -> bool:
+        return Path(locator).exists()
+
+    def touch(self, locator: str) -> bool:
+        try:
+            os.utime(locator)
+        except FileNotFoundError:
+            return False
+        return True
+
+    def save(self, source: BinaryIO, key: str) -> str:
+        target = self.root / key
+        if target.exists():
+            return str(target)
+
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with NamedTemporaryFile(dir=target.parent, prefix=".blob-", suffix=".part", delete=False) as temp:
+            temp_path = Path(temp.name)
+            try:
+                shutil.copyfileobj(source, temp, STORAGE_COPY_CHUNK_SIZE)
+            except BaseException:
+                temp.close()
+                temp_path.unlink(missing_ok=True)
+                raise
+        # Identical content always lands on the same name, so a concurrent writer racing here is harmless.
+        os.replace(temp_path, target)
+        return str(target)
+
+    def save_file(self, source: Path, key: str) -> str:
+        target = self.root / key
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, target)
+        return str(target)
+
+    def open(self, locator: str) -> BinaryIO:
+        return Path(locator).open("rb")
+
+    def delete(self, locator: str) -> None:
+        Path(locator).unlink(missing_ok=True)
+
+    def local_path(self, locator: str) -> Path | None:
+        return Path(locator)
+
+
+class S3Storage(StorageBackend):
+    name = STORAGE_BACKEND_S3
+
+    def __init__(self) -> None:
+        # boto3 is only needed when STORAGE_BACKEND=s3.
+        import boto3
+        from boto3.s3.transfer import TransferConfig
+
+        self.bucket = settings.s3_bucket
+        self.prefix = settings.s3_prefix.strip("/")
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=settings.s3_endpoint_url or None,
+            region_name=settings.s3_region or None,
+            aws_access_key_id=settings.s3_access_key_id or None,
+            aws_secret_access_key=settings.s3_secret_access_key or None,
+        )
+        threshold = settings.s3_multipart_threshold_mb * 1024 * 1024
+        # Files above the threshold go up as multipart uploads in parts of the same size.
+        self.transfer_config = TransferConfig(multipart_threshold=threshold, multipart_chunksize=threshold)
+
+    def _object_key(self, key: str) -> str:
+        return f"{self.prefix}/{key}" if self.prefix else key
+
+    def _split(self, locator: str) -> tuple[str, str]:
+        bucket, _, object_key = locator.removeprefix(S3_LOCATOR_PREFIX).partition("/")
+        return bucket, object_key
+
+    def locator(self, key: str) -> str:
+        return f"{S3_LOCATOR_PREFIX}{self.bucket}/{self._object_key(key)}"
+
+    def exists(self, locator: str) -> bool:
+        from botocore.exceptions import ClientError
+
+        bucket, object_key = self._split(locator)
+        try:
+            self.client.head_object(Bucket=bucket, Key=object_key)
+        except ClientError as exc:
+            if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+        return True
+
+    def save(self, source: BinaryIO, key: str) -> str:
+        locator = self.locator(key)
+        bucket, object_key = self._split(locator)
+        self.client.upload_fileobj(source, bucket, object_key, Config=self.transfer_config)
+        return locator
+
+    def save_file(self, source: Path, key: str) -> str:
+        locator = self.locator(key)
+        bucket, object_key = self._split(locator)
+        self.client.upload_file(str(source), bucket, object_key, Config=self.transfer_config)
+        source.unlink(missing_ok=True)
+        return locator
+
+    def open(self, locator: str) -> BinaryIO:
+        bucket, object_key = self._split(locator)
+        return self.client.get_object(Bucket=bucket, Key=object_key)["Body"]
+
+    def delete(self, locator: str) -> None:
+        bucket, object_key = self._split(locator)
+        self.client.delete_object(Bucket=bucket, Key=object_key)
+
+    def presigned_url(self, locator: str, filename: str, media_type: str) -> str | None:
+        bucket, object_key = self._split(locator)
+        params: dict[str, Any] = {
+            "Bucket": bucket,
+            "Key": object_key,
+            "ResponseContentType": media_type,
+            "ResponseContentDisposition": f"attachment; filename*=utf-8''{quote(filename)}",
+        }
+        return self.client.generate_presigned_url("get_object", Params=params, ExpiresIn=settings.s3_presign_seconds)
+
+
+@lru_cache(maxsize=1)
+def _local_storage() -> LocalStorage:
+    return LocalStorage(settings.upload_path)
+
+
+@lru_cache(maxsize=1)
+def _s3_storage() -> S3Storage:
+    return S3Storage()
+
+
+def get_storage() -> StorageBackend:
+    if settings.storage_backend.lower() == STORAGE_BACKEND_S3:
+        return _s3_storage()
+    return _local_storage()
+
+
+def storage_for(locator: str) -> StorageBackend:
+    # Rows keep working after STORAGE_BACKEND changes: each locator names the backend that holds it.
+    if locator.startswith(S3_LOCATOR_PREFIX):
+        return _s3_storage()
+    return _local_storage()
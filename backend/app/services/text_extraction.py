@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+import codecs
+import logging
+import re
+import signal
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from threading import Lock
+from xml.etree.ElementTree import Element, iterparse
+
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session
+
+from app.db.session import engine, read_engine
+from app.models.attachment_text import AttachmentText
+
+TEXT_EXTENSIONS = {"txt", "csv", "docx", "xlsx", "pptx"}
+TEXT_ENCODINGS = ("utf-8-sig", "cp949")
+EXTRACT_MAX_SOURCE_BYTES = 20 * 1024 * 1024
+EXTRACT_MAX_UNCOMPRESSED_BYTES = 64 * 1024 * 1024
+EXTRACT_MAX_CHARS = 200_000
+EXTRACT_TIMEOUT_SECONDS = 20
+EXTRACT_POOL_WORKERS = 2
+EXTRACT_STATUS_OK = "ok"
+EXTRACT_STATUS_FAILED = "failed"
+EXTRACT_STATUS_SKIPPED = "skipped"
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DRAWING_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+_SHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_SLIDE_NAME = re.compile(r"^ppt/slides/slide(\d+)\.xml$")
+_SHEET_NAME = re.compile(r"^xl/worksheets/sheet(\d+)\.xml$")
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionLimitError(Exception):
+    pass
+
+
+def extension_of(filename: str) -> str:
+    return filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+
+
+def is_extractable(filename: str) -> bool:
+    return extension_of(filename) in TEXT_EXTENSIONS
+
+
+class _TextBuffer:
+    def __init__(self, max_chars: int) -> None:
+        self.max_chars = max_chars
+        self.parts: list[str] = []
+        self.size = 0
+
+    @property
+    def full(self) -> bool:
+        return self.size >= self.max_chars
+
+    def append(self, text: str) -> None:
+        if text and not self.full:
+            text = text[: self.max_chars - self.size]
+            self.parts.append(text)
+            self.size += len(text)
+
+    def text(self) -> str:
+        return "".join(self.parts).strip()
+
+
+def _plain_text(path: Path) -> str:
+    with path.open("rb") as handle:
+        raw = handle.read(EXTRACT_MAX_CHARS * 4)
+        truncated = bool(handle.read(1))
+    for encoding in TEXT_ENCODINGS:
+        # The byte limit can split a multibyte character; a non-final incremental decode drops that tail
+        # instead of rejecting the whole encoding.
+        try:
+            return codecs.getincrementaldecoder(encoding)().decode(raw, final=not truncated)[:EXTRACT_MAX_CHARS]
+        except UnicodeDecodeError:
+            continue
+    return raw.decode("utf-8", errors="replace")[:EXTRACT_MAX_CHARS]
+
+
+def _ordered_members(archive: zipfile.ZipFile, pattern: re.Pattern[str]) -> list[str]:
+    numbered = [(int(match.group(1)), name) for name in archive.namelist() if (match := pattern.match(name))]
+    return [name for _, name in sorted(numbered)]
+
+
+def _iter_xml(archive: zipfile.ZipFile, name: str) -> Iterator[Element]:
+    with archive.open(name) as handle:
+        for _, element in iterparse(handle, events=("end",)):
+            yield element
+
+
+def _collect_runs(archive: zipfile.ZipFile, names: list[str], text_tag: str, block_tag: str) -> str:
+    buffer = _TextBuffer(EXTRACT_MAX_CHARS)
+    for name in names:
+        for element in _iter_xml(archive, name):
+            if element.tag == text_tag:
+                buffer.append(element.text or "")
+            elif element.tag == block_tag:
+                buffer.append("\n")
+                element.clear()
+            if buffer.full:
+                return buffer.text()
+        buffer.append("\n")
+    return buffer.text()
+
+
+def _shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings: list[str] = []
+    for element in _iter_xml(archive, "xl/sharedStrings.xml"):
+        if element.tag == f"{_SHEET_NS}si":
+            strings.append("".join(node.text or "" for node in element.iter(f"{_SHEET_NS}t")))
+            element.clear()
+    return strings
+
+
+def _xlsx_text(archive: zipfile.ZipFile) -> str:
+    strings = _shared_strings(archive)
+    buffer = _TextBuffer(EXTRACT_MAX_CHARS)
+    for name in _ordered_members(archive, _SHEET_NAME):
+        for element in _iter_xml(archive, name):
+            if element.tag == f"{_SHEET_NS}c":
+                cell_type = element.get("t")
+                value = element.findtext(f"{_SHEET_NS}v") or ""
+                if cell_type == "s" and value.isdigit() and int(value) < len(strings):
+                    value = strings[int(value)]
+                elif cell_type == "inlineStr":
+                    value = "".join(node.text or "" for node in element.iter(f"{_SHEET_NS}t"))
+                buffer.append(f"{value}\t" if value else "")
+                element.clear()
+            elif element.tag == f"{_SHEET_NS}row":
+                buffer.append("\n")
+                element.clear()
+            if buffer.full:
+                return buffer.text()
+    return buffer.text()
+
+
+def _office_text(path: Path, extension: str) -> str:
+    with zipfile.ZipFile(path) as archive:
+        # Refuse archives that would inflate far beyond their upload size.
+        if sum(info.file_size for info in archive.infolist()) > EXTRACT_MAX_UNCOMPRESSED_BYTES:
+            raise ExtractionLimitError("Archive expands beyond the extraction limit")
+        if extension == "docx":
+            return _collect_runs(archive, ["word/document.xml"], f"{_WORD_NS}t", f"{_WORD_NS}p")
+        if extension == "pptx":
+            return _collect_runs(archive, _ordered_members(archive, _SLIDE_NAME), f"{_DRAWING_NS}t", f"{_DRAWING_NS}p")
+        return _xlsx_text(archive)
+
+
+def _on_timeout(signum, frame) -> None:
+    raise ExtractionLimitError("Extraction timed out")
+
+
+def extract_text(path: str, extension: str, timeout_seconds: int = EXTRACT_TIMEOUT_SECONDS) -> str:
+    # Runs inside the process pool. The alarm stops a runaway parser in the worker itself, so a
+    # pathological file cannot occupy the pool after the caller has given up on it.
+    source = Path(path)
+    if source.stat().st_size > EXTRACT_MAX_SOURCE_BYTES:
+        raise ExtractionLimitError("File exceeds the extraction size limit")
+
+    previous = signal.signal(signal.SIGALRM, _on_timeout)
+    signal.alarm(timeout_seconds)
+    try:
+        if extension in ("txt", "csv"):
+            return _plain_text(source)
+        return _office_text(source, extension)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def save_extracted_text(session: Session, content_hash: str, status: str, content: str) -> None:
+    session.exec(
+        insert(AttachmentText.__table__)
+        .values(content_hash=content_hash, status=status, content=content)
+        .on_conflict_do_update(index_elements=["content_hash"], set_={"status": status, "content": content})
+    )
+
+
+class TextExtractionPool:
+    def __init__(self, max_workers: int = EXTRACT_POOL_WORKERS) -> None:
+        self.max_workers = max_workers
+        self._lock = Lock()
+        self._executor: ProcessPoolExecutor | None = None
+
+    def _executor_for_submit(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            return self._executor
+
+    def _persist(self, content_hash: str, path: Path, future: Future) -> None:
+        if future.cancelled():
+            return
+        status, content = EXTRACT_STATUS_OK, ""
+        exc = future.exception()
+        if isinstance(exc, ExtractionLimitError):
+            logger.info("Skipped text extraction for %s: %s", path, exc)
+            status = EXTRACT_STATUS_SKIPPED
+        elif exc is not None:
+            logger.warning("Text extraction failed for %s", path, exc_info=exc)
+            status = EXTRACT_STATUS_FAILED
+        else:
+            content = future.result()
+        with Session(engine) as session:
+            save_extracted_text(session, content_hash, status, content)
+            session.commit()
+
+    def schedule(self, content_hash: str, path: Path, filename: str) -> None:
+        # Called as a background task after the upload commits; identical content is extracted once.
+        # The result is stored from the future's callback, so no request thread waits on the pool.
+        with Session(read_engine) as session:
+            if session.get(AttachmentText, content_hash):
+                return
+        future = self._executor_for_submit().submit(extract_text, str(path), extension_of(filename))
+        future.add_done_callback(lambda done: self._persist(content_hash, path, done))
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+text_extraction_pool = TextExtractionPool()
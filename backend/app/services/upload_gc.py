@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from sqlalchemy import func, literal_column, union_all
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db.session import engine, read_engine
+from app.models.attachment import Attachment
+from app.models.attachment_blob import AttachmentBlob
+from app.models.post import Post
+from app.services.blob_store import blob_in_use, discard_blob, release_blob
+from app.services.storage import storage_for
+from app.services.upload_quota import release_upload
+from app.services.upload_sessions import UPLOAD_SESSION_DIR_NAME, purge_expired_sessions
+
+GC_MODE_QUARANTINE = "quarantine"
+GC_MODE_DELETE = "delete"
+QUARANTINE_DIR_NAME = ".quarantine"
+CURSOR_FILE_NAME = ".gc-cursor"
+TEMP_SUFFIX = ".part"
+GC_GRACE_SECONDS = 3600
+GC_PURGE_BATCH_SIZE = 200
+GC_REFERENCE_FETCH_SIZE = 1000
+# Path separator mapped below every filename character, so plain string order of the mapped paths
+# equals the per-directory sorted walk order on disk and in SQL.
+_SORT_SEPARATOR = "\x01"
+_DERIVATIVE_NAME = re.compile(r"^(?P<base>[0-9a-f]{64})\.[a-z]+\.webp$")
+_BLOB_NAME = re.compile(r"^[0-9a-f]{64}$")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SweepReport:
+    scanned: int = 0
+    kept: int = 0
+    orphans: int = 0
+    orphan_bytes: int = 0
+    stale_temp_files: int = 0
+    skipped_recent: int = 0
+    purged_attachments: int = 0
+    purged_bytes: int = 0
+    expired_upload_sessions: int = 0
+    cursor: str | None = None
+
+
+def _sort_key(path: str) -> str:
+    return path.replace(os.sep, _SORT_SEPARATOR)
+
+
+def _walk_sorted(directory: Path, start_after: str | None) -> Iterator[os.DirEntry]:
+    try:
+        entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+    except FileNotFoundError:
+        return
+
+    for entry in entries:
+        if entry.name in (QUARANTINE_DIR_NAME, CURSOR_FILE_NAME, UPLOAD_SESSION_DIR_NAME):
+            continue
+        key = _sort_key(entry.path)
+        if entry.is_dir(follow_symlinks=False):
+            # Skip whole subtrees that lie entirely before the resume cursor.
+            if start_after and key < start_after and not start_after.startswith(key + _SORT_SEPARATOR):
+                continue
+            yield from _walk_sorted(Path(entry.path), start_after)
+        elif not start_after or key > start_after:
+            yield entry
+
+
+def _referenced_keys(session: Session, start_after: str | None) -> Iterator[str]:
+    paths = union_all(
+        select(Attachment.path.label("path")),
+        select(AttachmentBlob.path.label("path")),
+    ).subquery()
+    key = func.replace(paths.c.path, os.sep, _SORT_SEPARATOR)
+    statement = select(key.label("key")).distinct().order_by(literal_column("key"))
+    if start_after:
+        statement = statement.where(key > start_after)
+    # Streamed in sorted order; only one fetch batch of paths is in memory at a time.
+    for row in session.exec(statement.execution_options(yield_per=GC_REFERENCE_FETCH_SIZE)):
+        yield row
+
+
+def _is_derivative_of_existing(entry: os.DirEntry) -> bool:
+    match = _DERIVATIVE_NAME.match(entry.name)
+    return bool(match) and (Path(entry.path).parent / match.group("base")).exists()
+
+
+def _modified_within(path: Path | None, grace_seconds: int) -> bool:
+    try:
+        return path is not None and time.time() - path.stat().st_mtime < grace_seconds
+    except FileNotFoundError:
+        return False
+
+
+def _blob_reacquired(content_hash: str) -> bool:
+    # The sweep's reference stream is one long read snapshot; an upload may have deduplicated onto this
+    # blob since, so ask again in a fresh transaction.
+    with Session(read_engine) as session:
+        return blob_in_use(session, content_hash)
+
+
+def _dispose(path: Path, root: Path, mode: str) -> None:
+    if mode == GC_MODE_DELETE:
+        path.unlink(missing_ok=True)
+        return
+    target = root / QUARANTINE_DIR_NAME / path.relative_to(root)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    shutil.move(str(path), target)
+
+
+def purge_expired_attachments(session: Session, retention_days: int, dry_run: bool, report: SweepReport) -> None:
+    cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+    last_id = 0
+    while True:
+        rows = session.exec(
+            select(Attachment, Post.board_id)
+            .join(Post, Post.id == Attachment.post_id)
+            .where(Post.is_deleted == True)
+            .where(Post.deleted_at < cutoff)
+            .where(Attachment.id > last_id)
+            .order_by(Attachment.id.asc())
+            .limit(GC_PURGE_BATCH_SIZE)
+        ).all()
+        if not rows:
+            return
+
+        removable: list[tuple[str | None, str]] = []
+        for attachment, board_id in rows:
+            last_id = attachment.id
+            report.purged_attachments += 1
+            report.purged_bytes += attachment.size_bytes
+            if dry_run:
+                continue
+            release_upload(session, attachment.uploader_id, board_id, attachment.size_bytes)
+            if attachment.content_hash and session.get(AttachmentBlob, attachment.content_hash):
+                released = release_blob(session, attachment.content_hash)
+                if released is not None:
+                    removable.append((attachment.content_hash, released))
+            else:
+                removable.append((None, attachment.path))
+            session.delete(attachment)
+
+        if dry_run:
+            continue
+        session.commit()
+        for content_hash, locator in removable:
+            # An upload can deduplicate onto the blob between the commit and here: it touches the file,
+            # then acquires a new row. Either sign leaves the file to a later sweep.
+            if content_hash and (
+                blob_in_use(session, content_hash)
+                or _modified_within(storage_for(locator).local_path(locator), GC_GRACE_SECONDS)
+            ):
+                continue
+            discard_blob(locator)
+
+
+def sweep_uploads(
+    session: Session,
+    mode: str = GC_MODE_QUARANTINE,
+    dry_run: bool = False,
+    grace_seconds: int = GC_GRACE_SECONDS,
+    max_files: int | None = None,
+    start_after: str | None = None,
+    retention_days: int | None = None,
+) -> SweepReport:
+    root = settings.upload_path
+    report = SweepReport()
+    if retention_days is not None:
+        purge_expired_attachments(session, retention_days, dry_run, report)
+    if not dry_run:
+        report.expired_upload_sessions = purge_expired_sessions(session)
+
+    # The purges above are the only writes; hand the writer back and stream references from a read
+    # connection so uploads are not blocked for the length of the walk.
+    session.rollback()
+    with Session(read_engine) as reader:
+        references = _referenced_keys(reader, start_after)
+        reference = next(references, None)
+        for entry in _walk_sorted(root, start_after):
+            if max_files is not None and report.scanned >= max_files:
+                return report
+            report.scanned += 1
+            report.cursor = _sort_key(entry.path)
+
+            while reference is not None and reference < report.cursor:
+                reference = next(references, None)
+            if reference == report.cursor or _is_derivative_of_existing(entry):
+                report.kept += 1
+                continue
+
+            if not dry_run and _BLOB_NAME.match(entry.name) and _blob_reacquired(entry.name):
+                report.kept += 1
+                continue
+
+            # Read after the reference check, so an upload that deduplicated in between has already touched it.
+            stat = entry.stat(follow_symlinks=False)
+            if time.time() - stat.st_mtime < grace_seconds:
+                # Recent files may belong to an upload whose Attachment row is not committed yet.
+                report.skipped_recent += 1
+                continue
+
+            if entry.name.endswith(TEMP_SUFFIX):
+                report.stale_temp_files += 1
+            else:
+                report.orphans += 1
+                report.orphan_bytes += stat.st_size
+            if not dry_run:
+                _dispose(Path(entry.path), root, GC_MODE_DELETE if entry.name.endswith(TEMP_SUFFIX) else mode)
+
+    report.cursor = None
+    return report
+
+
+def _cursor_file() -> Path:
+    return settings.upload_path / CURSOR_FILE_NAME
+
+
+def load_cursor() -> str | None:
+    try:
+        return _cursor_file().read_text(encoding="utf-8") or None
+    except FileNotFoundError:
+        return None
+
+
+def save_cursor(cursor: str | None) -> None:
+    path = _cursor_file()
+    if cursor is None:
+        path.unlink(missing_ok=True)
+        return
+    path.write_text(cursor, encoding="utf-8")
+
+
+def run_incremental_sweep(mode: str, max_files: int | None, dry_run: bool = False) -> SweepReport:
+    # One slice of the walk: resumes after the saved cursor and purges expired posts at the start of each pass.
+    start_after = load_cursor()
+    retention_days = settings.attachment_retention_days if settings.attachment_retention_days > 0 else None
+    with Session(engine) as session:
+        report = sweep_uploads(
+            session,
+            mode=mode,
+            dry_run=dry_run,
+            max_files=max_files,
+            start_after=start_after,
+            retention_days=retention_days if start_after is None else None,
+        )
+    if not dry_run:
+        save_cursor(report.cursor)
+    return report
+
+
+def start_periodic_sweeper() -> threading.Thread | None:
+    interval_minutes = settings.upload_gc_interval_minutes
+    if interval_minutes <= 0:
+        return None
+
+    def _loop() -> None:
+        while True:
+            time.sleep(interval_minutes * 60)
+            try:
+                report = run_incremental_sweep(settings.upload_gc_mode, settings.upload_gc_batch_files)
+                logger.info("Upload sweep: %s", report)
+            except Exception:
+                logger.exception("Upload sweep failed")
+
+    thread = threading.Thread(target=_loop, name="upload-gc", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlmodel import Session, func, select
+
+from app.core.config import settings
+from app.models.attachment import Attachment
+from app.models.post import Post
+from app.models.upload_usage import UploadUsage
+
+USAGE_SCOPE_USER = "user"
+USAGE_SCOPE_BOARD = "board"
+USAGE_SCOPES = (USAGE_SCOPE_USER, USAGE_SCOPE_BOARD)
+
+
+class QuotaExceededError(Exception):
+    def __init__(self, scope: str, limit_bytes: int) -> None:
+        super().__init__(f"Upload quota exceeded for this {scope} (max {limit_bytes // (1024 * 1024)}MB)")
+        self.scope = scope
+        self.limit_bytes = limit_bytes
+
+
+@dataclass
+class ReconcileReport:
+    rows: int = 0
+    corrected: int = 0
+
+
+def quota_bytes(scope: str) -> int | None:
+    megabytes = settings.user_upload_quota_mb if scope == USAGE_SCOPE_USER else settings.board_upload_quota_mb
+    return megabytes * 1024 * 1024 if megabytes > 0 else None
+
+
+def _adjust_usage(session: Session, scope: str, scope_id: int, size_bytes: int, files: int) -> None:
+    table = UploadUsage.__table__
+    session.exec(
+        insert(table)
+        .values(scope=scope, scope_id=scope_id, bytes_used=max(size_bytes, 0), file_count=max(files, 0))
+        .on_conflict_do_update(
+            index_elements=["scope", "scope_id"],
+            set_={
+                "bytes_used": func.max(table.c.bytes_used + size_bytes, 0),
+                "file_count": func.max(table.c.file_count + files, 0),
+                "updated_at": datetime.now(timezone.utc),
+            },
+        )
+    )
+
+
+def usage_bytes(session: Session, scope: str, scope_id: int) -> int:
+    used = session.exec(
+        select(UploadUsage.bytes_used).where(UploadUsage.scope == scope).where(UploadUsage.scope_id == scope_id)
+    ).first()
+    return used or 0
+
+
+def ensure_quota_available(session: Session, user_id: int, board_id: int, size_bytes: int) -> None:
+    # Early, read-only check (e.g. before a resumable upload starts); charge_upload is the binding one.
+    for scope, scope_id in ((USAGE_SCOPE_USER, user_id), (USAGE_SCOPE_BOARD, board_id)):
+        limit = quota_bytes(scope)
+        if limit is not None and usage_bytes(session, scope, scope_id) + size_bytes > limit:
+            raise QuotaExceededError(scope, limit)
+
+
+def charge_upload(session: Session, user_id: int, board_id: int, size_bytes: int) -> None:
+    # Increment first: the write takes SQLite's lock, so the totals read back below already include every
+    # concurrent upload. On QuotaExceededError the caller rolls back, which also undoes the increment.
+    for scope, scope_id in ((USAGE_SCOPE_USER, user_id), (USAGE_SCOPE_BOARD, board_id)):
+        _adjust_usage(session, scope, scope_id, size_bytes, 1)
+        limit = quota_bytes(scope)
+        if limit is not None and usage_bytes(session, scope, scope_id) > limit:
+            raise QuotaExceededError(scope, limit)
+
+
+def release_upload(session: Session, user_id: int, board_id: int, size_bytes: int) -> None:
+    _adjust_usage(session, USAGE_SCOPE_USER, user_id, -size_bytes, -1)
+    _adjust_usage(session, USAGE_SCOPE_BOARD, board_id, -size_bytes, -1)
+
+
+def _actual_usage(session: Session) -> dict[tuple[str, int], tuple[int, int]]:
+    actual: dict[tuple[str, int], tuple[int, int]] = {}
+    by_user = session.exec(
+        select(Attachment.uploader_id, func.sum(Attachment.size_bytes), func.count()).group_by(Attachment.uploader_id)
+    ).all()
+    for user_id, total, count in by_user:
+        actual[(USAGE_SCOPE_USER, user_id)] = (int(total or 0), count)
+    by_board = session.exec(
+        select(Post.board_id, func.sum(Attachment.size_bytes), func.count())
+        .join(Post, Post.id == Attachment.post_id)
+        .group_by(Post.board_id)
+    ).all()
+    for board_id, total, count in by_board:
+        actual[(USAGE_SCOPE_BOARD, board_id)] = (int(total or 0), count)
+    return actual
+
+
+def reconcile_usage(session: Session) -> ReconcileReport:
+    # Full recount in one write transaction. Deleting first takes SQLite's write lock, so no upload can
+    # commit between the recount and the rewrite; counters only drift through bugs or manual DB edits.
+    stored = {
+        (row.scope, row.scope_id): (row.bytes_used, row.file_count) for row in session.exec(select(UploadUsage)).all()
+    }
+    session.exec(delete(UploadUsage))
+    actual = _actual_usage(session)
+    now = datetime.now(timezone.utc)
+    for (scope, scope_id), (bytes_used, file_count) in actual.items():
+        session.add(
+            UploadUsage(scope=scope, scope_id=scope_id, bytes_used=bytes_used, file_count=file_count, updated_at=now)
+        )
+    session.commit()
+
+    drifted = {key for key, value in actual.items() if stored.get(key, (0, 0)) != value}
+    drifted |= {key for key, value in stored.items() if key not in actual and value != (0, 0)}
+    return ReconcileReport(rows=len(actual), corrected=len(drifted))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from threading import Lock
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.db.session import engine
+from app.models.upload_session import UploadSession
+
+UPLOAD_SESSION_DIR_NAME = ".sessions"
+UPLOAD_SESSION_FILE_SUFFIX = ".upload"
+UPLOAD_SESSION_PURGE_BATCH_SIZE = 200
+UPLOAD_SESSION_ORPHAN_SECONDS = 3600
+UPLOAD_SESSION_PURGE_INTERVAL_SECONDS = 600
+
+_purge_lock = Lock()
+_last_purge_at = 0.0
+
+
+def session_root() -> Path:
+    return settings.upload_path / UPLOAD_SESSION_DIR_NAME
+
+
+def session_file(upload_id: str) -> Path:
+    return session_root() / f"{upload_id}{UPLOAD_SESSION_FILE_SUFFIX}"
+
+
+def append_chunk(path: Path, offset: int, data: bytes) -> None:
+    # Truncating first discards the tail of a chunk whose request died mid-write, so a retried
+    # chunk always lands exactly at the committed offset.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("r+b" if path.exists() else "wb") as handle:
+        handle.truncate(offset)
+        handle.seek(offset)
+        handle.write(data)
+        handle.flush()
+        os.fsync(handle.fileno())
+
+
+def purge_expired_sessions(session: Session) -> int:
+    now = datetime.now(timezone.utc)
+    purged = 0
+    while True:
+        expired = session.exec(
+            select(UploadSession).where(UploadSession.expires_at < now).limit(UPLOAD_SESSION_PURGE_BATCH_SIZE)
+        ).all()
+        if not expired:
+            break
+        for upload in expired:
+            session.delete(upload)
+        session.commit()
+        for upload in expired:
+            session_file(upload.id).unlink(missing_ok=True)
+        purged += len(expired)
+
+    # Files whose session row never committed or was removed without its file.
+    cutoff = time.time() - UPLOAD_SESSION_ORPHAN_SECONDS
+    root = session_root()
+    if root.is_dir():
+        for entry in os.scandir(root):
+            upload_id = entry.name.removesuffix(UPLOAD_SESSION_FILE_SUFFIX)
+            if entry.stat().st_mtime < cutoff and not session.get(UploadSession, upload_id):
+                Path(entry.path).unlink(missing_ok=True)
+                purged += 1
+    return purged
+
+
+def purge_expired_sessions_if_due() -> int:
+    # Run after create_upload responds: at most once per interval per process, on its own writer session,
+    # so new sessions never wait on the purge. The upload sweeper also purges when it is enabled.
+    global _last_purge_at
+    with _purge_lock:
+        if time.monotonic() - _last_purge_at < UPLOAD_SESSION_PURGE_INTERVAL_SECONDS:
+            return 0
+        _last_purge_at = time.monotonic()
+    with Session(engine) as session:
+        return purge_expired_sessions(session)
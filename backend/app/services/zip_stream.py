@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import zipfile
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import PurePosixPath
+from typing import BinaryIO
+
+ZIP_CHUNK_SIZE = 256 * 1024
+STORED_EXTENSIONS = {"jpg", "jpeg", "png", "webp", "zip", "docx", "xlsx", "pptx"}
+FALLBACK_MEMBER_NAME = "attachment"
+
+
+@dataclass
+class ZipEntry:
+    name: str
+    open_source: Callable[[], BinaryIO]
+    size_bytes: int
+    modified_at: datetime
+
+
+class _ChunkSink:
+    # Write-only, non-seekable target: zipfile then emits data descriptors instead of seeking back,
+    # and everything written so far can be handed to the response and dropped.
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _member_name(name: str) -> str:
+    # Uploaded names are untrusted: keep only the last path component so no member extracts outside
+    # the target folder ("../x", "/etc/x", "a\\..\\x").
+    base = PurePosixPath(name.replace("\\", "/")).name.strip()
+    return base if base not in {"", ".", ".."} else FALLBACK_MEMBER_NAME
+
+
+def _member_names(names: list[str]) -> list[str]:
+    # Assigned up front: names that are already unique keep them, and only repeats get a " (n)" suffix
+    # that avoids every name in the archive.
+    bases = [_member_name(name) for name in names]
+    used: set[str] = set()
+    keep = []
+    for base in bases:
+        keep.append(base.lower() not in used)
+        used.add(base.lower())
+
+    result = []
+    for base, kept in zip(bases, keep):
+        if kept:
+            result.append(base)
+            continue
+        stem, dot, extension = base.rpartition(".")
+        if not dot or not stem:
+            stem, extension = base, ""
+        counter = 2
+        candidate = base
+        while candidate.lower() in used:
+            candidate = f"{stem} ({counter}).{extension}" if extension else f"{stem} ({counter})"
+            counter += 1
+        used.add(candidate.lower())
+        result.append(candidate)
+    return result
+
+
+def stream_zip(entries: Iterable[ZipEntry]) -> Iterator[bytes]:
+    entries = list(entries)
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, mode="w", allowZip64=True) as archive:
+        for entry, name in zip(entries, _member_names([entry.name for entry in entries])):
+            extension = name.rsplit(".", 1)[-1].lower() if "." in name else ""
+            info = zipfile.ZipInfo(name, date_time=entry.modified_at.timetuple()[:6])
+            info.compress_type = zipfile.ZIP_STORED if extension in STORED_EXTENSIONS else zipfile.ZIP_DEFLATED
+            info.file_size = entry.size_bytes
+            with closing(entry.open_source()) as source, archive.open(info, mode="w") as target:
+                while chunk := source.read(ZIP_CHUNK_SIZE):
+                    target.write(chunk)
+                    yield sink.drain()
+            yield sink.drain()
+    yield sink.drain()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import http.client
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+from bench_common import base_parser, login
+
+# Drives each hot read route with an increasing number of keep-alive clients. Sync handlers share
+# anyio's threadpool (40 threads by default), so their throughput stops growing and latency climbs
+# once concurrency passes that limit; the async handlers keep scaling until the database is the limit.
+# `GET /api/boards/{board_id}` is still a sync handler and is included as a control.
+
+IDLE_PROBE_STREAK = 5
+
+
+def _client_loop(base_url, token, path, deadline, latencies, errors, lock) -> None:
+    target = urlsplit(base_url)
+    conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+    headers = {"Authorization": f"Bearer {token}"}
+    local: list[float] = []
+    failed = 0
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException):
+                failed += 1
+                conn.close()
+                conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=60)
+                continue
+            if response.status != 200:
+                failed += 1
+                continue
+            local.append((time.perf_counter() - started) * 1000)
+    finally:
+        conn.close()
+    with lock:
+        latencies.extend(local)
+        errors.append(failed)
+
+
+def wait_until_idle(base_url: str, token: str, path: str, timeout: float) -> None:
+    # A level that overran the server leaves requests queued behind it, still holding pooled connections,
+    # and a lone probe can slip through between waves of pool timeouts. Wait for several prompt answers
+    # in a row so the next level starts from an idle server.
+    target = urlsplit(base_url)
+    deadline = time.perf_counter() + timeout
+    streak = 0
+    while streak < IDLE_PROBE_STREAK and time.perf_counter() < deadline:
+        conn = http.client.HTTPConnection(target.hostname, target.port or 80, timeout=1)
+        try:
+            conn.request("GET", path, headers={"Authorization": f"Bearer {token}"})
+            streak = streak + 1 if conn.getresponse().status == 200 else 0
+        except (OSError, http.client.HTTPException):
+            streak = 0
+        finally:
+            conn.close()
+        time.sleep(1)
+
+
+def run_level(base_url: str, token: str, path: str, clients: int, seconds: float) -> dict[str, float]:
+    latencies: list[float] = []
+    errors: list[int] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_client_loop, args=(base_url, token, path, deadline, latencies, errors, lock))
+        for _ in range(clients)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ordered = sorted(latencies)
+    return {
+        "rps": len(latencies) / seconds,
+        "p50": statistics.median(ordered) if ordered else float("nan"),
+        "p95": ordered[max(0, int(len(ordered) * 0.95) - 1)] if ordered else float("nan"),
+        "errors": sum(errors),
+    }
+
+
+def main() -> None:
+    parser = base_parser("Measure the concurrency ceiling of the hot read routes.")
+    parser.add_argument("--board-id", type=int, required=True)
+    parser.add_argument("--post-id", type=int, required=True)
+    parser.add_argument("--levels", default="8,32,64,128,256")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--drain-timeout", type=float, default=300.0, help="max wait for an idle server between levels")
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+    board_id, post_id = args.board_id, args.post_id
+    routes = [
+        ("list_boards", "/api/boards"),
+        ("list_menus", "/api/menus"),
+        ("list_posts", f"/api/boards/{board_id}/posts?page_size=20"),
+        ("get_post", f"/api/boards/{board_id}/posts/{post_id}"),
+        ("list_comments", f"/api/posts/{post_id}/comments"),
+        ("get_board (sync control)", f"/api/boards/{board_id}"),
+    ]
+    levels = [int(level) for level in args.levels.split(",") if level.strip()]
+
+    print(f"{'route':<26} {'clients':>7} {'req/s':>8} {'p50':>10} {'p95':>10} {'errors':>7}")
+    for label, path in routes:
+        for clients in levels:
+            wait_until_idle(args.base_url, token, path, args.drain_timeout)
+            result = run_level(args.base_url, token, path, clients, args.seconds)
+            print(
+                f"{label:<26} {clients:>7} {result['rps']:>8.0f} {result['p50']:>8.1f}ms "
+                f"{result['p95']:>8.1f}ms {result['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import time
+import urllib.request
+from uuid import uuid4
+from typing import Any, Callable
+
+
+def base_parser(description: str) -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="admin")
+    parser.add_argument("--password", default="admin1234")
+    parser.add_argument("-n", "--iterations", type=int, default=200)
+    return parser
+
+
+def request_json(
+    base_url: str,
+    method: str,
+    path: str,
+    token: str | None = None,
+    body: dict[str, Any] | None = None,
+) -> Any:
+    headers = {"Content-Type": "application/json"}
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    data = json.dumps(body).encode("utf-8") if body is not None else None
+    request = urllib.request.Request(f"{base_url}{path}", data=data, headers=headers, method=method)
+    with urllib.request.urlopen(request) as response:
+        payload = response.read()
+    return json.loads(payload) if payload else None
+
+
+def request_multipart(
+    base_url: str,
+    path: str,
+    token: str,
+    files: list[tuple[str, str, bytes]],
+) -> Any:
+    boundary = uuid4().hex
+    parts: list[bytes] = []
+    for field, filename, content in files:
+        parts.append(
+            (
+                f"--{boundary}\r\n"
+                f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n"
+            ).encode("utf-8")
+            + content
+            + b"\r\n"
+        )
+    parts.append(f"--{boundary}--\r\n".encode("utf-8"))
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": f"multipart/form-data; boundary={boundary}",
+    }
+    request = urllib.request.Request(f"{base_url}{path}", data=b"".join(parts), headers=headers, method="POST")
+    with urllib.request.urlopen(request) as response:
+        payload = response.read()
+    return json.loads(payload) if payload else None
+
+
+def login(base_url: str, username: str, password: str) -> str:
+    tokens = request_json(base_url, "POST", "/api/auth/login", body={"username": username, "password": password})
+    return tokens["access_token"]
+
+
+def measure(label: str, iterations: int, func: Callable[[], Any]) -> list[float]:
+    func()
+    samples: list[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    report(label, samples)
+    return samples
+
+
+def report(label: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    print(
+        f"{label:<32} n={len(samples):<6} mean={statistics.mean(samples):8.2f}ms "
+        f"p50={statistics.median(samples):8.2f}ms p95={p95:8.2f}ms"
+    )
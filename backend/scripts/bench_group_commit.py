@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from queue import Empty, SimpleQueue
+
+# Small like-shaped mutations from many request threads against one writer connection, comparing a
+# commit per request with the GROUP_COMMIT_ENABLED queue from app.services.group_commit (one
+# transaction per batch, a savepoint per mutation, results released after COMMIT).
+
+
+def _seed(path: Path, posts: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        PRAGMA journal_mode=WAL;
+        CREATE TABLE posts (id INTEGER PRIMARY KEY, like_count INTEGER NOT NULL DEFAULT 0);
+        CREATE TABLE post_likes (
+            post_id INTEGER NOT NULL, user_id INTEGER NOT NULL, created_at TEXT NOT NULL,
+            PRIMARY KEY (post_id, user_id)
+        );
+        """
+    )
+    conn.executemany("INSERT INTO posts (id) VALUES (?)", ((index,) for index in range(1, posts + 1)))
+    conn.commit()
+    conn.close()
+
+
+def _connect(path: Path, synchronous: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path, check_same_thread=False)
+    for pragma in ("PRAGMA journal_mode=WAL", f"PRAGMA synchronous={synchronous}", "PRAGMA busy_timeout=5000"):
+        conn.execute(pragma)
+    return conn
+
+
+def _toggle_like(conn: sqlite3.Connection, post_id: int, user_id: int) -> int:
+    inserted = conn.execute(
+        "INSERT OR IGNORE INTO post_likes (post_id, user_id, created_at) VALUES (?, ?, datetime('now'))",
+        (post_id, user_id),
+    ).rowcount
+    if inserted:
+        conn.execute("UPDATE posts SET like_count = like_count + 1 WHERE id = ?", (post_id,))
+    else:
+        conn.execute("DELETE FROM post_likes WHERE post_id = ? AND user_id = ?", (post_id, user_id))
+        conn.execute("UPDATE posts SET like_count = like_count - 1 WHERE id = ?", (post_id,))
+    return conn.execute("SELECT like_count FROM posts WHERE id = ?", (post_id,)).fetchone()[0]
+
+
+class _PerRequest:
+    # The pool_size=1 writer engine: each request takes the connection, writes, commits.
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+        self.lock = threading.Lock()
+
+    def run(self, post_id: int, user_id: int) -> int:
+        with self.lock:
+            with self.conn:
+                return _toggle_like(self.conn, post_id, user_id)
+
+    def close(self) -> None:
+        pass
+
+
+class _GroupCommit:
+    def __init__(self, conn: sqlite3.Connection, window_ms: float, max_batch: int) -> None:
+        self.conn = conn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self.queue: SimpleQueue = SimpleQueue()
+        self.batches: list[int] = []
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def run(self, post_id: int, user_id: int) -> int:
+        future: Future = Future()
+        self.queue.put((post_id, user_id, future))
+        return future.result()
+
+    def _loop(self) -> None:
+        while (first := self.queue.get()) is not None:
+            batch = [first]
+            deadline = time.perf_counter() + self.window
+            while len(batch) < self.max_batch:
+                try:
+                    item = self.queue.get_nowait()
+                except Empty:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    try:
+                        item = self.queue.get(timeout=remaining)
+                    except Empty:
+                        break
+                if item is None:
+                    self.queue.put(None)
+                    break
+                batch.append(item)
+
+            outcomes = []
+            self.conn.execute("BEGIN IMMEDIATE")
+            for index, (post_id, user_id, future) in enumerate(batch):
+                self.conn.execute(f"SAVEPOINT m{index}")
+                try:
+                    outcomes.append((future, _toggle_like(self.conn, post_id, user_id), None))
+                    self.conn.execute(f"RELEASE m{index}")
+                except sqlite3.Error as exc:
+                    self.conn.execute(f"ROLLBACK TO m{index}")
+                    self.conn.execute(f"RELEASE m{index}")
+                    outcomes.append((future, None, exc))
+            self.conn.commit()
+            self.batches.append(len(batch))
+            for future, result, error in outcomes:
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(result)
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+
+
+def run(mode: str, path: Path, args: argparse.Namespace) -> dict[str, float]:
+    conn = _connect(path, args.synchronous)
+    writer = _PerRequest(conn) if mode == "per-request" else _GroupCommit(conn, args.window_ms, args.max_batch)
+    latencies: list[float] = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + args.seconds
+
+    def client(user_id: int) -> None:
+        local: list[float] = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            writer.run(random.randint(1, args.posts), user_id)
+            local.append((time.perf_counter() - started) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(user_id,)) for user_id in range(1, args.clients + 1)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    writer.close()
+    conn.close()
+
+    ordered = sorted(latencies)
+    batches = getattr(writer, "batches", None)
+    return {
+        "writes_per_s": len(latencies) / args.seconds,
+        "p50": statistics.median(ordered),
+        "p95": ordered[max(0, int(len(ordered) * 0.95) - 1)],
+        "commits_per_s": (len(batches) if batches is not None else len(latencies)) / args.seconds,
+        "avg_batch": statistics.mean(batches) if batches else 1.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare commit-per-request with the group-commit write queue")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--synchronous", default="FULL", help="FULL fsyncs every commit; NORMAL is the app default")
+    parser.add_argument("--window-ms", type=float, default=0.0)
+    parser.add_argument("--max-batch", type=int, default=64)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients, {args.seconds:.0f}s per mode, synchronous={args.synchronous}")
+    print(f"{'mode':<12} {'writes/s':>9} {'commits/s':>10} {'batch':>6} {'p50':>9} {'p95':>9}")
+    for mode in ("per-request", "group"):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = Path(workdir) / "bench.db"
+            _seed(path, args.posts)
+            result = run(mode, path, args)
+        print(
+            f"{mode:<12} {result['writes_per_s']:>9.0f} {result['commits_per_s']:>10.0f} {result['avg_batch']:>6.1f} "
+            f"{result['p50']:>7.2f}ms {result['p95']:>7.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+from __future__ import annotations
+
+from bench_common import base_parser, login, measure, request_json
+
+
+def main() -> None:
+    parser = base_parser("Compare the composite post detail endpoint with the three-call page load.")
+    parser.add_argument("--board-id", type=int, required=True)
+    parser.add_argument("--post-id", type=int, required=True)
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+    board_id, post_id = args.board_id, args.post_id
+
+    def three_calls() -> None:
+        request_json(args.base_url, "GET", f"/api/boards/{board_id}/posts/{post_id}", token)
+        request_json(args.base_url, "GET", f"/api/posts/{post_id}/comments", token)
+        request_json(args.base_url, "GET", f"/api/posts/{post_id}/like", token)
+
+    def composite() -> None:
+        request_json(args.base_url, "GET", f"/api/boards/{board_id}/posts/{post_id}/detail", token)
+
+    measure("post + comments + like (3 calls)", args.iterations, three_calls)
+    measure("post detail (1 call)", args.iterations, composite)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Mixed read/write load against a scratch copy of the posts/comments shape, comparing the old engine
+# setup (rollback journal, one connection per worker thread) with the WAL profile from app.db.session
+# (tuned PRAGMAs, read-only reader connections, one serialized writer connection).
+
+WAL_PRAGMAS = [
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+]
+
+
+def _seed(path: Path, posts: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.executescript(
+        """
+        CREATE TABLE posts (
+            id INTEGER PRIMARY KEY, board_id INTEGER NOT NULL, title TEXT NOT NULL, content TEXT NOT NULL,
+            is_deleted INTEGER NOT NULL DEFAULT 0, view_count INTEGER NOT NULL DEFAULT 0,
+            comment_count INTEGER NOT NULL DEFAULT 0, created_at TEXT NOT NULL
+        );
+        CREATE INDEX ix_posts_board ON posts (board_id, is_deleted, created_at);
+        CREATE TABLE comments (
+            id INTEGER PRIMARY KEY, post_id INTEGER NOT NULL, content TEXT NOT NULL, created_at TEXT NOT NULL
+        );
+        CREATE INDEX ix_comments_post ON comments (post_id, created_at);
+        """
+    )
+    body = "lorem ipsum dolor sit amet " * 20
+    conn.executemany(
+        "INSERT INTO posts (board_id, title, content, created_at) VALUES (?, ?, ?, datetime('now', ?))",
+        ((index % 5 + 1, f"post {index}", body, f"-{index} seconds") for index in range(posts)),
+    )
+    conn.commit()
+    conn.close()
+
+
+class _Stats:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.latencies: dict[str, list[float]] = {"read": [], "write": []}
+        self.errors = 0
+
+    def record(self, kind: str, seconds: float) -> None:
+        with self.lock:
+            self.latencies[kind].append(seconds)
+
+    def error(self) -> None:
+        with self.lock:
+            self.errors += 1
+
+
+def _read(conn: sqlite3.Connection, posts: int) -> None:
+    board_id = random.randint(1, 5)
+    conn.execute(
+        "SELECT id, title, view_count, comment_count FROM posts WHERE board_id = ? AND is_deleted = 0 "
+        "ORDER BY created_at DESC LIMIT 20 OFFSET ?",
+        (board_id, random.randint(0, 50) * 20),
+    ).fetchall()
+    conn.execute("SELECT COUNT(*) FROM posts WHERE board_id = ? AND is_deleted = 0", (board_id,)).fetchone()
+    conn.execute(
+        "SELECT id, content FROM comments WHERE post_id = ? ORDER BY created_at LIMIT 50", (random.randint(1, posts),)
+    ).fetchall()
+
+
+def _write(conn: sqlite3.Connection, posts: int) -> None:
+    post_id = random.randint(1, posts)
+    with conn:
+        conn.execute("UPDATE posts SET view_count = view_count + 1 WHERE id = ?", (post_id,))
+        conn.execute(
+            "INSERT INTO comments (post_id, content, created_at) VALUES (?, 'benchmark comment', datetime('now'))",
+            (post_id,),
+        )
+        conn.execute("UPDATE posts SET comment_count = comment_count + 1 WHERE id = ?", (post_id,))
+
+
+def _worker(kind, connect, writer_lock, stats, posts, deadline) -> None:
+    conn = connect()
+    try:
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                if kind == "read":
+                    _read(conn, posts)
+                elif writer_lock is not None:
+                    with writer_lock:
+                        _write(conn, posts)
+                else:
+                    _write(conn, posts)
+            except sqlite3.OperationalError:
+                stats.error()
+                continue
+            stats.record(kind, time.perf_counter() - started)
+    finally:
+        if writer_lock is None or kind == "read":
+            conn.close()
+
+
+def run(profile: str, path: Path, readers: int, writers: int, seconds: float, posts: int) -> dict[str, float]:
+    stats = _Stats()
+    writer_lock = None
+    if profile == "legacy":
+        # Python's sqlite3 default: rollback journal, 5s busy handler, a connection per pooled thread.
+        def connect_reader() -> sqlite3.Connection:
+            return sqlite3.connect(path, check_same_thread=False)
+
+        connect_writer = connect_reader
+    else:
+        def connect_reader() -> sqlite3.Connection:
+            conn = sqlite3.connect(path, check_same_thread=False)
+            for pragma in [*WAL_PRAGMAS, "PRAGMA query_only=ON"]:
+                conn.execute(pragma)
+            return conn
+
+        # The pool_size=1 writer engine: every writer thread takes turns on one connection.
+        shared_writer = sqlite3.connect(path, check_same_thread=False)
+        for pragma in WAL_PRAGMAS:
+            shared_writer.execute(pragma)
+        writer_lock = threading.Lock()
+
+        def connect_writer() -> sqlite3.Connection:
+            return shared_writer
+
+    deadline = time.perf_counter() + seconds
+    threads = [
+        threading.Thread(target=_worker, args=("read", connect_reader, None, stats, posts, deadline))
+        for _ in range(readers)
+    ] + [
+        threading.Thread(target=_worker, args=("write", connect_writer, writer_lock, stats, posts, deadline))
+        for _ in range(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if profile != "legacy":
+        shared_writer.close()
+
+    def p95(values: list[float]) -> float:
+        return statistics.quantiles(values, n=20)[18] * 1000 if len(values) >= 20 else float("nan")
+
+    return {
+        "reads_per_s": len(stats.latencies["read"]) / seconds,
+        "writes_per_s": len(stats.latencies["write"]) / seconds,
+        "read_p95_ms": p95(stats.latencies["read"]),
+        "write_p95_ms": p95(stats.latencies["write"]),
+        "locked_errors": stats.errors,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare SQLite throughput: legacy engine vs WAL read/write profile")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--posts", type=int, default=50000)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers + {args.writers} writers, {args.seconds:.0f}s per profile, {args.posts} posts")
+    print(f"{'profile':<8} {'reads/s':>9} {'writes/s':>9} {'read p95':>10} {'write p95':>10} {'locked':>7}")
+    for profile in ("legacy", "wal"):
+        with tempfile.TemporaryDirectory() as workdir:
+            path = Path(workdir) / "bench.db"
+            _seed(path, args.posts)
+            result = run(profile, path, args.readers, args.writers, args.seconds, args.posts)
+        print(
+            f"{profile:<8} {result['reads_per_s']:>9.0f} {result['writes_per_s']:>9.0f} "
+            f"{result['read_p95_ms']:>8.1f}ms {result['write_p95_ms']:>8.1f}ms {result['locked_errors']:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import base_parser, login, report, request_multipart
+
+
+def main() -> None:
+    parser = base_parser("Measure event-loop lag (via /health latency) while attachments upload concurrently.")
+    parser.add_argument("--post-id", type=int, required=True)
+    parser.add_argument("--uploads", type=int, default=10)
+    parser.add_argument("--size-mb", type=int, default=15)
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    stop = threading.Event()
+    lag_samples: list[float] = []
+
+    def probe() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            with urllib.request.urlopen(f"{args.base_url}/health") as response:
+                response.read()
+            lag_samples.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    baseline: list[float] = []
+    for _ in range(50):
+        started = time.perf_counter()
+        with urllib.request.urlopen(f"{args.base_url}/health") as response:
+            response.read()
+        baseline.append((time.perf_counter() - started) * 1000)
+    report("/health idle", baseline)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    with ThreadPoolExecutor(max_workers=args.uploads) as pool:
+        list(
+            pool.map(
+                lambda index: request_multipart(
+                    args.base_url,
+                    f"/api/posts/{args.post_id}/attachments",
+                    token,
+                    [("file", f"loop-lag-{index}.zip", payload)],
+                ),
+                range(args.uploads),
+            )
+        )
+    stop.set()
+    prober.join()
+    report(f"/health during {args.uploads} uploads", lag_samples)
+
+
+if __name__ == "__main__":
+    main()
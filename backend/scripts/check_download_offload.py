@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import hashlib
+import urllib.error
+import urllib.request
+
+from bench_common import base_parser, login
+
+
+def main() -> None:
+    parser = base_parser("Verify that attachment downloads through the front proxy are served via X-Accel-Redirect.")
+    parser.add_argument("--proxy-url", default="http://localhost:8080")
+    parser.add_argument("--attachment-id", type=int, required=True)
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+    path = f"/api/attachments/{args.attachment_id}/download"
+
+    direct = urllib.request.Request(f"{args.base_url}{path}", headers={"Authorization": f"Bearer {token}"})
+    with urllib.request.urlopen(direct) as response:
+        accel_target = response.headers.get("X-Accel-Redirect")
+        api_body = response.read()
+    if not accel_target or api_body:
+        raise SystemExit("API did not answer with an empty X-Accel-Redirect response; is DOWNLOAD_MODE=x-accel set?")
+    print(f"API      -> X-Accel-Redirect: {accel_target}")
+
+    proxied = urllib.request.Request(f"{args.proxy_url}{path}", headers={"Authorization": f"Bearer {token}"})
+    with urllib.request.urlopen(proxied) as response:
+        leaked = response.headers.get("X-Accel-Redirect")
+        etag = (response.headers.get("ETag") or "").strip('"')
+        body = response.read()
+    digest = hashlib.sha256(body).hexdigest()
+    print(f"Proxy    -> {len(body)} bytes, sha256={digest}, etag={etag or '-'}")
+    if leaked:
+        raise SystemExit("Proxy leaked the internal X-Accel-Redirect header")
+    if etag and etag != digest:
+        raise SystemExit("Proxied body does not match the stored content hash")
+
+    try:
+        urllib.request.urlopen(f"{args.proxy_url}{accel_target}")
+    except urllib.error.HTTPError as exc:
+        print(f"Internal -> direct access to {accel_target} refused with {exc.code}")
+    else:
+        raise SystemExit("Internal location is reachable without authorization")
+    print("OK: downloads are offloaded to the proxy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+from bench_common import base_parser, login, request_json
+
+# Run against a single uvicorn worker: GET /like answers from that process's liked-set cache, so once the
+# first GET has loaded the user's set, every later answer shows what the write routes left in the cache.
+
+
+def _liked(base_url: str, token: str, post_id: int) -> bool:
+    return request_json(base_url, "GET", f"/api/posts/{post_id}/like", token)["liked"]
+
+
+def main() -> None:
+    parser = base_parser("Verify that like writes keep the cached liked set in step with the database.")
+    parser.add_argument("--post-id", type=int, required=True)
+    args = parser.parse_args()
+
+    token = login(args.base_url, args.username, args.password)
+    path = f"/api/posts/{args.post_id}/like"
+    request_json(args.base_url, "DELETE", path, token)
+    if _liked(args.base_url, token, args.post_id):
+        raise SystemExit("Cache still lists the post after DELETE")
+
+    for expected in (True, False):
+        toggled = request_json(args.base_url, "POST", path, token)
+        cached = _liked(args.base_url, token, args.post_id)
+        print(f"toggle -> liked={toggled['liked']} like_count={toggled['like_count']} cached={cached}")
+        if toggled["liked"] != expected or cached != expected:
+            raise SystemExit(f"Cached liked set disagrees with the toggle (expected liked={expected})")
+
+    request_json(args.base_url, "PUT", path, token)
+    if not _liked(args.base_url, token, args.post_id):
+        raise SystemExit("Cache is missing the post after PUT")
+    request_json(args.base_url, "DELETE", path, token)
+    print("OK: cached liked set follows like, unlike and toggle")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+# Reproduces the pathological list_posts search (a one-character LIKE over every post body) and checks
+# that the progress handler installed by app.db.query_deadline stops it close to the budget.
+
+PROGRESS_HANDLER_INSTRUCTIONS = 10000
+
+
+def _seed(path: Path, posts: int) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE posts (id INTEGER PRIMARY KEY, title TEXT NOT NULL, content TEXT NOT NULL)")
+    body = "lorem ipsum dolor sit amet consectetur adipiscing elit " * 30
+    conn.executemany(
+        "INSERT INTO posts (title, content) VALUES (?, ?)", ((f"post {index}", body) for index in range(posts))
+    )
+    conn.commit()
+    conn.close()
+
+
+def _search(conn: sqlite3.Connection) -> int:
+    return conn.execute("SELECT COUNT(*) FROM posts WHERE title LIKE '%q%' OR content LIKE '%q%'").fetchone()[0]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Check that query deadlines interrupt a runaway LIKE search")
+    parser.add_argument("--posts", type=int, default=300_000)
+    parser.add_argument("--budget-ms", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = Path(workdir) / "check.db"
+        _seed(path, args.posts)
+        conn = sqlite3.connect(path)
+
+        started = time.perf_counter()
+        _search(conn)
+        print(f"without deadline: {(time.perf_counter() - started) * 1000:8.1f}ms")
+
+        deadline = time.monotonic() + args.budget_ms / 1000
+        conn.set_progress_handler(lambda: int(time.monotonic() >= deadline), PROGRESS_HANDLER_INSTRUCTIONS)
+        started = time.perf_counter()
+        try:
+            _search(conn)
+        except sqlite3.OperationalError as exc:
+            elapsed = (time.perf_counter() - started) * 1000
+            print(f"with {args.budget_ms}ms deadline: {elapsed:8.1f}ms, {type(exc).__name__}: {exc}")
+        else:
+            print("with deadline: query finished before the budget")
+
+        # The connection stays usable for the next request once the deadline is lifted.
+        conn.set_progress_handler(None, 0)
+        print(f"connection reusable: {conn.execute('SELECT COUNT(*) FROM posts').fetchone()[0]} posts")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import tempfile
+import urllib.request
+from pathlib import Path
+
+from app.core.config import settings
+from app.services.blob_store import blob_key
+from app.services.storage import S3Storage
+
+
+def main() -> None:
+    # Round-trips objects through the S3 backend against MinIO or `moto_server` using the S3_* settings.
+    parser = argparse.ArgumentParser(description="Check the S3 storage backend against a local S3 endpoint.")
+    parser.add_argument("--size-mb", type=int, default=20, help="size of the multipart test object")
+    args = parser.parse_args()
+
+    storage = S3Storage()
+    try:
+        storage.client.head_bucket(Bucket=settings.s3_bucket)
+    except Exception:
+        storage.client.create_bucket(Bucket=settings.s3_bucket)
+        print(f"Created bucket {settings.s3_bucket}")
+
+    payload = os.urandom(args.size_mb * 1024 * 1024)
+    content_hash = hashlib.sha256(payload).hexdigest()
+    with tempfile.NamedTemporaryFile(delete=False) as temp:
+        temp.write(payload)
+    locator = storage.save_file(Path(temp.name), blob_key(content_hash))
+    parts = -(-len(payload) // storage.transfer_config.multipart_chunksize)
+    print(f"Uploaded {locator} ({args.size_mb} MB, {parts} parts)")
+
+    if not storage.exists(locator):
+        raise SystemExit("Object missing after upload")
+    with storage.open(locator) as body:
+        if hashlib.sha256(body.read()).hexdigest() != content_hash:
+            raise SystemExit("Read-back content does not match")
+
+    url = storage.presigned_url(locator, "검증 파일.bin", "application/octet-stream")
+    with urllib.request.urlopen(url) as response:
+        disposition = response.headers.get("Content-Disposition")
+        if hashlib.sha256(response.read()).hexdigest() != content_hash:
+            raise SystemExit("Presigned download does not match")
+    print(f"Presigned GET ok, Content-Disposition: {disposition}")
+
+    storage.delete(locator)
+    if storage.exists(locator):
+        raise SystemExit("Object still present after delete")
+    print("OK: multipart upload, read-back, presigned GET and delete")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from sqlmodel import Session
+
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.services.blob_store import fold_legacy_attachments
+
+
+if __name__ == "__main__":
+    create_db_and_tables()
+    with Session(engine) as session:
+        report = fold_legacy_attachments(session)
+    print(
+        f"Scanned {report.scanned} attachments: folded {report.folded}, "
+        f"duplicates {report.duplicates}, missing files {report.missing}"
+    )
+    print(f"Reclaimed {report.reclaimed_bytes} bytes ({report.reclaimed_bytes / (1024 * 1024):.1f} MB)")
@@ -0,0 +1,58 @@
+from sqlmodel import Session, select
+
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.models.attachment import Attachment
+from app.models.attachment_text import AttachmentText
+from app.services.storage import storage_for
+from app.services.text_extraction import (
+    EXTRACT_STATUS_FAILED,
+    EXTRACT_STATUS_OK,
+    extension_of,
+    extract_text,
+    is_extractable,
+    save_extracted_text,
+)
+
+BATCH_SIZE = 200
+
+
+if __name__ == "__main__":
+    # Backfills the search index for attachments uploaded before extraction existed. Runs in this
+    # process, one file at a time, so it can be started while the API is serving traffic.
+    create_db_and_tables()
+    indexed = failed = 0
+    last_id = 0
+    with Session(engine) as session:
+        while True:
+            attachments = session.exec(
+                select(Attachment)
+                .outerjoin(AttachmentText, AttachmentText.content_hash == Attachment.content_hash)
+                .where(Attachment.id > last_id)
+                .where(Attachment.content_hash != None)
+                .where(AttachmentText.content_hash == None)
+                .order_by(Attachment.id.asc())
+                .limit(BATCH_SIZE)
+            ).all()
+            if not attachments:
+                break
+
+            for attachment in attachments:
+                last_id = attachment.id
+                if not is_extractable(attachment.original_name) or session.get(AttachmentText, attachment.content_hash):
+                    continue
+                local_path = storage_for(attachment.path).local_path(attachment.path)
+                if local_path is None:
+                    continue
+                try:
+                    content = extract_text(str(local_path), extension_of(attachment.original_name))
+                except Exception as exc:
+                    print(f"#{attachment.id} {attachment.original_name}: {exc}")
+                    save_extracted_text(session, attachment.content_hash, EXTRACT_STATUS_FAILED, "")
+                    failed += 1
+                else:
+                    save_extracted_text(session, attachment.content_hash, EXTRACT_STATUS_OK, content)
+                    indexed += 1
+            session.commit()
+
+    print(f"Indexed {indexed} attachments, {failed} failed")
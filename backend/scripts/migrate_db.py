@@ -0,0 +1,22 @@
+import argparse
+
+from app.db.init_db import MIGRATIONS
+from app.db.migrations import applied_versions, run_migrations
+from app.db.session import engine
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Apply pending schema migrations before rolling out a release")
+    parser.add_argument("--status", action="store_true", help="list migrations without applying anything")
+    args = parser.parse_args()
+
+    if args.status:
+        done = applied_versions(engine)
+        for migration in MIGRATIONS:
+            state = f"applied {done[migration.version]}" if migration.version in done else "pending"
+            print(f"{migration.version:>4} {migration.name:<32} {state}")
+    else:
+        applied = run_migrations(engine, MIGRATIONS)
+        for migration in applied:
+            print(f"Applied {migration.version} {migration.name}")
+        print(f"Schema at version {MIGRATIONS[-1].version}" if MIGRATIONS else "No migrations defined")
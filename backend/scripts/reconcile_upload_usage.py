@@ -0,0 +1,12 @@
+from sqlmodel import Session
+
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.services.upload_quota import reconcile_usage
+
+
+if __name__ == "__main__":
+    create_db_and_tables()
+    with Session(engine) as session:
+        report = reconcile_usage(session)
+    print(f"Recounted {report.rows} usage rows, corrected {report.corrected}")
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import random
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+from bench_common import base_parser, login, request_json
+
+
+def main() -> None:
+    parser = base_parser("Hammer one post (liked only by --users) with concurrent like/unlike calls and verify the counter.")
+    parser.add_argument("--post-id", type=int, required=True)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument(
+        "--users",
+        default="admin:admin1234,testuser1:test1234,testuser2:test1234,testuser3:test1234,testuser4:test1234,testuser5:test1234",
+        help="Comma-separated username:password pairs sharing the post.",
+    )
+    args = parser.parse_args()
+
+    credentials = [item.split(":", 1) for item in args.users.split(",") if item]
+    tokens = [login(args.base_url, username, password) for username, password in credentials]
+    like_path = f"/api/posts/{args.post_id}/like"
+    errors: list[str] = []
+
+    def hammer(worker: int) -> None:
+        rng = random.Random(worker)
+        for _ in range(args.iterations):
+            token = rng.choice(tokens)
+            method = rng.choice(["PUT", "DELETE", "POST"])
+            try:
+                request_json(args.base_url, method, like_path, token)
+            except urllib.error.HTTPError as exc:
+                errors.append(f"{method} -> {exc.code}")
+
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        list(pool.map(hammer, range(args.threads)))
+
+    statuses = [request_json(args.base_url, "GET", like_path, token) for token in tokens]
+    liked_users = sum(1 for item in statuses if item["liked"])
+    like_count = statuses[0]["like_count"]
+
+    print(f"requests={args.threads * args.iterations} errors={len(errors)} liked_users={liked_users} like_count={like_count}")
+    for error in sorted(set(errors)):
+        print(f"  error: {error}")
+    if errors or like_count != liked_users:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
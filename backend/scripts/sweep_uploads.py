@@ -0,0 +1,54 @@
+import argparse
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.db.init_db import create_db_and_tables
+from app.db.session import engine
+from app.services.upload_gc import (
+    GC_GRACE_SECONDS,
+    GC_MODE_DELETE,
+    GC_MODE_QUARANTINE,
+    load_cursor,
+    save_cursor,
+    sweep_uploads,
+)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find and remove upload files that no attachment references")
+    parser.add_argument("--mode", choices=[GC_MODE_QUARANTINE, GC_MODE_DELETE], default=settings.upload_gc_mode)
+    parser.add_argument("--dry-run", action="store_true", help="only report what would be removed")
+    parser.add_argument("--max-files", type=int, default=None, help="stop after this many files and save a cursor")
+    parser.add_argument("--grace-minutes", type=int, default=GC_GRACE_SECONDS // 60)
+    parser.add_argument("--retention-days", type=int, default=settings.attachment_retention_days)
+    parser.add_argument("--reset-cursor", action="store_true", help="start again from the top of UPLOAD_DIR")
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    start_after = None if args.reset_cursor else load_cursor()
+    with Session(engine) as session:
+        report = sweep_uploads(
+            session,
+            mode=args.mode,
+            dry_run=args.dry_run,
+            grace_seconds=args.grace_minutes * 60,
+            max_files=args.max_files,
+            start_after=start_after,
+            retention_days=args.retention_days if args.retention_days > 0 and start_after is None else None,
+        )
+    if not args.dry_run:
+        save_cursor(report.cursor)
+
+    prefix = "[dry-run] " if args.dry_run else ""
+    print(
+        f"{prefix}Scanned {report.scanned} files: kept {report.kept}, orphans {report.orphans} "
+        f"({report.orphan_bytes / (1024 * 1024):.1f} MB, {args.mode}), stale temp files {report.stale_temp_files}, "
+        f"too recent {report.skipped_recent}"
+    )
+    print(
+        f"{prefix}Purged {report.purged_attachments} attachments of posts deleted over {args.retention_days} days ago "
+        f"({report.purged_bytes / (1024 * 1024):.1f} MB)"
+    )
+    if report.cursor:
+        print("Stopped at --max-files; run again to continue from the saved cursor")